@@ -0,0 +1,202 @@
+"""
+Benchmark: end-to-end gesture-to-spell latency.
+Feeds a pinch sequence through the real VisionSystem stroke / pinch
+handling and predict_action on a simulated camera thread, while the game
+runs its normal loop, and reports pinch -> cast and pinch -> pixels
+latency (see diagnostics.latency for the stages).
+
+The sequence is synthetic (each gesture drawn with the index finger, then
+a pinch) or a landmark file. Detection itself is simulated: each frame
+waits --detect-ms before its landmarks are handed over, standing in for
+HandLandmarker.detect(). Set SDL_VIDEODRIVER to measure on a real display
+(the default is the dummy driver, which has no vsync).
+
+Landmark file format (JSON): {"frames": [{"t": seconds, "hand": [[x, y] * 21] or null}, ...]}
+with x, y normalised to the camera frame, as MediaPipe reports them.
+
+Run:
+    python benchmarks/bench_gesture_latency.py --repeat 5
+    python benchmarks/bench_gesture_latency.py --save pinches.json
+    python benchmarks/bench_gesture_latency.py --landmarks pinches.json --out latency.json
+    python benchmarks/bench_gesture_latency.py --record pinches.json --seconds 20   (webcam)
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add project root and src to path for imports
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'src'))
+
+import main
+from diagnostics.latency import LatencyTracker
+from vision.manager import VisionSystem
+
+STROKE_FRAMES = 18
+PINCH_FRAMES = 3
+IDLE_SECONDS = 1.2  # Longer than the shield cooldown, so no gesture is rejected
+FINGER_GAP = 0.15   # Index-middle distance while drawing (normalised)
+
+
+class Landmark:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+# ═══════════════════════════════════════════
+#  SEQUENCES
+# ═══════════════════════════════════════════
+def stroke(gesture, steps=STROKE_FRAMES):
+    """Index fingertip path (normalised) that draws gesture."""
+    points = []
+    for i in range(steps):
+        t = i / (steps - 1)
+        if gesture == "/":
+            points.append((0.35 + 0.2 * t, 0.7 - 0.4 * t))
+        elif gesture == "\\":
+            points.append((0.35 + 0.2 * t, 0.3 + 0.4 * t))
+        elif gesture == "|":
+            points.append((0.5, 0.3 + 0.4 * t))
+        else:  # "O"
+            angle = 2 * math.pi * t
+            points.append((0.5 + 0.15 * math.cos(angle), 0.5 + 0.2 * math.sin(angle)))
+    return points
+
+
+def hand(index, middle):
+    """21 landmarks; only the index (8) and middle (12) tips matter to VisionSystem."""
+    points = [index] * 21
+    points[12] = middle
+    return [list(p) for p in points]
+
+
+def synthetic_sequence(gestures, fps):
+    frames = []
+    t = 0.5  # Let the game settle first
+    for gesture in gestures:
+        path = stroke(gesture)
+        for x, y in path:
+            frames.append({"t": t, "hand": hand((x, y), (x, y + FINGER_GAP))})
+            t += 1 / fps
+        x, y = path[-1]
+        for _ in range(PINCH_FRAMES):
+            frames.append({"t": t, "hand": hand((x, y), (x + 0.01, y))})
+            t += 1 / fps
+        t += IDLE_SECONDS
+    return {"frames": frames, "gestures": gestures}
+
+
+def record_sequence(seconds):
+    """Landmarks from the webcam for `seconds` (draw and pinch as in the game)."""
+    vision = VisionSystem()
+    frames = []
+    start = time.perf_counter()
+    track = vision._track_hand_locked
+
+    def logging_track(hand_lms, captured, detected):
+        frames.append({"t": captured - start, "hand": [[lm.x, lm.y] for lm in hand_lms]})
+        track(hand_lms, captured, detected)
+    vision._track_hand_locked = logging_track
+    while vision.running and time.perf_counter() - start < seconds:
+        time.sleep(0.05)
+    vision.stop()
+    return {"frames": frames}
+
+
+# ═══════════════════════════════════════════
+#  HARNESS
+# ═══════════════════════════════════════════
+def feed_camera(vision, sequence, detect_ms, game, recognised):
+    """Camera thread: replays the frames on their timestamps through the pinch / stroke handling."""
+    start = time.perf_counter()
+    for frame in sequence["frames"]:
+        delay = start + frame["t"] - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        captured = time.perf_counter()
+        time.sleep(detect_ms / 1000)  # HandLandmarker.detect()
+        detected = time.perf_counter()
+        if frame["hand"] is None:
+            continue
+        event = vision.feed_landmarks([Landmark(x, y) for x, y in frame["hand"]], captured, detected)
+        if event is not None:
+            recognised.append(event.gesture)
+    time.sleep(IDLE_SECONDS)  # Let the last gesture reach the screen
+    game.running = False
+
+
+def run(sequence, detect_ms, char):
+    vision = VisionSystem(camera=False)
+    game = main.MagicGame(vision=vision, seed=0)
+    game.selected_char_idx = char
+    game.current_state = game.STATE_CHAR_SELECT
+    game.reset_game()
+    game.latency = LatencyTracker()
+    recognised = []
+    camera = threading.Thread(target=feed_camera, args=(vision, sequence, detect_ms, game, recognised),
+                              name="Camera", daemon=True)
+    camera.start()
+    try:
+        game.run()  # Prints the latency report when the camera thread stops it
+    except SystemExit:
+        pass
+    return game.latency, recognised
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="Gesture-to-spell latency harness")
+    parser.add_argument("--gestures", default="/\\O|", help="synthetic: gestures drawn in order")
+    parser.add_argument("--repeat", type=int, default=3, help="synthetic: times the gesture list is repeated")
+    parser.add_argument("--fps", type=float, default=30, help="synthetic: camera frame rate")
+    parser.add_argument("--detect-ms", type=float, default=15, help="simulated HandLandmarker.detect() time")
+    parser.add_argument("--landmarks", default=None, help="replay a landmark file instead")
+    parser.add_argument("--save", default=None, help="write the sequence to a landmark file and exit")
+    parser.add_argument("--record", default=None, help="record a landmark file from the webcam and exit")
+    parser.add_argument("--seconds", type=float, default=20, help="record: length")
+    parser.add_argument("--char", type=int, default=0, help="character index (0-4)")
+    parser.add_argument("--out", default=None, help="write the latency summary as JSON")
+    args = parser.parse_args()
+
+    if args.record:
+        sequence = record_sequence(args.seconds)
+        with open(args.record, "w") as f:
+            json.dump(sequence, f)
+        print(f"Recorded {len(sequence['frames'])} hand frames to {args.record}")
+        return
+
+    if args.landmarks:
+        with open(args.landmarks) as f:
+            sequence = json.load(f)
+    else:
+        sequence = synthetic_sequence(args.gestures * args.repeat, args.fps)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(sequence, f)
+        print(f"Wrote {len(sequence['frames'])} frames to {args.save}")
+        return
+
+    latency, recognised = run(sequence, args.detect_ms, args.char)
+    expected = sequence.get("gestures")
+    if expected is not None:
+        correct = sum(a == b for a, b in zip(recognised, expected))
+        print(f"Recognised {len(recognised)}/{len(expected)} gestures, {correct} as drawn: {''.join(recognised)}")
+    else:
+        print(f"Recognised {len(recognised)} gestures: {''.join(recognised)}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"detect_ms": args.detect_ms, "recognised": "".join(recognised),
+                       "rejected": latency.rejected, "latency_ms": latency.summary()}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_bench()
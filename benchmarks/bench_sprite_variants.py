@@ -0,0 +1,96 @@
+"""
+Benchmark: sprite variant generation (white flash / tint / flip).
+Compares the old per-pixel get_at/set_at path against the array-based /
+palette-swap helpers in ui.pixel_sprites and checks that the visible sprite
+pixels match.
+
+Run:  python benchmarks/bench_sprite_variants.py
+"""
+import os
+import sys
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from ui.pixel_sprites import (
+    CHARACTER_DATA, create_white_flash, create_sprite_variants
+)
+
+REPEAT = 5
+NUMBER = 20
+
+
+# ── Reference implementations (pre-vectorization) ──
+def legacy_white_flash(surface):
+    w, h = surface.get_size()
+    flash = pygame.Surface((w, h), pygame.SRCALPHA)
+    for y in range(h):
+        for x in range(w):
+            r, g, b, a = surface.get_at((x, y))
+            if a > 0:
+                flash.set_at((x, y), (255, 255, 255, a))
+    return flash
+
+
+def legacy_tinted_variant(base, color, intensity):
+    result = pygame.Surface(base.get_size(), pygame.SRCALPHA)
+    result.blit(base, (0, 0))
+    overlay = pygame.Surface(result.get_size(), pygame.SRCALPHA)
+    overlay.fill((*color, intensity))
+    result.blit(overlay, (0, 0))
+    return result
+
+
+def legacy_bot_variants(base):
+    hurt = legacy_white_flash(base)
+    freeze = legacy_tinted_variant(base, (100, 200, 255), 100)
+    burn = legacy_tinted_variant(base, (255, 100, 0), 80)
+    flip = lambda s: pygame.transform.flip(s, True, False)
+    return flip(base), flip(hurt), flip(freeze), flip(burn)
+
+
+def _flatten(surface):
+    """Composite onto black so 32-bit alpha and 8-bit colorkey sprites compare alike."""
+    flat = pygame.Surface(surface.get_size())
+    flat.blit(surface, (0, 0))
+    return pygame.surfarray.array3d(flat).astype(int)
+
+
+def _same_pixels(a, b, mask, tolerance=2):
+    """Compare the visible sprite pixels (the old tint also washed the transparent box)."""
+    return abs(_flatten(a) - _flatten(b))[mask].max(initial=0) <= tolerance
+
+
+def _best_ms(fn):
+    return min(timeit.repeat(fn, repeat=REPEAT, number=NUMBER)) / NUMBER * 1000
+
+
+def main():
+    pygame.init()
+    sprites = [(c["name"], c["create"]()) for c in CHARACTER_DATA]
+    sprites.append(("MONSTER", CHARACTER_DATA[0]["opponent_create"](CHARACTER_DATA[0]["opponent_color"])))
+
+    print(f"{'sprite':<10} {'case':<14} {'legacy ms':>10} {'new ms':>10} {'speedup':>8}  parity")
+    for name, sprite in sprites:
+        cases = [
+            ("white_flash", lambda: legacy_white_flash(sprite), lambda: create_white_flash(sprite)),
+            ("bot_variants", lambda: legacy_bot_variants(sprite), lambda: create_sprite_variants(sprite, flip=True)),
+        ]
+        for case, old_fn, new_fn in cases:
+            old_out, new_out = old_fn(), new_fn()
+            if not isinstance(old_out, tuple):
+                old_out, new_out = (old_out,), (new_out,)
+            mask = _flatten(create_white_flash(new_out[0])).sum(axis=2) > 0
+            parity = all(_same_pixels(a, b, mask) for a, b in zip(old_out, new_out))
+            old_ms, new_ms = _best_ms(old_fn), _best_ms(new_fn)
+            print(f"{name:<10} {case:<14} {old_ms:>10.3f} {new_ms:>10.3f} {old_ms / new_ms:>7.1f}x  {'OK' if parity else 'MISMATCH'}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
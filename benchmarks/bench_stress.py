@@ -0,0 +1,222 @@
+"""
+Stress scenarios: how frame time and memory scale with load.
+Runs the real game (update + draw, dummy video driver by default) and
+ramps one kind of load per scenario, level by level:
+
+    spells     live spells per side, respawned as they leave the screen
+    particles  live burst particles, topped up every frame
+    entities   extra burning / frozen bots that move, cast and get hit
+    all        everything at once
+
+Fighters are made unkillable so a match never ends mid-level. Each level
+records frame / update / draw time percentiles and process memory. The
+curve is written as CSV, and a summary gives, per scenario, the last level
+within the frame budget and the knee: the first level where the marginal
+cost per unit of load exceeds KNEE_FACTOR times the low-load rate.
+
+Run:
+    python benchmarks/bench_stress.py
+    python benchmarks/bench_stress.py --scenario particles --levels 15 --frames 60 --csv particles.csv
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add project root and src to path for imports
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'src'))
+
+import main
+from config.settings import WIDTH, HEIGHT, FPS
+from core.bot import Bot
+from core.spells import Spell
+from diagnostics.latency import percentile
+from vision.scripted import ScriptedVision
+
+# Load added per level
+STEPS = {"spells": 10, "particles": 500, "entities": 4}
+SCENARIOS = ("spells", "particles", "entities", "all")
+BUDGET_MS = 1000.0 / FPS
+KNEE_FACTOR = 2.0
+UNKILLABLE = 1e9
+
+
+def rss_mb():
+    """Resident set size of this process in MB (None where it can't be read)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class StressLoad:
+    """Keeps a game at a target load of spells, particles and extra entities."""
+    def __init__(self, game, rng):
+        self.game = game
+        self.rng = rng
+        self.spells = self.particles = self.entities = 0
+        self.crowd = []
+        for fighter in (game.player, game.bot):
+            fighter.health = fighter.max_health = UNKILLABLE
+        # Extra entities are drawn with the fighters
+        draw_fighters = game.draw_gameplay_entities
+
+        def draw_with_crowd(view):
+            draw_fighters(view)
+            for bot in self.crowd:
+                bot.draw(view, game.render_scale)
+        game.draw_gameplay_entities = draw_with_crowd
+
+    def set_level(self, spells, particles, entities):
+        self.spells, self.particles, self.entities = spells, particles, entities
+        while len(self.crowd) < entities:
+            i = len(self.crowd)
+            bot = Bot(WIDTH // 2 + 40 + (i * 37) % (WIDTH // 2 - 100), HEIGHT // 2 - 40 - (i * 53) % 200,
+                      rng=self.rng)
+            model = self.game.bot
+            bot.set_bot_sprite(model.base_sprite,
+                               (model.base_sprite, model.hurt_sprite, model.freeze_sprite, model.burn_sprite))
+            bot.health = bot.max_health = UNKILLABLE
+            self.crowd.append(bot)
+        del self.crowd[entities:]
+
+    def tick(self):
+        """Top the load back up and run the extra entities; call once per game update."""
+        game, rng = self.game, self.rng
+        player, bot = game.player, game.bot
+        per_side = self.spells // 2
+        for caster, direction, x in ((player, 1, player.rect.right), (bot, -1, bot.rect.left)):
+            while len(caster.spells) < per_side:
+                y = rng.uniform(HEIGHT // 2 - 120, HEIGHT // 2 + 60)
+                caster.spells.append(Spell(x + rng.uniform(-300, 300) * direction, y, direction, rng.choice("/\\O")))
+        while len(game.particles.particles) < self.particles:
+            game.particles.burst(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), (255, 150, 0), count=20,
+                                 ptype=rng.choice(("spark", "circle")))
+
+        events = []
+        for i, extra in enumerate(self.crowd):
+            if i % 2:
+                extra.freeze_timer = max(extra.freeze_timer, 2)
+            else:
+                extra.burn_timer = max(extra.burn_timer, 2)
+            extra.update(player)
+            game.world._resolve_hits(player.spells, extra, events)
+            game.world._resolve_hits(extra.spells, player, events)
+            extra.emit_status_particles(game.particles)
+        for event in events:
+            game.on_world_event(event)
+
+
+def run_level(game, load, frames):
+    frame_ms, update_ms, draw_ms = [], [], []
+    for _ in range(frames):
+        start = time.perf_counter()
+        load.tick()
+        game.update()
+        mid = time.perf_counter()
+        game.draw()
+        end = time.perf_counter()
+        update_ms.append((mid - start) * 1000)
+        draw_ms.append((end - mid) * 1000)
+        frame_ms.append((end - start) * 1000)
+    frame_ms.sort()
+    update_ms.sort()
+    draw_ms.sort()
+    return {
+        "frame_p50": percentile(frame_ms, 50), "frame_p95": percentile(frame_ms, 95), "frame_max": frame_ms[-1],
+        "update_p50": percentile(update_ms, 50), "draw_p50": percentile(draw_ms, 50),
+        "live_spells": len(game.player.spells) + len(game.bot.spells) + sum(len(b.spells) for b in load.crowd),
+        "live_particles": len(game.particles.particles),
+        "rss_mb": rss_mb(),
+    }
+
+
+def run_scenario(scenario, levels, frames, seed):
+    game = main.MagicGame(vision=ScriptedVision(interval=30, rng=random.Random(seed)), seed=seed)
+    game.current_state = game.STATE_CHAR_SELECT
+    game.reset_game()
+    load = StressLoad(game, random.Random(seed))
+    rows = []
+    for level in range(levels + 1):
+        amounts = {kind: step * level if scenario in (kind, "all") else 0 for kind, step in STEPS.items()}
+        load.set_level(**amounts)
+        run_level(game, load, max(1, frames // 4))  # Warm up: let the load reach steady state
+        row = {"scenario": scenario, "level": level, **amounts, **run_level(game, load, frames)}
+        rows.append(row)
+        rss = f"{row['rss_mb']:.0f} MB" if row["rss_mb"] is not None else "-"
+        print(f"  {scenario:<10} level {level:>2}  spells {row['live_spells']:>5}  particles {row['live_particles']:>6}  "
+              f"entities {amounts['entities']:>3}  frame p50 {row['frame_p50']:6.2f} ms  p95 {row['frame_p95']:6.2f} ms  "
+              f"rss {rss}")
+    return rows
+
+
+def knee(rows):
+    """(last level within budget, knee level) for one scenario's rows."""
+    last_ok = None
+    for row in rows:
+        if row["frame_p95"] > BUDGET_MS:
+            break
+        last_ok = row["level"]
+    # Marginal cost per level; the first few levels set the low-load rate
+    slopes = [b["frame_p50"] - a["frame_p50"] for a, b in zip(rows, rows[1:])]
+    base = sorted(slopes[:3])[len(slopes[:3]) // 2] if slopes else 0.0
+    knee_level = None
+    for row, slope in zip(rows[1:], slopes):
+        if base > 0 and slope > KNEE_FACTOR * base and row["level"] > 2:
+            knee_level = row["level"]
+            break
+    return last_ok, knee_level
+
+
+def summarize(rows_by_scenario):
+    print(f"\nFrame budget {BUDGET_MS:.1f} ms; knee = marginal cost > {KNEE_FACTOR:.0f}x the low-load rate")
+    for scenario, rows in rows_by_scenario.items():
+        last_ok, knee_level = knee(rows)
+        describe = lambda level: "-" if level is None else f"level {level} ({_load(rows[level])})"
+        print(f"{scenario}: +{_load(STEPS if scenario == 'all' else {scenario: STEPS[scenario]})} per level")
+        print(f"    within budget up to  {describe(last_ok)}")
+        print(f"    knee                 {describe(knee_level)}")
+
+
+def _load(amounts):
+    return ", ".join(f"{amounts[k]} {k}" for k in STEPS if amounts.get(k)) or "idle"
+
+
+def main_stress():
+    parser = argparse.ArgumentParser(description="Stress scenarios: frame time and memory vs load")
+    parser.add_argument("--scenario", choices=SCENARIOS + ("every",), default="every")
+    parser.add_argument("--levels", type=int, default=12, help="load levels after the idle level 0")
+    parser.add_argument("--frames", type=int, default=90, help="measured frames per level")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", default="stress.csv", help="scaling curve output")
+    args = parser.parse_args()
+
+    scenarios = SCENARIOS if args.scenario == "every" else (args.scenario,)
+    rows_by_scenario = {}
+    for scenario in scenarios:
+        print(f"Scenario {scenario}:")
+        rows_by_scenario[scenario] = run_scenario(scenario, args.levels, args.frames, args.seed)
+
+    rows = [row for scenario_rows in rows_by_scenario.values() for row in scenario_rows]
+    with open(args.csv, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote {len(rows)} rows to {args.csv}")
+    summarize(rows_by_scenario)
+
+
+if __name__ == "__main__":
+    main_stress()
@@ -0,0 +1,362 @@
+"""
+Microbenchmark suite for the hot paths, with stored baselines.
+Each benchmark is timed pytest-benchmark style: the number of calls per
+round is calibrated so a round takes at least MIN_ROUND_SECONDS, then
+ROUNDS rounds are timed and summarised (min / median / mean / stddev).
+
+Results can be saved as a named JSON baseline in benchmarks/baselines/ and
+later runs compared against it; --compare exits with status 1 when any
+benchmark got slower than the baseline by more than --threshold.
+Baselines record the machine and Python / pygame / numpy versions they were
+taken on and are only meaningful on that machine: baselines/reference.json
+is the committed reference run, re-save your own (e.g. --save local) before
+comparing on different hardware.
+Benchmarks whose dependencies are missing (e.g. the classifier model) are
+reported as skipped.
+
+Run:
+    python benchmarks/bench_suite.py                       # run everything
+    python benchmarks/bench_suite.py -k particles          # only names containing "particles"
+    python benchmarks/bench_suite.py --save main           # store baselines/main.json
+    python benchmarks/bench_suite.py --compare main --threshold 0.1
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+import pygame
+
+from config.settings import WIDTH, HEIGHT, BG_COLOR
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+ROUNDS = 7
+MIN_ROUND_SECONDS = 0.02
+BENCHMARKS = []  # (name, setup); setup() returns the callable to time
+
+
+class SkipBenchmark(Exception):
+    pass
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+# ═══════════════════════════════════════════
+#  BENCHMARKS
+# ═══════════════════════════════════════════
+def _particle_system(count):
+    from core.particles import ParticleSystem
+    random.seed(count)
+    system = ParticleSystem()
+    while len(system.particles) < count:
+        x, y = random.uniform(0, WIDTH), random.uniform(0, HEIGHT)
+        system.burst(x, y, (255, 150, 0), count=10, ptype=random.choice(("spark", "circle")))
+    del system.particles[count:]
+    for p in system.particles:
+        p.decay = 0.0  # Steady state: nothing dies while being timed
+    return system
+
+
+for _count in (100, 1_000, 10_000):
+    @benchmark(f"particles/update/{_count}")
+    def _bench_particle_update(count=_count):
+        system = _particle_system(count)
+        return system.update
+
+    @benchmark(f"particles/draw/{_count}")
+    def _bench_particle_draw(count=_count):
+        system = _particle_system(count)
+        for _ in range(3):
+            system.update()  # Give sparks a trail
+        surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+        return lambda: system.draw(surface)
+
+
+@benchmark("sprites/_grid_to_surface")
+def _bench_grid_to_surface():
+    from ui.pixel_sprites import _grid_to_surface
+    rng = random.Random(0)
+    colors = [(255, 150, 0), (255, 50, 0), (255, 255, 200)]
+    grid = [[rng.choice(colors) if rng.random() < 0.7 else None for _ in range(32)] for _ in range(32)]
+    return lambda: _grid_to_surface(grid)
+
+
+@benchmark("sprites/create_white_flash")
+def _bench_white_flash():
+    from ui.pixel_sprites import CHARACTER_DATA, create_white_flash
+    sprite = CHARACTER_DATA[0]["create"]()
+    return lambda: create_white_flash(sprite)
+
+
+@benchmark("spells/construct")
+def _bench_spell():
+    from core.spells import Spell
+    from ui.sprite_atlas import load_sprite_atlas
+    load_sprite_atlas()
+
+    def construct():
+        for kind in "/\\O|":
+            Spell(100, 300, 1, kind)
+            Spell(700, 300, -1, kind)
+    return construct
+
+
+def _ui():
+    from ui.manager import GameUI
+    return GameUI(), pygame.Surface((WIDTH, HEIGHT)).convert()
+
+
+@benchmark("ui/hud")
+def _bench_hud():
+    ui, surface = _ui()
+    health = [100.0]
+
+    def draw():
+        # Changing health re-renders the bars, as during a fight
+        health[0] = health[0] - 0.5 if health[0] > 1 else 100.0
+        surface.fill(BG_COLOR)
+        ui.draw(surface, health[0], 100, 100 - health[0], 100)
+    return draw
+
+
+@benchmark("ui/char_select")
+def _bench_char_select():
+    ui, surface = _ui()
+    ui.draw_char_select_screen(surface, 0)  # Previews are built once, outside the timing
+    return lambda: ui.draw_char_select_screen(surface, 2)
+
+
+@benchmark("ui/game_over")
+def _bench_game_over():
+    from ui.pixel_sprites import CHARACTER_DATA, create_victim_body_sprite
+    ui, surface = _ui()
+    char = CHARACTER_DATA[0]
+    sprite = char["create"]()
+    victim = create_victim_body_sprite(char["victim_color"], char["victim_gender"])
+    return lambda: ui.draw_game_over_screen(surface, "Player", char, sprite, victim)
+
+
+def _stroke_canvas():
+    import cv2
+    canvas = np.zeros((200, 200), dtype=np.uint8)
+    cv2.line(canvas, (40, 160), (160, 40), 255, 15)
+    return canvas
+
+
+@benchmark("vision/parse_shape")
+def _bench_parse_shape():
+    from vision.cv.predict_act import parse_shape
+    canvas = _stroke_canvas()
+    return lambda: parse_shape(canvas)
+
+
+def _classifier():
+    from vision.cv import predict_act
+    try:
+        predict_act._load_resources()
+    except Exception as e:
+        raise SkipBenchmark(f"classifier unavailable ({e})")
+    return predict_act
+
+
+@benchmark("vision/predict_action")
+def _bench_predict_action():
+    predict_act = _classifier()
+    canvas = _stroke_canvas()
+    return lambda: predict_act.predict_action(canvas)
+
+
+class _Landmark:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def _hand(x, y, pinched):
+    """21 landmarks; VisionSystem reads the index (8) and middle (12) tips."""
+    points = [_Landmark(x, y)] * 21
+    points[12] = _Landmark(x + 0.01, y) if pinched else _Landmark(x, y + 0.15)
+    return points
+
+
+def _vision():
+    from vision.manager import VisionSystem
+    return VisionSystem(camera=False)
+
+
+@benchmark("vision/stroke_frame")
+def _bench_stroke_frame():
+    vision = _vision()
+    path = [_hand(0.3 + 0.4 * i / 60, 0.5 + 0.1 * math.sin(i / 5), False) for i in range(60)]
+    frame = [0]
+
+    def track():
+        i = frame[0] = (frame[0] + 1) % len(path)
+        if i == 0:
+            vision.drawing_points = []  # Keep the stroke from growing without bound
+            vision.canvas.fill(0)
+        vision.feed_landmarks(path[i])
+    return track
+
+
+@benchmark("vision/pinch_classify")
+def _bench_pinch():
+    _classifier()
+    vision = _vision()
+    stroke = [_hand(0.35 + 0.2 * i / 17, 0.7 - 0.4 * i / 17, False) for i in range(18)]
+    pinch = _hand(0.55, 0.3, True)
+
+    def gesture():
+        # A whole gesture: the stroke, then the pinch that classifies it
+        for hand in stroke:
+            vision.feed_landmarks(hand)
+        vision.feed_landmarks(pinch)
+        vision.get_gesture()
+    return gesture
+
+
+# ═══════════════════════════════════════════
+#  RUNNER
+# ═══════════════════════════════════════════
+def measure(fn, rounds=ROUNDS, min_round=MIN_ROUND_SECONDS):
+    """Calibrate calls per round, then time `rounds` rounds; stats are seconds per call."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_round or number >= 1 << 20:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, math.ceil(min_round / elapsed)))
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return {
+        "min": min(times), "max": max(times), "mean": statistics.fmean(times),
+        "median": statistics.median(times), "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "rounds": rounds, "iterations": number,
+    }
+
+
+def run(pattern=None, rounds=ROUNDS):
+    results = {}
+    print(f"{'benchmark':<30} {'median':>10} {'min':>10} {'stddev':>9} {'iters':>7}")
+    for name, setup in BENCHMARKS:
+        if pattern and pattern not in name:
+            continue
+        try:
+            fn = setup()
+        except SkipBenchmark as e:
+            print(f"{name:<30} skipped: {e}")
+            continue
+        stats = measure(fn, rounds)
+        results[name] = stats
+        print(f"{name:<30} {_fmt(stats['median']):>10} {_fmt(stats['min']):>10} "
+              f"{stats['stddev'] / stats['median']:>8.1%} {stats['iterations']:>7}")
+    return results
+
+
+def _fmt(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def _baseline_path(name):
+    return name if name.endswith(".json") else os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save(results, name):
+    path = _baseline_path(name)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = {
+        "datetime": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine_info": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                         "pygame": pygame.version.ver, "numpy": np.__version__,
+                         "machine": platform.machine(), "processor": platform.processor(),
+                         "cpu_count": os.cpu_count(), "system": platform.platform()},
+        "benchmarks": [{"name": n, "stats": s} for n, s in results.items()],
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    print(f"Saved {len(results)} results to {path}")
+
+
+def compare(results, name, threshold, stat="median"):
+    """Print the change against a baseline; returns the names that regressed beyond threshold."""
+    with open(_baseline_path(name)) as f:
+        data = json.load(f)
+    baseline = {b["name"]: b["stats"] for b in data["benchmarks"]}
+    info = data.get("machine_info", {})
+    print(f"\nAgainst baseline '{name}' ({data['datetime']}), {stat}, threshold +{threshold:.0%}")
+    print(f"Baseline machine: {info.get('system')} {info.get('machine')}, Python {info.get('python')}, "
+          f"pygame {info.get('pygame')}")
+    print(f"{'benchmark':<30} {'baseline':>10} {'now':>10} {'change':>8}")
+    regressions = []
+    for bench, stats in results.items():
+        if bench not in baseline:
+            print(f"{bench:<30} {'-':>10} {_fmt(stats[stat]):>10}      new")
+            continue
+        before, now = baseline[bench][stat], stats[stat]
+        change = now / before - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(bench)
+            flag = "  REGRESSED"
+        print(f"{bench:<30} {_fmt(before):>10} {_fmt(now):>10} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path microbenchmarks")
+    parser.add_argument("-k", dest="pattern", default=None, help="only benchmarks whose name contains this")
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--list", action="store_true", help="list benchmark names")
+    parser.add_argument("--save", metavar="NAME", default=None, help="store results as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", default=None, help="compare with a stored baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="compare: allowed slowdown (0.1 = 10%%)")
+    parser.add_argument("--stat", default="median", choices=("min", "median", "mean"), help="compare: statistic")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, _ in BENCHMARKS:
+            print(name)
+        return
+
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    results = run(args.pattern, args.rounds)
+    if args.save:
+        save(results, args.save)
+    regressions = compare(results, args.compare, args.threshold, args.stat) if args.compare else []
+    pygame.quit()
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
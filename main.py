@@ -4,6 +4,8 @@ import os
 import random
 import cv2
 import math
+import time
+import argparse
 
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -11,39 +13,75 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 from config.settings import (
     WIDTH, HEIGHT, FPS, PIXEL_SCALE, BG_COLOR, TEXT_COLOR, ACCENT_COLOR,
     BLUE_PRIMARY, BLUE_LIGHT, BLUE_DARK, RED_PRIMARY, RED_LIGHT, RED_DARK,
-    ORANGE_PRIMARY, ORANGE_LIGHT, ORANGE_DARK, HEALTH_BAR_WIDTH, HEALTH_BAR_HEIGHT
+    ORANGE_PRIMARY, ORANGE_LIGHT, ORANGE_DARK, HEALTH_BAR_WIDTH, HEALTH_BAR_HEIGHT,
+    DEBUG_SURFACES, LOWRES_RENDER, DIRTY_RECT_RENDERING,
+    SIM_HZ, SIM_DT, MAX_CATCHUP_TICKS, RENDER_INTERPOLATION, REPLAY_DIR, TRACE_PATH
 )
 from vision.manager import VisionSystem
-from core.player import Player
-from core.bot import Bot
+from vision.scripted import ScriptedVision, ReplayVision, player_rng
+from core.world import World
+from core.replay import Replay, ReplayWriter
 from ui.manager import GameUI
 from core.particles import ParticleSystem
 from ui.pixel_sprites import (
     create_floor_tile, get_pixel_font, PIXEL_SCALE,
-    CHARACTER_DATA as CD, create_victim_sprite, 
-    create_victim_body_sprite, create_iron_cage_sprite
+    CHARACTER_DATA as CD, to_logical
 )
+from ui.sprite_atlas import load_sprite_atlas, get_sprite
+from ui.asset_bundles import get_bundle
+from ui.surface_registry import (
+    prepare, convert_registered, report_unconverted, get_overlay,
+    take_cache_miss_count, OPAQUE
+)
+from ui.dirty_rects import DirtyRectTracker
+from ui.background import ParallaxBackground
+from ui.camera import Camera
+from ui.transform_cache import cached_scale, cached_rotate, get_transform_cache
+from diagnostics.frame_profiler import FrameProfiler
+from diagnostics import trace
+from diagnostics.latency import LatencyTracker
+from diagnostics.memory import MemoryProfiler, run_rematches
 from config.iconfig import SOUND_DIR
-# Spell data configuration for easy balancing
-SPELL_CONFIG = {
-    "/":  {"name": "GUN",    "damage": (15, 20), "status": None,    "duration": 0},
-    "\\": {"name": "BOMB",   "damage": (12, 16), "status": "burn",  "duration": 240},
-    "O":  {"name": "FREEZE", "damage": (1, 4),   "status": "freeze", "duration": 240},
-    "|":  {"name": "SHIELD", "damage": (0, 0),   "status": None,    "duration": 0}
-}
+
+CAST_SOUNDS = {"/": "gun", "\\": "explosion", "O": "freeze"}
 
 class MagicGame:
-    def __init__(self):
+    def __init__(self, headless=False, vision=None, seed=None, record=False, replay=None):
+        """
+        headless: SDL dummy video/audio, no sounds and no vision thread; drive the
+        game with run_headless() instead of run(). vision: gesture source
+        (defaults to the webcam VisionSystem, or ScriptedVision when headless).
+        seed: seeds the per-match World seeds (None = random).
+        record: write every match to a replay file in REPLAY_DIR.
+        replay: a core.replay.Replay whose match is played instead (see start_replay).
+        """
+        self.headless = headless
+        self.match_seeds = random.Random(seed)
+        self.record = record
+        self.recorder = None
+        self.replay = replay
+        self._desync_logged = False
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        if DEBUG_SURFACES:
+            self._cache_miss_stats = {}
         pygame.init()
-        pygame.mixer.init()
+        if not headless:
+            pygame.mixer.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Magic Fighting Game - Pixel Edition")
         self.clock = pygame.time.Clock()
+        self.setup_framebuffer()
         self.running = True
         self.frame_count = 0
+        self.dropped_ticks = 0
+        self._prev_positions = {}
         
         # Systems
-        self.vision = VisionSystem()
+        if vision is None:
+            vision = ScriptedVision() if headless else VisionSystem()
+        self.vision = vision
         self.ui = GameUI()
         self.particles = ParticleSystem()
         
@@ -60,11 +98,11 @@ class MagicGame:
         self.selected_char_idx = 0
         self.frame_count = 0
         
-        # Entity placeholders
+        # Entity placeholders (owned by the current World)
+        self.world = None
         self.player = None
         self.bot = None
-        self.star_layers = []
-        self.tile_w = 0
+        self.background = None
         self.victim_sprite = None
         self.victim_body_sprite = None
         self.victim_x = 0
@@ -75,8 +113,6 @@ class MagicGame:
         self.lose_frame = 0
         self.rescue_frame = 0
         self.rescue_arrival_time = 0
-        self.floor_tile = None
-        self.tile_w = 0
         
         # Polish: Shake, Health Interpolation, Fades, Spell Popup
         self.shake_amount = 0.0
@@ -88,17 +124,50 @@ class MagicGame:
         self.popup_text = ""
         self.popup_timer = 0
         self.popup_color = (255, 255, 255)
+        self.popup_surf = None
+        self._popup_cache = {}
         self._vision_error_logged = False
         
         # Assets and Background
+        self.setup_sprites()
         self.setup_assets()
         self.setup_background()
+        # Post-load pass: everything cached so far goes to the display pixel format
+        convert_registered()
+        if DEBUG_SURFACES:
+            report_unconverted(self, "game")
+        # The highlighted character's bundle is ready before the first match
+        get_bundle(self.selected_char_idx)
         
         # UI state
         self.ui.reset_start_animation()
-        self.frozen_font = get_pixel_font(22)
+        self.frozen_font = get_pixel_font(2)
+        self.profiler = FrameProfiler()
+        self.latency = None  # LatencyTracker when measuring gesture-to-spell latency (--latency)
+        self.memory = None  # MemoryProfiler when checking for leaks across rematches (--memcheck)
+
+    def setup_framebuffer(self):
+        # World content renders offset-free into the camera's offscreen surface.
+        # Low-res mode: that surface is at logical resolution (1 art pixel = 1 pixel)
+        # and the camera's present blit does the single integer upscale
+        self.render_scale = PIXEL_SCALE if LOWRES_RENDER else 1
+        self.camera = Camera(self.screen, self.render_scale)
+        # Dirty-rect presentation (full-frame upscale in low-res mode makes it moot there)
+        self.dirty = None
+        if DIRTY_RECT_RENDERING and not LOWRES_RENDER:
+            self.dirty = DirtyRectTracker(self.screen.get_rect())
+
+    def setup_sprites(self):
+        # Load (or bake on first run) the sprite atlas; fall back to procedural sprites
+        try:
+            load_sprite_atlas()
+        except Exception as e:
+            print(f"Failed to load sprite atlas: {e}")
 
     def setup_assets(self):
+        if self.headless:
+            self.disable_sounds()
+            return
         # Load sounds
         try:
             music_vol, skill_vol, ui_vol = 0.5, 0.8, 0.7
@@ -127,64 +196,47 @@ class MagicGame:
             self.menu_music_channel = None
         except Exception as e:
             print(f"Failed to load sounds: {e}")
-            self.match_end_sound = self.win_sound = self.lose_sound = None
-            self.menu_music = self.gameplay_music = None
-            self.sounds = {}
-            self.gameplay_music_channel = self.menu_music_channel = None
+            self.disable_sounds()
+
+    def disable_sounds(self):
+        self.match_end_sound = self.win_sound = self.lose_sound = None
+        self.menu_music = self.gameplay_music = None
+        self.sounds = {}
+        self.gameplay_music_channel = self.menu_music_channel = None
 
     def setup_background(self):
-        self.floor_tile = create_floor_tile()
-        if self.floor_tile is not None:
-            self.tile_w = int(self.floor_tile.get_width())
-        else:
-            self.tile_w = WIDTH
-        
-        self.star_layers = []
-        layer_config = [
-            (80, 0.3, (50, 60, 80)),
-            (50, 0.8, (100, 130, 160)),
-            (30, 1.5, (200, 220, 255)),
-        ]
-        
-        # Pre-render star layers onto surfaces that are 2x height for seamless scrolling
-        for count, speed, base_color in layer_config:
-            layer_surf = pygame.Surface((WIDTH, HEIGHT * 2), pygame.SRCALPHA)
-            for _ in range(count):
-                sx = random.uniform(0, WIDTH)
-                sy = random.uniform(0, HEIGHT * 2)
-                size = PIXEL_SCALE if speed < 1.0 else PIXEL_SCALE + 1
-                # Add some slight variation to the base color
-                var = random.randint(-20, 20)
-                c = (max(0, min(255, base_color[0] + var)),
-                     max(0, min(255, base_color[1] + var)),
-                     max(0, min(255, base_color[2] + var)))
-                pygame.draw.rect(layer_surf, c, (int(sx), int(sy), size, size))
-            
-            self.star_layers.append({
-                "surf": layer_surf,
-                "speed": speed,
-                "y": 0.0
-            })
+        floor_tile = prepare(get_sprite("floor", create_floor_tile), OPAQUE)
+        self.background = ParallaxBackground(floor_tile, self.render_scale)
 
     def reset_game(self):
         char_data = CD[self.selected_char_idx]
         
-        self.player = Player(WIDTH // 4, HEIGHT // 2)
-        self.player.set_character_sprite(char_data["create"]())
+        if self.replay is not None:
+            self.world = self.replay.new_world()
+        else:
+            self.world = World(self.match_seeds.getrandbits(32))
+        if self.record:
+            self.start_recording()
+        if not self.headless:
+            self.world.subscribe(self.on_world_event)
+            self.world.profiler = self.profiler
+        self.player, self.bot = self.world.player, self.world.bot
+        # Sprites come from the character's bundle (usually built during selection)
+        bundle = get_bundle(self.selected_char_idx)
+        self.player.set_character_sprite(bundle.hero[0], bundle.hero)
         self.player.ui_color = char_data["color"]
         
-        self.bot = Bot(WIDTH * 3 // 4, HEIGHT // 2)
-        self.bot.set_bot_sprite(char_data["opponent_create"](char_data["opponent_color"]))
+        self.bot.set_bot_sprite(bundle.opponent[0], bundle.opponent)
         self.bot.ui_color = char_data["opponent_color"]
         
         # Rescue/Lost state entities
-        self.victim_sprite = create_victim_sprite(char_data["victim_color"], char_data["victim_gender"])
-        self.victim_body_sprite = create_victim_body_sprite(char_data["victim_color"], char_data["victim_gender"])
+        self.victim_sprite = bundle.victim
+        self.victim_body_sprite = bundle.victim_body
         self.victim_x, self.victim_y = WIDTH - 80, HEIGHT // 2 - 40
         self.rescue_frame = 0
         self.rescue_arrival_time = 0
         
-        self.iron_cage_sprite = create_iron_cage_sprite()
+        self.iron_cage_sprite = bundle.cage
         self.cage_y, self.cage_fall_speed, self.lose_frame = -200, 0, 0
         
         # Reset display health
@@ -194,12 +246,38 @@ class MagicGame:
         if self.vision: self.vision.clear_gesture()
         self.current_state = self.STATE_PLAYING
         self.winner = None
+        if DEBUG_SURFACES:
+            report_unconverted(self, "game")
+
+    def start_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+        os.makedirs(REPLAY_DIR, exist_ok=True)
+        path = os.path.join(REPLAY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.world.seed:08x}.mgr")
+        self.recorder = ReplayWriter(path, self.world, self.selected_char_idx)
+        print(f"Replay: recording {path}")
+
+    def start_replay(self, tick=0):
+        """Begin the loaded replay's match, optionally jumping straight to `tick`."""
+        self.selected_char_idx = self.replay.char
+        self.reset_game()
+        if tick:
+            self.replay.seek(self.world, tick)
+            self.vision.seek(self.world.tick)
 
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED) and self.dirty is not None:
+                self.dirty.invalidate()
             if event.type == pygame.KEYDOWN:
+                if self.recorder is not None and self.current_state == self.STATE_PLAYING:
+                    self.recorder.key(self.world.tick + 1, event.key)
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                if event.key == pygame.K_F4 and trace.is_enabled():
+                    trace.dump()
                 if event.key == pygame.K_s:
                     if self.sounds.get("ui"): self.sounds["ui"].play(maxtime=500)
                     if self.current_state == self.STATE_START:
@@ -218,9 +296,11 @@ class MagicGame:
                     if event.key == pygame.K_LEFT:
                         if self.sounds.get("ui"): self.sounds["ui"].play(maxtime=500)
                         self.selected_char_idx = (self.selected_char_idx - 1) % 5
+                        get_bundle(self.selected_char_idx)  # Warm it while the player decides
                     elif event.key == pygame.K_RIGHT:
                         if self.sounds.get("ui"): self.sounds["ui"].play(maxtime=500)
                         self.selected_char_idx = (self.selected_char_idx + 1) % 5
+                        get_bundle(self.selected_char_idx)  # Warm it while the player decides
                     elif event.key == pygame.K_RETURN:
                         if self.sounds.get("ui"): self.sounds["ui"].play(maxtime=500)
                         pygame.mixer.stop()
@@ -228,6 +308,10 @@ class MagicGame:
 
     def update(self):
         self.frame_count += 1
+        if self.memory is not None:
+            self.memory.observe(self.current_state)
+        if self.background_scrolls():
+            self.background.update()
         
         # Don't exit if vision fails, just log it. Use keyboard as fallback.
         if not hasattr(self, '_vision_error_logged') and not self.vision.running:
@@ -236,19 +320,10 @@ class MagicGame:
 
         # Music management
         self.manage_music()
+        self.profiler.lap("update other")
 
         if self.current_state == self.STATE_PLAYING:
-            gesture = self.vision.get_gesture()
-            if gesture:
-                self.player.cast_spell(gesture, self.particles, self.sounds)
-                self.show_popup(gesture)
-
-            self.player.update(self.particles)
-            self.bot.update(self.player, self.particles, self.sounds)
-            self.bot.rect.x = max(WIDTH // 2, min(WIDTH - 50, self.bot.rect.x))
-            self.particles.update()
-            self.check_collisions()
-            self.check_win_conditions()
+            self.update_match()
         
         elif self.current_state == self.STATE_LOST:
             self.update_lose_animation()
@@ -279,6 +354,63 @@ class MagicGame:
         # 4. Popup Timer
         if self.popup_timer > 0:
             self.popup_timer -= 1
+        self.profiler.lap("update other")
+
+    def update_match(self):
+        """One gameplay tick: feed input to the World, then run its cosmetics."""
+        gesture = self.vision.get_gesture()
+        gesture_event = self.vision.last_event if gesture else None
+        self.profiler.lap("vision")
+        if gesture and not self.headless:
+            self.show_popup(gesture)
+        if self.recorder is not None:
+            self.recorder.gesture(self.world.tick + 1, gesture)
+        with trace.span("world.step", "sim"):
+            events = self.world.step({"gesture": gesture})
+        if gesture_event is not None and self.latency is not None:
+            self.latency.applied(gesture_event, any(e["type"] == "gesture" and e["accepted"] for e in events))
+        if self.recorder is not None:
+            self.recorder.after_step(self.world)
+        if self.replay is not None and not self._desync_logged and not self.replay.verify(self.world):
+            print(f"Replay: desync at tick {self.world.tick} (state differs from the recorded keyframe)")
+            self._desync_logged = True
+        if not self.headless:
+            self.profiler.lap("update other")
+            with trace.span("particles.update"):
+                self.emit_ambient_particles()
+                self.particles.update()
+            self.profiler.lap("particles update")
+        self.check_win_conditions()
+
+    def emit_ambient_particles(self):
+        for entity in (self.player, self.bot):
+            entity.emit_status_particles(self.particles)
+            for s in entity.spells:
+                s.emit_trail(self.particles)
+
+    def play_sound(self, name):
+        sound = self.sounds.get(name)
+        if sound: sound.play(maxtime=800)
+
+    def on_world_event(self, event):
+        """Particles, audio and screen shake for World events."""
+        kind = event["type"]
+        if kind == "cast":
+            s = event["spell"]
+            self.play_sound(CAST_SOUNDS.get(s.type))
+            if event["who"] == "player":
+                self.particles.burst(self.player.rect.right, self.player.rect.centery, s.color, count=10, ptype="circle")
+            else:
+                self.particles.burst(s.rect.centerx, s.rect.centery, s.color, count=8, ptype="circle")
+        elif kind in ("blocked", "hit"):
+            s = event["spell"]
+            self.particles.burst(s.rect.centerx, s.rect.centery, s.color, count=15, ptype="spark")
+            if kind == "hit":
+                self.shake_amount = float(max(self.shake_amount, event["damage"] * 0.5))
+            if s.type in ["/", "\\", "O"]:
+                self.play_sound("shield")
+        elif kind == "match_end":
+            if self.match_end_sound: self.match_end_sound.play()
 
     def show_popup(self, gesture):
         names = {"/": "GUN!", "\\": "BOMB!", "O": "FREEZE!", "|": "SHIELD!"}
@@ -290,6 +422,11 @@ class MagicGame:
         }
         self.popup_text = names.get(gesture, "MAGIC!")
         self.popup_color = colors.get(gesture, (255, 255, 255))
+        # One rendered surface per popup text, faded with set_alpha
+        key = (self.popup_text, self.popup_color)
+        if key not in self._popup_cache:
+            self._popup_cache[key] = self.frozen_font.render(self.popup_text, True, self.popup_color)
+        self.popup_surf = self._popup_cache[key]
         self.popup_timer = 90
 
     def manage_music(self):
@@ -306,57 +443,12 @@ class MagicGame:
             if self.menu_music_channel: self.menu_music_channel.stop(); self.menu_music_channel = None
             if self.gameplay_music_channel: self.gameplay_music_channel.stop(); self.gameplay_music_channel = None
 
-    def check_collisions(self):
-        self.check_spells_vs_entity(self.player.spells, self.bot)
-        self.check_spells_vs_entity(self.bot.spells, self.player)
-
-    def check_spells_vs_entity(self, spells, target):
-        for s in spells:
-            if s.active and s.rect.colliderect(target.rect):
-                s.active = False
-                self.particles.burst(s.rect.centerx, s.rect.centery, s.color, count=15, ptype="spark")
-                
-                # Shield block logic
-                if target.block_timer > 0 and s.type in ["/", "\\", "O"]:
-                    if self.sounds.get("shield"): self.sounds["shield"].play(maxtime=800)
-                    continue
-                
-                # Apply data-driven effects
-                config = SPELL_CONFIG.get(s.type)
-                if config is not None:
-                    dmg_range = config["damage"]
-                    if isinstance(dmg_range, tuple):
-                        d_min, d_max = dmg_range
-                        damage = float(random.uniform(float(d_min), float(d_max)))
-                    else:
-                        damage = 0.0
-                    
-                    status = config["status"]
-                    duration = config["duration"]
-                    if status == "burn": target.burn_timer = int(duration)
-                    elif status == "freeze": target.freeze_timer = int(duration)
-                    
-                    target.hurt_timer = 10
-                    target.health = max(0.0, target.health - damage)
-                    self.shake_amount = float(max(self.shake_amount, damage * 0.5))
-                    
-                    if s.type in ["/", "\\", "O"] and self.sounds.get("shield"): 
-                        self.sounds["shield"].play(maxtime=800)
-
     def check_win_conditions(self):
-        if self.player.health <= 0:
+        if self.world.winner == "Bot":
             self.current_state, self.winner, self.lose_frame = self.STATE_LOST, "Bot", 0
             self.cage_y, self.cage_fall_speed = -300, 0
-            if self.match_end_sound: self.match_end_sound.play()
-            self.clear_entity_effects(self.player)
-        elif self.bot.health <= 0:
+        elif self.world.winner == "Player":
             self.current_state, self.rescue_frame = self.STATE_RESCUE, 0
-            if self.match_end_sound: self.match_end_sound.play()
-            self.clear_entity_effects(self.bot)
-
-    def clear_entity_effects(self, entity):
-        entity.burn_timer = entity.freeze_timer = entity.block_timer = entity.hurt_timer = 0
-        entity.spells.clear()
 
     def update_rescue_animation(self):
         self.rescue_frame += 1
@@ -382,12 +474,42 @@ class MagicGame:
             if self.lose_sound: self.lose_sound.play()
 
     def draw(self):
-        self.draw_background()
+        regions = self.collect_dirty_regions() if self.dirty is not None else None
+        if regions == []:
+            # Nothing changed since last frame
+            self.draw_vision_feedback()
+            self.profiler.lap("vision feedback")
+            with trace.span("flip"):
+                self.dirty.present(self.screen, regions)
+            if self.latency is not None:
+                self.latency.frame_shown()
+            self.profiler.lap("flip")
+            return
+        if self.dirty is not None:
+            # Partial frames never shake, so the camera draws straight to the clipped screen
+            self.dirty.begin(self.screen, regions)
+        
+        # World layers go to the camera's surfaces without offsets;
+        # shake is applied once when the camera presents them
+        self.camera.begin(self.shake_offset)
+        world = self.camera.world
+        in_world = self.current_state in [self.STATE_PLAYING, self.STATE_RESCUE, self.STATE_LOST]
+        
+        self.draw_background(world)
+        self.profiler.lap("background")
         self.draw_vision_feedback()
+        self.profiler.lap("vision feedback")
         
-        if self.current_state in [self.STATE_PLAYING, self.STATE_RESCUE, self.STATE_LOST]:
-            self.draw_world()
-            self.draw_entities()
+        if in_world:
+            self.draw_world(world)
+            self.profiler.lap("world")
+            self.draw_entities(world)
+        self.camera.present()
+        self.profiler.lap("present")
+        
+        # HUD and menus are drawn at native resolution
+        if in_world:
+            self.draw_entity_labels()
             self.draw_ui()
         elif self.current_state == self.STATE_START:
             self.ui.draw_start_screen(self.screen)
@@ -397,20 +519,91 @@ class MagicGame:
             self.draw_game_over()
             
         # Spell popup
-        if self.popup_timer > 0:
+        if self.popup_timer > 0 and self.popup_surf is not None:
             alpha = min(255, self.popup_timer * 5)
-            txt = self.frozen_font.render(self.popup_text, True, self.popup_color)
+            txt = self.popup_surf
             txt.set_alpha(alpha)
             self.screen.blit(txt, (WIDTH // 2 - txt.get_width() // 2, HEIGHT // 2 - 100))
             
-        # Screen fade overlay
+        # Screen fade overlay (shared preallocated surface)
         if self.fade_alpha > 0:
-            fade_surf = pygame.Surface((WIDTH, HEIGHT))
+            fade_surf = get_overlay((WIDTH, HEIGHT))
             fade_surf.set_alpha(self.fade_alpha)
-            fade_surf.fill((0, 0, 0))
             self.screen.blit(fade_surf, (0, 0))
+        self.profiler.lap("hud")
+        self.profiler.draw(self.screen)
+        self.profiler.lap("profiler")
             
-        pygame.display.flip()
+        with trace.span("flip"):
+            if self.dirty is not None:
+                self.dirty.present(self.screen, regions)
+            else:
+                pygame.display.flip()
+        if self.latency is not None:
+            self.latency.frame_shown()
+        self.profiler.lap("flip")
+
+    def background_scrolls(self):
+        """Parallax runs during play; dirty-rect mode holds it still elsewhere so static screens stay static."""
+        return not DIRTY_RECT_RENDERING or self.current_state == self.STATE_PLAYING
+
+    def collect_dirty_regions(self):
+        """Report this frame's changed regions to the dirty-rect tracker and return them."""
+        d = self.dirty
+        d.set_scene((self.current_state, self.selected_char_idx, self.winner, int(self.fade_alpha)))
+        if self.background_scrolls() or self.shake_offset != (0, 0):
+            d.invalidate()
+        elif self.current_state == self.STATE_RESCUE:
+            for r in self.rescue_dirty_rects():
+                d.add(r)
+        elif self.current_state == self.STATE_LOST:
+            for r in self.lost_dirty_rects():
+                d.add(r)
+        elif self.current_state == self.STATE_GAME_OVER:
+            sprite = self.player.base_sprite if self.winner == "Player" else self.bot.base_sprite
+            d.add(self.ui.game_over_dirty_rect(sprite))
+        if self.popup_timer > 0:
+            w, h = self.frozen_font.size(self.popup_text)
+            d.add((WIDTH // 2 - w // 2, HEIGHT // 2 - 100, w, h))
+        panel = self.profiler.panel_rect()
+        if panel is not None:
+            d.add(panel)
+        return d.regions()
+
+    def rescue_dirty_rects(self):
+        floor_y = HEIGHT // 2 + 80
+        rects = []
+        if self.rescue_frame < 60 and self.bot is not None:
+            bw, bh = self.bot.base_sprite.get_size()
+            rects.append((self.bot.rect.x, floor_y - bw, bh, bw))
+        if self.player is not None:
+            pw, ph = self.player.base_sprite.get_size()
+            rects.append((self.player.rect.x, self.player.rect.y - 22, pw, ph + 22))
+        if self.victim_sprite is not None:
+            rects.append((self.victim_x, self.victim_y, *self.victim_sprite.get_size()))
+        return rects
+
+    def lost_dirty_rects(self):
+        if self.player is None or self.bot is None: return []
+        floor_y = HEIGHT // 2 + 80
+        pw, ph = self.player.base_sprite.get_size()
+        bw, bh = self.bot.base_sprite.get_size()
+        rects = [
+            (self.player.rect.centerx - ph // 2, floor_y - pw, ph, pw),
+            (self.bot.rect.x, self.bot.rect.y - 25, bw, bh + 25),
+        ]
+        if self.iron_cage_sprite is not None:
+            cw, ch = self.iron_cage_sprite.get_size()
+            rects.append((self.player.rect.centerx - cw // 2, int(self.cage_y), cw, ch))
+        return rects
+
+    def _view(self, x, y):
+        """World position -> position on the camera's world surface."""
+        return self.camera.to_world(x, y)
+
+    def _view_rect(self, x, y, w, h):
+        s = self.render_scale
+        return (*self._view(x, y), max(1, w // s), max(1, h // s))
 
     def draw_vision_feedback(self):
         """Show Vision and Neural feeds in separate OpenCV windows in the main thread."""
@@ -427,89 +620,84 @@ class MagicGame:
         # Required for OpenCV windows to update in the main thread
         cv2.waitKey(1)
 
-    def draw_background(self):
-        self.screen.fill(BG_COLOR)
-        for layer in self.star_layers:
-            # Update scroll position
-            layer["y"] = (layer["y"] + layer["speed"]) % HEIGHT
-            
-            # Draw two copies for seamless vertical scrolling
-            # Apply 20% shake offset to background layers for parallax depth
-            off_x = self.shake_offset[0] * 0.2
-            off_y = self.shake_offset[1] * 0.2
-            
-            # Blit the pre-rendered surface (which is 2x height)
-            # We just need to blit the part that's currently visible
-            self.screen.blit(layer["surf"], (int(off_x), int(off_y - layer["y"])))
+    def draw_background(self, surface):
+        surface.fill(BG_COLOR)
+        self.background.draw_stars(surface, self._view, self.shake_offset)
 
-    def draw_world(self):
-        if self.floor_tile is None: return
+    def draw_world(self, surface):
+        if self.background.floor_strip is None: return
         floor_y = HEIGHT // 2 + 80
-        # Floor (scrolling)
-        offset = (self.frame_count * 2) % self.tile_w
-        for x in range(-self.tile_w, WIDTH + self.tile_w, self.tile_w):
-            self.screen.blit(self.floor_tile, (x - offset + self.shake_offset[0], floor_y + self.shake_offset[1]))
+        # Floor (scrolling, one pre-rendered strip)
+        self.background.draw_floor(surface, floor_y, self._view)
         
         # Static floor line - Optimized with single rect instead of loop
-        pygame.draw.rect(self.screen, ACCENT_COLOR, (self.shake_offset[0], floor_y + self.shake_offset[1], WIDTH, PIXEL_SCALE))
+        pygame.draw.rect(surface, ACCENT_COLOR, self._view_rect(0, floor_y, WIDTH, PIXEL_SCALE))
         
         if self.victim_sprite is not None:
-            self.draw_castle(floor_y)
+            self.draw_castle(surface, floor_y)
 
-    def draw_castle(self, floor_y):
+    def draw_castle(self, surface, floor_y):
         castle_w, castle_h = 60, 130
         castle_x, castle_y = int(self.victim_x) - 6, floor_y - castle_h
-        pygame.draw.rect(self.screen, (70, 60, 80), (castle_x + self.shake_offset[0], castle_y + self.shake_offset[1], castle_w, castle_h))
+        pygame.draw.rect(surface, (70, 60, 80), self._view_rect(castle_x, castle_y, castle_w, castle_h))
         # (Simplified stone texture/battlement drawing)
         win_w, win_h = 28, 30
         win_x, win_y = castle_x + (castle_w - win_w) // 2, castle_y + 14
-        pygame.draw.rect(self.screen, (30, 25, 40), (win_x + self.shake_offset[0], win_y + self.shake_offset[1], win_w, win_h))
-        vs_scaled = pygame.transform.scale(self.victim_sprite, (win_w - 4, win_h - 6))
-        self.screen.blit(vs_scaled, (win_x + 2 + self.shake_offset[0], win_y + 2 + self.shake_offset[1]))
+        pygame.draw.rect(surface, (30, 25, 40), self._view_rect(win_x, win_y, win_w, win_h))
+        s = self.render_scale
+        vs_scaled = cached_scale(self.victim_sprite, ((win_w - 4) // s, (win_h - 6) // s))
+        surface.blit(vs_scaled, self._view(win_x + 2, win_y + 2))
 
-    def draw_entities(self):
+    def draw_entities(self, surface):
         if self.current_state == self.STATE_RESCUE:
-            self.draw_rescue_entities()
+            self.draw_rescue_entities(surface)
         elif self.current_state == self.STATE_LOST:
-            self.draw_lost_entities()
+            self.draw_lost_entities(surface)
         else:
-            self.draw_gameplay_entities()
-        self.particles.draw(self.screen, self.shake_offset)
+            self.draw_gameplay_entities(self.camera.view)
+        self.profiler.lap("entities")
+        self.particles.draw(self.camera.view, self.render_scale)
+        self.profiler.lap("particles draw")
 
-    def draw_rescue_entities(self):
+    def draw_rescue_entities(self, surface):
+        s = self.render_scale
         if self.rescue_frame < 60 and self.bot is not None:
-            dead_bot = pygame.transform.rotate(self.bot.base_sprite, -90)
+            dead_bot = cached_rotate(to_logical(self.bot.base_sprite, s), -90)
             dead_bot.set_alpha(max(0, 255 - self.rescue_frame * 5))
-            self.screen.blit(dead_bot, (self.bot.rect.x + self.shake_offset[0], HEIGHT // 2 + 80 - dead_bot.get_height() + self.shake_offset[1]))
+            surface.blit(dead_bot, self._view(self.bot.rect.x, HEIGHT // 2 + 80 - dead_bot.get_height() * s))
         
         if self.player is not None:
             ani_offset = (self.rescue_frame // 5) % 2 * 2 if self.player.rect.x < self.victim_x - 45 else 0
             jump_p = int(abs(math.sin(max(0, self.rescue_frame - 40) * 0.2) * 20)) if self.player.rect.x >= self.victim_x - 45 else 0
-            self.screen.blit(self.player.base_sprite, (self.player.rect.x + self.shake_offset[0], self.player.rect.y - jump_p - ani_offset + self.shake_offset[1]))
+            surface.blit(to_logical(self.player.base_sprite, s), self._view(self.player.rect.x, self.player.rect.y - jump_p - ani_offset))
 
         # Victim
         if self.victim_sprite is not None:
-            self.screen.blit(self.victim_sprite, (self.victim_x + self.shake_offset[0], self.victim_y + self.shake_offset[1]))
+            surface.blit(to_logical(self.victim_sprite, s), self._view(self.victim_x, self.victim_y))
 
-    def draw_lost_entities(self):
+    def draw_lost_entities(self, surface):
         if self.player is None or self.bot is None: return
-        dead_player = pygame.transform.rotate(self.player.base_sprite, 90)
-        self.screen.blit(dead_player, (self.player.rect.centerx - dead_player.get_width() // 2 + self.shake_offset[0], HEIGHT // 2 + 80 - dead_player.get_height() + self.shake_offset[1]))
+        s = self.render_scale
+        dead_player = cached_rotate(to_logical(self.player.base_sprite, s), 90)
+        surface.blit(dead_player, self._view(self.player.rect.centerx - dead_player.get_width() * s // 2, HEIGHT // 2 + 80 - dead_player.get_height() * s))
         if self.iron_cage_sprite is not None:
-            self.screen.blit(self.iron_cage_sprite, (self.player.rect.centerx - self.iron_cage_sprite.get_width() // 2 + self.shake_offset[0], int(self.cage_y) + self.shake_offset[1]))
-        self.screen.blit(self.bot.base_sprite, (self.bot.rect.x + self.shake_offset[0], self.bot.rect.y - int(abs(math.sin(self.lose_frame * 0.2) * 25)) + self.shake_offset[1]))
-
-    def draw_gameplay_entities(self):
-        # Draw player and bot with shake
-        self.player.draw(self.screen, self.shake_offset)
-        self.bot.draw(self.screen, self.shake_offset)
-        
+            cage = to_logical(self.iron_cage_sprite, s)
+            surface.blit(cage, self._view(self.player.rect.centerx - self.iron_cage_sprite.get_width() // 2, int(self.cage_y)))
+        surface.blit(to_logical(self.bot.base_sprite, s), self._view(self.bot.rect.x, self.bot.rect.y - int(abs(math.sin(self.lose_frame * 0.2) * 25))))
+
+    def draw_gameplay_entities(self, view):
+        # View coordinates are world coordinates; the camera applies shake
+        self.player.draw(view, self.render_scale)
+        self.bot.draw(view, self.render_scale)
+
+    def draw_entity_labels(self):
+        """Status text above entities, always at native resolution."""
+        if self.current_state != self.STATE_PLAYING: return
+        half_w = self.frozen_font.size("FROZEN!")[0] // 2
         if self.bot.freeze_timer > 0:
-            txt = self.frozen_font.render("FROZEN!", True, (230, 160, 40))
-            self.screen.blit(txt, (self.bot.rect.centerx - 40 + self.shake_offset[0], self.bot.rect.top - 30 + self.shake_offset[1]))
+            self.frozen_font.draw(self.screen, "FROZEN!", self.camera.to_screen(self.bot.rect.centerx - half_w, self.bot.rect.top - 30), (230, 160, 40))
         if self.player.freeze_timer > 0:
-            txt = self.frozen_font.render("FROZEN!", True, (230, 160, 40))
-            self.screen.blit(txt, (self.player.rect.centerx - 40 + self.shake_offset[0], self.player.rect.top - 30 + self.shake_offset[1]))
+            self.frozen_font.draw(self.screen, "FROZEN!", self.camera.to_screen(self.player.rect.centerx - half_w, self.player.rect.top - 30), (230, 160, 40))
 
     def draw_ui(self):
         cd = CD[self.selected_char_idx]
@@ -531,19 +719,204 @@ class MagicGame:
         else:
             self.ui.draw_game_over_screen(self.screen, self.winner, char_data["opponent_name"], self.bot.base_sprite)
 
+    def report_cache_misses(self, every=300):
+        """Debug: per-state surface cache misses per frame, printed every `every` frames."""
+        count = take_cache_miss_count()
+        stats = self._cache_miss_stats.setdefault(self.current_state, [0, 0, 0])  # frames, total, max
+        stats[0] += 1
+        stats[1] += count
+        stats[2] = max(stats[2], count)
+        if self.frame_count % every == 0:
+            for state, (frames, total, peak) in self._cache_miss_stats.items():
+                print(f"SurfaceRegistry: {state} surface cache misses/frame avg {total / frames:.2f} max {peak}")
+            self._cache_miss_stats.clear()
+
+    def interpolated_entities(self):
+        if self.current_state != self.STATE_PLAYING: return []
+        return [self.player, self.bot, *self.player.spells, *self.bot.spells]
+
+    def snapshot_positions(self):
+        """Remember entity positions before a tick (render interpolation)."""
+        self._prev_positions = {id(e): (e, e.rect.topleft) for e in self.interpolated_entities()}
+
+    def interpolate_positions(self, alpha):
+        """Move entities alpha of the way from their pre-tick positions; returns what to restore."""
+        restore = []
+        for e in self.interpolated_entities():
+            prev = self._prev_positions.get(id(e))
+            if prev is None or prev[0] is not e: continue  # Spawned this tick
+            (px, py), (cx, cy) = prev[1], e.rect.topleft
+            restore.append((e, (cx, cy)))
+            e.rect.topleft = (round(px + (cx - px) * alpha), round(py + (cy - py) * alpha))
+        return restore
+
     def run(self):
+        # Fixed-timestep loop: real time is accumulated and spent in SIM_DT ticks,
+        # so the game runs at the same speed however long rendering takes.
+        accumulator = SIM_DT  # First frame runs one tick so there is state to draw
+        last = time.perf_counter()
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            self.profiler.start_frame()
+            now = time.perf_counter()
+            accumulator += now - last
+            last = now
+            with trace.span("events"):
+                self.handle_events()
+            self.profiler.lap("events")
+            ticks = 0
+            while accumulator >= SIM_DT:
+                if ticks == MAX_CATCHUP_TICKS:
+                    # Too far behind: skip the backlog instead of spiralling into slow motion
+                    self.dropped_ticks += int(accumulator // SIM_DT)
+                    accumulator %= SIM_DT
+                    break
+                if RENDER_INTERPOLATION:
+                    self.snapshot_positions()
+                with trace.span("tick", "sim"):
+                    self.update()
+                accumulator -= SIM_DT
+                ticks += 1
+            restore = self.interpolate_positions(accumulator / SIM_DT) if RENDER_INTERPOLATION else None
+            with trace.span("draw", "render"):
+                self.draw()
+            for e, pos in restore or ():
+                e.rect.topleft = pos
+            if DEBUG_SURFACES:
+                self.report_cache_misses()
+            with trace.span("sleep"):
+                self.clock.tick(FPS)
+            if self.profiler.enabled:
+                self.profiler.lap("sleep")
+                spells = len(self.world.player.spells) + len(self.world.bot.spells) if self.world else 0
+                self.profiler.end_frame(ticks=ticks, dropped=self.dropped_ticks,
+                                        particles=len(self.particles.particles), spells=spells)
         self.vision.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.latency is not None:
+            self.latency.report()
+        if self.memory is not None:
+            self.memory.report()
+        if DEBUG_SURFACES:
+            print(f"TransformCache: {get_transform_cache().stats()}")
+            print(f"Simulation: {self.frame_count} ticks, {self.dropped_ticks} dropped")
         pygame.quit()
         sys.exit()
 
+    def run_headless(self, matches=1, max_ticks=SIM_HZ * 300):
+        """
+        Play matches back to back with no rendering and no frame pacing.
+        Matches longer than max_ticks end as a draw. Returns one dict per match.
+        """
+        results = []
+        total_ticks = 0
+        start = time.perf_counter()
+        for _ in range(matches):
+            self.reset_game()
+            ticks = self.play_headless_match(max_ticks)
+            results.append({"seed": self.world.seed, "winner": self.world.winner, "ticks": ticks,
+                            "player_health": self.player.health, "bot_health": self.bot.health})
+            total_ticks += ticks
+        elapsed = time.perf_counter() - start
+        self.headless_stats = {"matches": matches, "ticks": total_ticks, "seconds": elapsed,
+                               "ticks_per_second": total_ticks / elapsed if elapsed else 0.0}
+        return results
+
+    def play_headless_match(self, max_ticks=SIM_HZ * 300):
+        """Run the current match to its end (or max_ticks more ticks); returns the ticks run."""
+        ticks = 0
+        while self.current_state == self.STATE_PLAYING and ticks < max_ticks:
+            self.update_match()
+            ticks += 1
+        return ticks
+
 def main():
-    game = MagicGame()
-    game.run()
+    parser = argparse.ArgumentParser(description="Magic Fighting Game")
+    parser.add_argument("--headless", action="store_true",
+                        help="simulate matches with no window, sound or camera, as fast as possible")
+    parser.add_argument("--matches", type=int, default=1, help="headless: matches to play")
+    parser.add_argument("--char", type=int, default=0, help="headless: character index (0-4)")
+    parser.add_argument("--script", default=None,
+                        help="headless: player gestures cast in order, e.g. '/OO|' (random if omitted)")
+    parser.add_argument("--interval", type=int, default=45, help="headless: ticks between player casts")
+    parser.add_argument("--max-ticks", type=int, default=SIM_HZ * 300, help="headless: tick limit per match")
+    parser.add_argument("--seed", type=int, default=None, help="seed for match RNG streams and the scripted player")
+    parser.add_argument("--record", action="store_true", help=f"record every match to {REPLAY_DIR}/")
+    parser.add_argument("--replay", metavar="FILE", default=None, help="play back a recorded match")
+    parser.add_argument("--fast", action="store_true", help="replay: simulate as fast as possible, no window")
+    parser.add_argument("--seek", type=int, default=0, help="replay: start at this tick")
+    parser.add_argument("--latency", action="store_true",
+                        help="measure gesture-to-spell latency (camera frame to pixels), reported at exit")
+    parser.add_argument("--memcheck", type=int, default=None, metavar="CYCLES",
+                        help="play CYCLES automated rematches and report memory / Surface growth")
+    parser.add_argument("--memprofile", action="store_true",
+                        help="snapshot memory at every state change while playing, reported at exit")
+    parser.add_argument("--trace", nargs="?", const=TRACE_PATH, default=None, metavar="FILE",
+                        help=f"record Chrome trace spans, written at exit or with F4 (default {TRACE_PATH})")
+    args = parser.parse_args()
+    if args.trace:
+        trace.enable(args.trace)
+
+    if args.replay:
+        replay_main(args)
+        return
+
+    if args.memcheck:
+        memcheck_main(args)
+        return
+
+    if not args.headless:
+        game = MagicGame(seed=args.seed, record=args.record)
+        if args.latency:
+            game.latency = LatencyTracker()
+        if args.memprofile:
+            game.memory = MemoryProfiler()
+        game.run()
+        return
+
+    vision = ScriptedVision(args.script, args.interval, player_rng(args.seed))
+    game = MagicGame(headless=True, vision=vision, seed=args.seed, record=args.record)
+    game.selected_char_idx = args.char % len(CD)
+    results = game.run_headless(args.matches, args.max_ticks)
+    stats = game.headless_stats
+    wins = {w: sum(r["winner"] == w for r in results) for w in ("Player", "Bot", None)}
+    print(f"Headless: {stats['matches']} matches, Player {wins['Player']} / Bot {wins['Bot']} / draw {wins[None]}")
+    print(f"Headless: {stats['ticks']} ticks in {stats['seconds']:.2f}s "
+          f"({stats['ticks_per_second']:.0f} ticks/s, avg {stats['ticks'] / max(1, stats['matches']):.0f} ticks/match)")
+    pygame.quit()
+
+def memcheck_main(args):
+    """--memcheck: back-to-back automated rematches with a scripted player, then the growth report."""
+    memory = MemoryProfiler()  # Before the game, so its allocations are traced too
+    vision = ScriptedVision(args.script, args.interval, player_rng(args.seed))
+    game = MagicGame(vision=vision, seed=args.seed)
+    game.memory = memory
+    start = time.perf_counter()
+    run_rematches(game, args.memcheck)
+    print(f"Memcheck: {args.memcheck} rematches in {time.perf_counter() - start:.1f}s")
+    flagged = memory.report()
+    pygame.quit()
+    sys.exit(1 if flagged else 0)
+
+def replay_main(args):
+    """--replay: real time in a window (fixed-timestep run loop), or --fast headless."""
+    replay = Replay.load(args.replay)
+    print(f"Replay: seed {replay.seed:08x}, character {replay.char}, {replay.last_tick} ticks, "
+          f"{len(replay.gestures)} gestures, {len(replay.keyframes)} keyframes, winner {replay.winner}")
+    game = MagicGame(headless=args.fast, vision=ReplayVision(replay.gestures), replay=replay)
+    start = time.perf_counter()
+    game.start_replay(args.seek)
+    print(f"Replay: at tick {game.world.tick} after {(time.perf_counter() - start) * 1000:.1f} ms")
+    if not args.fast:
+        game.run()
+        return
+    start = time.perf_counter()
+    ticks = game.play_headless_match(max(1, replay.last_tick - game.world.tick))
+    elapsed = time.perf_counter() - start
+    match = "matches" if game.world.winner == replay.winner else "DIFFERS from"
+    print(f"Replay: {ticks} ticks in {elapsed:.2f}s ({ticks / elapsed if elapsed else 0:.0f} ticks/s), "
+          f"winner {game.world.winner} at tick {game.world.tick} ({match} the recording)")
+    pygame.quit()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
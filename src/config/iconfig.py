@@ -5,6 +5,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 SRC_DIR = os.path.join(BASE_DIR, 'src')
 ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
 SOUND_DIR = os.path.join(ASSETS_DIR, 'sound')
+CACHE_DIR = os.path.join(BASE_DIR, '.cache')
 
 # Vision System Paths
 VISION_DIR = os.path.join(SRC_DIR, 'vision')
@@ -16,3 +17,6 @@ CHARACTER_CLASSIFIER_PATH = os.path.join(CV_DIR, 'character_classifier.pkl')
 MEAN_PATH = os.path.join(CV_DIR, 'mean.npy')
 STD_PATH = os.path.join(CV_DIR, 'std.npy')
 PCA_COMPONENTS_PATH = os.path.join(CV_DIR, 'pca_components.npy')
+
+# Baked sprite atlas (regenerated when pixel_sprites.py changes)
+SPRITE_ATLAS_DIR = os.path.join(CACHE_DIR, 'sprites')
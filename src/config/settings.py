@@ -8,6 +8,56 @@ FPS = 60
 # Pixel Art Scale
 PIXEL_SCALE = 3
 
+# Low-res render mode: draw the world at logical resolution (1 art pixel = 1 pixel)
+# and upscale once per frame; HUD text stays at native resolution
+LOWRES_RENDER = False
+LOGICAL_WIDTH = WIDTH // PIXEL_SCALE
+LOGICAL_HEIGHT = HEIGHT // PIXEL_SCALE
+
+# Dirty-rect rendering: present only changed regions with display.update(rects)
+# on mostly static screens (menus, rescue/lose animations, game over).
+# Falls back to a full flip when more than DIRTY_RECT_FULL_RATIO of the screen changed.
+DIRTY_RECT_RENDERING = False
+DIRTY_RECT_FULL_RATIO = 0.5
+
+# Camera: offscreen world margin (px) so shake never reveals an unpainted edge
+CAMERA_MARGIN = 24
+
+# Fixed-timestep simulation (MagicGame.run). Gameplay timers count ticks, so
+# SIM_HZ stays at 60; FPS only caps rendering. After a stall at most
+# MAX_CATCHUP_TICKS run in one frame and the rest of the backlog is dropped.
+# RENDER_INTERPOLATION draws entities between the last two ticks (one tick of latency).
+SIM_HZ = 60
+SIM_DT = 1.0 / SIM_HZ
+MAX_CATCHUP_TICKS = 5
+RENDER_INTERPOLATION = False
+
+# Frame profiler overlay (diagnostics/frame_profiler.py), toggled with F3:
+# percentiles over the last PROFILER_WINDOW frames, panel redrawn every PROFILER_REFRESH
+PROFILER_WINDOW = 120
+PROFILER_REFRESH = 15
+
+# Chrome trace export (diagnostics/trace.py), enabled with `--trace`; F4 writes the file.
+# Each thread keeps its last TRACE_BUFFER_EVENTS spans.
+TRACE_PATH = "trace.json"
+TRACE_BUFFER_EVENTS = 200_000
+
+# Memory diagnostics (diagnostics/memory.py, `--memcheck`): tracemalloc traceback depth
+# and how many Surface sizes / allocation sites the growth report lists
+MEMORY_TRACE_FRAMES = 8
+MEMORY_TOP_SITES = 10
+
+# Replays (core/replay.py): `--record` writes one file per match into REPLAY_DIR.
+# A World keyframe every REPLAY_KEYFRAME_INTERVAL ticks bounds the cost of a seek.
+REPLAY_DIR = "replays"
+REPLAY_KEYFRAME_INTERVAL = SIM_HZ * 10
+
+# Max cached rotate/scale/flip results (ui/transform_cache.py, LRU)
+TRANSFORM_CACHE_SIZE = 64
+
+# Glyph atlases kept per bitmap font, one per text color (ui/bitmap_font.py, LRU)
+FONT_ATLAS_COLORS = 16
+
 # ── Primary Color Theme (Blue / Red / Orange-Gold) ──
 BLUE_PRIMARY    = (25, 55, 120)
 BLUE_LIGHT      = (50, 90, 170)
@@ -38,6 +88,9 @@ HEALTH_BAR_WIDTH = 300
 HEALTH_BAR_HEIGHT = 16
 
 # Player & Bot settings
+ENTITY_WIDTH, ENTITY_HEIGHT = 48, 66  # Hitbox: a 16x22 sprite at PIXEL_SCALE
+PLAYER_ICE_PAD = 12  # Player's ice overlay is the hitbox grown by this many px
+OVERLAY_PAD = 10     # Shield overlays (and the bot's ice) likewise
 PLAYER_SPEED = 5
 JUMP_FORCE = -15
 GRAVITY = 0.8
@@ -48,3 +101,6 @@ SHAPE_TOLERANCE = 50
 
 # Console Debugging
 TURN_PREDICT_CONSOLE = False
+
+# Report blit sources left outside the display pixel format
+DEBUG_SURFACES = False
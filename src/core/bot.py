@@ -4,13 +4,34 @@ from config.settings import *
 from core.spells import Spell
 from ui.pixel_sprites import (
     create_bot_sprite, create_ice_overlay,
-    create_shield_overlay, create_tinted_variant,
-    create_white_flash
+    create_shield_overlay, create_sprite_variants, to_logical
 )
+from ui.sprite_atlas import get_sprite, get_variants
+
+# AI tuning knobs (sim/tournament.py sweeps and evolves these)
+DEFAULT_BOT_PARAMS = {
+    "dodge_radius": 200,       # px: player spells closer than this trigger a reaction
+    "block_chance": 0.3,       # reaction: shield ...
+    "jump_chance": 0.3,        # ... or jump; the rest of the roll dodges sideways
+    "attack_range": 350,       # px: max distance to stop and attack
+    "attack_chance": 0.08,     # per tick, in range and off cooldown
+    "attack_cooldown": 60,     # ticks after an attack
+    "freeze_preference": 0.6,  # chance to pick FREEZE while the player isn't frozen
+    "move_speed": 4,           # px/tick chasing (dodging is 1.5x)
+    "chase_distance": 180,     # px: stop chasing inside this distance
+}
+
 
 class Bot:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 48, 66)  # 16*3 x 22*3
+    def __init__(self, x, y, rng=None, sprites=True, params=None):
+        """
+        rng: gameplay random stream for AI decisions (core.world passes its seeded one).
+        sprites=False skips sprite loading (pure simulation).
+        params: overrides for DEFAULT_BOT_PARAMS.
+        """
+        self.rng = rng or random
+        self.params = {**DEFAULT_BOT_PARAMS, **(params or {})}
+        self.rect = pygame.Rect(x, y, ENTITY_WIDTH, ENTITY_HEIGHT)
         self.health = 100.0
         self.max_health = 100.0
         self.state = "IDLE"
@@ -30,33 +51,39 @@ class Bot:
         self.v_move_speed = 3
 
         # Pixel art sprites
-        self.base_sprite = create_bot_sprite()
+        self.base_sprite = None
         self.hurt_sprite = None
         self.freeze_sprite = None
         self.burn_sprite = None
         self.ice_overlay = None
         self.shield_overlay = None
-        self._build_variants()
+        if sprites:
+            self._build_variants(get_variants("dark_knight", create_bot_sprite, flip=True))
 
-    def set_bot_sprite(self, sprite_surface):
-        """Replace the bot sprite with a character-specific one and regenerate variants."""
+    def set_bot_sprite(self, sprite_surface, variants=None):
+        """
+        Replace the bot sprite with a character-specific one and regenerate variants.
+        variants: prebuilt (base, hurt, freeze, burn), already facing left.
+        """
         self.base_sprite = sprite_surface
-        self._build_variants()
+        self._build_variants(variants)
 
-    def _build_variants(self):
+    def _build_variants(self, variants=None):
         """Build hurt/freeze/burn variants from the current base_sprite."""
-        self.hurt_sprite = create_white_flash(self.base_sprite)
-        self.freeze_sprite = create_tinted_variant(self.base_sprite, (100, 200, 255), 100)
-        self.burn_sprite = create_tinted_variant(self.base_sprite, (255, 100, 0), 80)
-        self.ice_overlay = create_ice_overlay(self.rect.width + 10, self.rect.height + 10)
-        self.shield_overlay = create_shield_overlay(self.rect.width + 10, self.rect.height + 10)
-        # Flip bot sprite to face left
-        self.base_sprite = pygame.transform.flip(self.base_sprite, True, False)
-        if self.hurt_sprite: self.hurt_sprite = pygame.transform.flip(self.hurt_sprite, True, False)
-        if self.freeze_sprite: self.freeze_sprite = pygame.transform.flip(self.freeze_sprite, True, False)
-        if self.burn_sprite: self.burn_sprite = pygame.transform.flip(self.burn_sprite, True, False)
-
-    def update(self, player, particle_system=None, sounds=None):
+        if variants is None:
+            # Flip bot sprite to face left (variants are derived from the flipped copy)
+            variants = create_sprite_variants(self.base_sprite, flip=True)
+        (self.base_sprite, self.hurt_sprite,
+         self.freeze_sprite, self.burn_sprite) = variants
+        w, h = self.rect.width + OVERLAY_PAD, self.rect.height + OVERLAY_PAD
+        self.ice_overlay = get_sprite(f"overlay/ice/{w}x{h}", lambda: create_ice_overlay(w, h))
+        self.shield_overlay = get_sprite(f"overlay/shield/{w}x{h}", lambda: create_shield_overlay(w, h))
+
+    def update(self, player):
+        """One AI tick. Returns the Spell cast this tick, if any."""
+        rng = self.rng
+        p = self.params
+        cast = None
         player_rect = player.rect
         if self.action_cooldown > 0: self.action_cooldown -= 1
         if self.freeze_timer > 0: self.freeze_timer -= 1
@@ -66,27 +93,14 @@ class Bot:
         # Handle Burn
         if self.burn_timer > 0:
             self.burn_timer -= 1
-            if particle_system and random.random() < 0.3:
-                particle_system.emit(self.rect.centerx + random.uniform(-20, 20), 
-                                   self.rect.centery + random.uniform(-30, 30), 
-                                   (255, 100, 0), count=2, ptype="spark")
-            
             self.burn_damage_timer += 1
             if self.burn_damage_timer >= 120:
                 self.health = max(0.0, self.health - 5.0)
                 self.burn_damage_timer = 0
-                print(f"Bot took burn damage! Health: {self.health}")
-        
-        # Handle Ice particles when frozen
-        if self.freeze_timer > 0:
-            if particle_system and random.random() < 0.1:
-                particle_system.emit(self.rect.centerx + random.uniform(-25, 25), 
-                                   self.rect.centery + random.uniform(-40, 40), 
-                                   (150, 255, 255), count=1)
         
         # Update internal spells
         for s in self.spells[:]:
-            s.update(particle_system)
+            s.update()
             if not s.active:
                 self.spells.remove(s)
 
@@ -98,17 +112,17 @@ class Bot:
         # Reactive Dodge Logic: If player spell is coming close
         incoming_threat = False
         for s in player.spells:
-            if abs(s.rect.centerx - self.rect.centerx) < 200:
+            if abs(s.rect.centerx - self.rect.centerx) < p["dodge_radius"]:
                 incoming_threat = True
                 break
         
         if incoming_threat and self.action_cooldown == 0:
-            choice = random.random()
-            if choice < 0.3: # Block
+            choice = rng.random()
+            if choice < p["block_chance"]: # Block
                 self.block_timer = 120 # 2s
                 self.action_cooldown = 60
                 return
-            elif choice < 0.6: # Jump
+            elif choice < p["block_chance"] + p["jump_chance"]: # Jump
                 self.v_move_dir = -1
                 self.v_move_timer = 30
                 self.action_cooldown = 40
@@ -121,22 +135,22 @@ class Bot:
         
         # Chance tostand still to attack
         if self.action_cooldown == 0:
-            if abs(dist) < 350 and random.random() < 0.08:
+            if abs(dist) < p["attack_range"] and rng.random() < p["attack_chance"]:
                 self.state = "STAND_ATTACK"
                 # Smart spell selection
                 if player.freeze_timer <= 0:
-                    stype = "O" if random.random() < 0.6 else random.choice(["/", "\\"])
+                    stype = "O" if rng.random() < p["freeze_preference"] else rng.choice(["/", "\\"])
                 else:
-                    stype = random.choice(["/", "\\"])
+                    stype = rng.choice(["/", "\\"])
                 
-                self._cast_random_spell(particle_system, stype, sounds)
-                self.action_cooldown = 60 # Faster attacks
+                cast = self._cast_random_spell(stype)
+                self.action_cooldown = p["attack_cooldown"]
             else:
                 self.state = "CHASE"
  
         # Horizontal Movement logic
-        move_speed = 4
-        if self.state == "CHASE" and abs(dist) > 180:
+        move_speed = p["move_speed"]
+        if self.state == "CHASE" and abs(dist) > p["chase_distance"]:
             self.rect.x += move_speed if dist > 0 else -move_speed
         elif self.state == "DODGE":
             self.rect.x += -move_speed * 1.5 if dist > 0 else move_speed * 1.5
@@ -145,8 +159,8 @@ class Bot:
         # Vertical Movement logic
         if self.v_move_timer <= 0:
             # Pick a random direction (-1, 0, 1) and a random time (30 to 120 frames)
-            self.v_move_dir = random.choice([-1, 0, 1])
-            self.v_move_timer = random.randint(30, 90)
+            self.v_move_dir = rng.choice([-1, 0, 1])
+            self.v_move_timer = rng.randint(30, 90)
         else:
             self.v_move_timer -= 1
             self.rect.y += self.v_move_dir * self.v_move_speed
@@ -159,33 +173,34 @@ class Bot:
             elif self.rect.bottom > HEIGHT - margin:
                 self.rect.bottom = HEIGHT - margin
                 self.v_move_dir = 0
+        return cast
+
+    def emit_status_particles(self, particle_system):
+        """Cosmetic burn / ice particles (global random, not the gameplay RNG)."""
+        if self.burn_timer > 0 and random.random() < 0.3:
+            particle_system.emit(self.rect.centerx + random.uniform(-20, 20), 
+                               self.rect.centery + random.uniform(-30, 30), 
+                               (255, 100, 0), count=2, ptype="spark")
+        if self.freeze_timer > 0 and random.random() < 0.1:
+            particle_system.emit(self.rect.centerx + random.uniform(-25, 25), 
+                               self.rect.centery + random.uniform(-40, 40), 
+                               (150, 255, 255), count=1)
 
-    def _cast_random_spell(self, particle_system=None, stype=None, sounds=None):
-        if self.freeze_timer > 0: return # Extra safety
+    def _cast_random_spell(self, stype=None):
+        if self.freeze_timer > 0: return None # Extra safety
         # Choose from all types if not specified
         if stype is None:
-            stype = random.choice(["/", "\\", "O"])
+            stype = self.rng.choice(["/", "\\", "O"])
 
         direction = -1 if self.rect.centerx > WIDTH // 2 else 1
         new_spell = Spell(self.rect.left - 30 if direction < 0 else self.rect.right, self.rect.centery, direction, stype)
         self.spells.append(new_spell)
-        
-        # Play skill sound immediately on cast
-        if sounds:
-            if stype == "/" and sounds.get("gun"):
-                sounds["gun"].play(maxtime=800)
-            elif stype == "\\" and sounds.get("explosion"):
-                sounds["explosion"].play(maxtime=800)
-            elif stype == "O" and sounds.get("freeze"):
-                sounds["freeze"].play(maxtime=800)
-        
-        if particle_system:
-            particle_system.burst(new_spell.rect.centerx, new_spell.rect.centery, new_spell.color, count=8, ptype="circle")
+        return new_spell
 
-    def draw(self, surface, shake_offset=(0, 0)):
-        # Shake effect
-        draw_x = self.rect.x + shake_offset[0]
-        draw_y = self.rect.y + shake_offset[1]
+    def draw(self, surface, scale=1):
+        """Draw into the camera view; scale > 1 is the low-res framebuffer (coordinates and sprites divided by scale)."""
+        draw_x = self.rect.x
+        draw_y = self.rect.y
         
         if self.hurt_timer > 0:
             draw_x += random.randint(-4, 4)
@@ -205,15 +220,15 @@ class Bot:
             sprite = self.base_sprite
 
         if sprite:
-            surface.blit(sprite, (draw_x, draw_y))
+            surface.blit(to_logical(sprite, scale), (draw_x // scale, draw_y // scale))
 
         # Ice Overlay
         if self.freeze_timer > 0 and self.ice_overlay:
-            surface.blit(self.ice_overlay, (draw_x - 5, draw_y - 5))
+            surface.blit(to_logical(self.ice_overlay, scale), ((draw_x - 5) // scale, (draw_y - 5) // scale))
 
         # Shield effect
         if self.block_timer > 0 and self.shield_overlay:
-            surface.blit(self.shield_overlay, (draw_x - 5, draw_y - 5))
+            surface.blit(to_logical(self.shield_overlay, scale), ((draw_x - 5) // scale, (draw_y - 5) // scale))
 
         for s in self.spells:
-            s.draw(surface, shake_offset)
+            s.draw(surface, scale)
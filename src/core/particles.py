@@ -7,7 +7,7 @@ PIXEL_SCALE = 3
 
 class ParticleBase:
     def update(self) -> bool: return False
-    def draw(self, surface: pygame.Surface, shake_offset=(0, 0)): pass
+    def draw(self, surface: pygame.Surface, scale=1): pass
 
 class Particle(ParticleBase):
     """Pixel-style square particle."""
@@ -27,17 +27,18 @@ class Particle(ParticleBase):
         self.life -= self.decay
         return self.life > 0
 
-    def draw(self, surface, shake_offset=(0, 0)):
+    def draw(self, surface, scale=1):
         if self.life <= 0: return
         # Pixel square instead of circle
-        draw_x = int(self.x + shake_offset[0])
-        draw_y = int(self.y + shake_offset[1])
-        pygame.draw.rect(surface, self.color, (draw_x, draw_y, self.size, self.size))
+        draw_x = int(self.x) // scale
+        draw_y = int(self.y) // scale
+        size = max(1, self.size // scale)
+        pygame.draw.rect(surface, self.color, (draw_x, draw_y, size, size))
         # Inner bright pixel
         if self.size >= PIXEL_SCALE * 2:
+            inner = max(1, PIXEL_SCALE // scale)
             pygame.draw.rect(surface, (255, 255, 255),
-                           (draw_x + PIXEL_SCALE // 2, draw_y + PIXEL_SCALE // 2,
-                            PIXEL_SCALE, PIXEL_SCALE))
+                           (draw_x + inner // 2, draw_y + inner // 2, inner, inner))
 
 class Spark(ParticleBase):
     """Pixel-style spark trail."""
@@ -64,14 +65,15 @@ class Spark(ParticleBase):
         self.life -= self.decay
         return self.life > 0
 
-    def draw(self, surface, shake_offset=(0, 0)):
+    def draw(self, surface, scale=1):
         if self.life <= 0: return
+        size = max(1, PIXEL_SCALE // scale)
         # Draw trail as pixel squares
         for i, (tx, ty) in enumerate(self.trail):
             alpha_color = tuple(max(0, c - 80 + i * 30) for c in self.color)
-            pygame.draw.rect(surface, alpha_color, (tx + shake_offset[0], ty + shake_offset[1], PIXEL_SCALE, PIXEL_SCALE))
+            pygame.draw.rect(surface, alpha_color, (tx // scale, ty // scale, size, size))
         # Current position - bright pixel
-        pygame.draw.rect(surface, (255, 255, 255), (int(self.x + shake_offset[0]), int(self.y + shake_offset[1]), PIXEL_SCALE, PIXEL_SCALE))
+        pygame.draw.rect(surface, (255, 255, 255), (int(self.x) // scale, int(self.y) // scale, size, size))
 
 class ParticleSystem:
     def __init__(self):
@@ -98,8 +100,7 @@ class ParticleSystem:
         # especially if many particles are removed at once.
         self.particles = [p for p in self.particles if p.update()]
 
-    def draw(self, surface, shake_offset=(0, 0)):
-        # Cache int conversion outside the loop if shake_offset is stable
-        sx, sy = int(shake_offset[0]), int(shake_offset[1])
+    def draw(self, surface, scale=1):
+        # Surface is the camera view: no per-particle shake offset
         for p in self.particles:
-            p.draw(surface, (sx, sy))
+            p.draw(surface, scale)
@@ -4,13 +4,14 @@ from config.settings import *
 from core.spells import Spell
 from ui.pixel_sprites import (
     create_player_sprite, create_ice_overlay,
-    create_shield_overlay, create_tinted_variant,
-    create_white_flash
+    create_shield_overlay, create_sprite_variants, to_logical
 )
+from ui.sprite_atlas import get_sprite, get_variants
 
 class Player:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 48, 66)  # 16*3 x 22*3
+    def __init__(self, x, y, sprites=True):
+        """sprites=False skips sprite loading (pure simulation, e.g. core.world)."""
+        self.rect = pygame.Rect(x, y, ENTITY_WIDTH, ENTITY_HEIGHT)
         self.vel_y = 0
         self.health = 100.0
         self.max_health = 100.0
@@ -26,21 +27,28 @@ class Player:
         self.hurt_timer = 0
 
         # Pixel art sprites
-        self.base_sprite = create_player_sprite()
-        self._build_variants()
-
-    def set_character_sprite(self, sprite_surface):
-        """Replace the player sprite with a character-specific one and regenerate variants."""
+        self.base_sprite = None
+        if sprites:
+            self._build_variants(get_variants("wizard", create_player_sprite))
+
+    def set_character_sprite(self, sprite_surface, variants=None):
+        """
+        Replace the player sprite with a character-specific one and regenerate variants.
+        variants: prebuilt (base, hurt, freeze, burn), e.g. from the sprite atlas.
+        """
         self.base_sprite = sprite_surface
-        self._build_variants()
+        self._build_variants(variants)
 
-    def _build_variants(self):
+    def _build_variants(self, variants=None):
         """Build hurt/freeze/burn variants from the current base_sprite."""
-        self.hurt_sprite = create_white_flash(self.base_sprite)
-        self.freeze_sprite = create_tinted_variant(self.base_sprite, (100, 200, 255), 100)
-        self.burn_sprite = create_tinted_variant(self.base_sprite, (255, 100, 0), 80)
-        self.ice_overlay = create_ice_overlay(self.rect.width + 12, self.rect.height + 12)
-        self.shield_overlay = create_shield_overlay(self.rect.width + 10, self.rect.height + 10)
+        if variants is None:
+            variants = create_sprite_variants(self.base_sprite)
+        (self.base_sprite, self.hurt_sprite,
+         self.freeze_sprite, self.burn_sprite) = variants
+        iw, ih = self.rect.width + PLAYER_ICE_PAD, self.rect.height + PLAYER_ICE_PAD
+        sw, sh = self.rect.width + OVERLAY_PAD, self.rect.height + OVERLAY_PAD
+        self.ice_overlay = get_sprite(f"overlay/ice/{iw}x{ih}", lambda: create_ice_overlay(iw, ih))
+        self.shield_overlay = get_sprite(f"overlay/shield/{sw}x{sh}", lambda: create_shield_overlay(sw, sh))
 
     def move(self, dx):
         if self.freeze_timer > 0: return
@@ -54,7 +62,7 @@ class Player:
         if self.on_ground:
             self.vel_y = -15
 
-    def update(self, particle_system=None):
+    def update(self):
         # Cooldowns and Timers
         if self.cooldown > 0: self.cooldown -= 1
         if self.freeze_timer > 0: self.freeze_timer -= 1
@@ -64,24 +72,11 @@ class Player:
         # Handle Burn (Damage every 2s for 4s)
         if self.burn_timer > 0:
             self.burn_timer -= 1
-            if particle_system and random.random() < 0.2:
-                particle_system.emit(self.rect.centerx + random.uniform(-15, 15), 
-                                   self.rect.centery + random.uniform(-25, 25), 
-                                   (255, 60, 0), count=2, ptype="spark")
-            
             self.burn_damage_timer += 1
             if self.burn_damage_timer >= 120:
                 self.health = max(0.0, self.health - 5.0)
                 self.burn_damage_timer = 0
-                print(f"Player took burn damage! Health: {self.health}")
         
-        # Handle Ice particles
-        if self.freeze_timer > 0:
-            if particle_system and random.random() < 0.1:
-                particle_system.emit(self.rect.centerx + random.uniform(-20, 20), 
-                                   self.rect.centery + random.uniform(-30, 30), 
-                                   (150, 255, 255), count=1)
-
         # Movement (Disabled if frozen)
         if self.freeze_timer <= 0:
             self.vel_y += GRAVITY
@@ -100,14 +95,25 @@ class Player:
         
         # Update internal spells
         for s in self.spells[:]:
-            s.update(particle_system)
+            s.update()
             if not s.active:
                 self.spells.remove(s)
 
-    def draw(self, surface, shake_offset=(0, 0)):
-        # Shake effect
-        draw_x = self.rect.x + shake_offset[0]
-        draw_y = self.rect.y + shake_offset[1]
+    def emit_status_particles(self, particle_system):
+        """Cosmetic burn / ice particles (global random, not the gameplay RNG)."""
+        if self.burn_timer > 0 and random.random() < 0.2:
+            particle_system.emit(self.rect.centerx + random.uniform(-15, 15), 
+                               self.rect.centery + random.uniform(-25, 25), 
+                               (255, 60, 0), count=2, ptype="spark")
+        if self.freeze_timer > 0 and random.random() < 0.1:
+            particle_system.emit(self.rect.centerx + random.uniform(-20, 20), 
+                               self.rect.centery + random.uniform(-30, 30), 
+                               (150, 255, 255), count=1)
+
+    def draw(self, surface, scale=1):
+        """Draw into the camera view; scale > 1 is the low-res framebuffer (coordinates and sprites divided by scale)."""
+        draw_x = self.rect.x
+        draw_y = self.rect.y
         
         if self.hurt_timer > 0:
             draw_x += random.randint(-4, 4)
@@ -126,40 +132,30 @@ class Player:
         else:
             sprite = self.base_sprite
 
-        surface.blit(sprite, (draw_x, draw_y))
+        surface.blit(to_logical(sprite, scale), (draw_x // scale, draw_y // scale))
 
         # Ice Overlay
         if self.freeze_timer > 0:
-            surface.blit(self.ice_overlay, (draw_x - 6, draw_y - 6))
+            surface.blit(to_logical(self.ice_overlay, scale), ((draw_x - 6) // scale, (draw_y - 6) // scale))
 
         # Shield effect
         if self.block_timer > 0:
-            surface.blit(self.shield_overlay, (draw_x - 5, draw_y - 5))
+            surface.blit(to_logical(self.shield_overlay, scale), ((draw_x - 5) // scale, (draw_y - 5) // scale))
 
         for s in self.spells:
-            s.draw(surface, shake_offset)
+            s.draw(surface, scale)
 
-    def cast_spell(self, gesture, particle_system=None, sounds=None):
-        if self.cooldown > 0 or self.freeze_timer > 0: return
+    def cast_spell(self, gesture):
+        """Returns the new Spell, or None (cooldown, frozen or shield)."""
+        if self.cooldown > 0 or self.freeze_timer > 0: return None
         
         # Block is a special "spell" (Skill 4)
         if gesture == "|":
             self.block_timer = 120 # 2s
             self.cooldown = 60
-            return
+            return None
 
         new_spell = Spell(self.rect.right, self.rect.centery, 1, gesture)
         self.spells.append(new_spell)
         self.cooldown = 40
-        
-        # Play skill sound immediately on cast
-        if sounds:
-            if gesture == "/" and sounds.get("gun"):
-                sounds["gun"].play(maxtime=800)
-            elif gesture == "\\" and sounds.get("explosion"):
-                sounds["explosion"].play(maxtime=800)
-            elif gesture == "O" and sounds.get("freeze"):
-                sounds["freeze"].play(maxtime=800)
-        
-        if particle_system:
-            particle_system.burst(self.rect.right, self.rect.centery, new_spell.color, count=10, ptype="circle")
+        return new_spell
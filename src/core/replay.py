@@ -0,0 +1,191 @@
+"""
+Match replays.
+A World is deterministic, so a match is fully described by its seed, the
+character / bot setup and the inputs fed to step() on each tick. The file
+stores just that, plus periodic World keyframes so a reader can jump to
+any tick by restoring the nearest keyframe and simulating at most
+REPLAY_KEYFRAME_INTERVAL ticks.
+
+File layout (little endian):
+    header   b"MGRP" | version u8 | seed u32 | meta length u16 | meta (JSON:
+             sim_hz, char and World kwargs such as bot_params)
+    records  varint tick delta | kind u8 | payload
+                 GESTURE   u8 index into GESTURES
+                 KEY       varint pygame key code
+                 KEYFRAME  u32 checksum | varint length | zlib(pickle(World.snapshot()));
+                           the RNG state inside is packed as raw u32s
+                 END       u8 winner (0 none, 1 Player, 2 Bot)
+Records are appended as the match runs, so a crashed session still leaves
+a readable file up to its last flush.
+"""
+import bisect
+import json
+import pickle
+import struct
+import zlib
+
+from config.settings import SIM_HZ, REPLAY_KEYFRAME_INTERVAL
+from core.world import World
+
+MAGIC = b"MGRP"
+VERSION = 1
+GESTURES = "/\\O|"
+WINNERS = [None, "Player", "Bot"]
+GESTURE, KEY, KEYFRAME, END = range(4)
+
+
+def _varint(n):
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _read_varint(data, pos):
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return n, pos
+        shift += 7
+
+
+class ReplayWriter:
+    def __init__(self, path, world, char=0, world_kwargs=None, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        """
+        world: the freshly created World to record (its tick-0 state is the first keyframe).
+        world_kwargs: extra World() arguments (bot_params, rival_params) to replay with.
+        """
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self._file = open(path, "wb")
+        self._last_tick = 0
+        meta = json.dumps({"sim_hz": SIM_HZ, "char": char, "world": world_kwargs or {}}).encode()
+        self._file.write(MAGIC + struct.pack("<BIH", VERSION, world.seed, len(meta)) + meta)
+        self.keyframe(world)
+
+    def _record(self, tick, kind, payload=b""):
+        self._file.write(_varint(tick - self._last_tick) + bytes((kind,)) + payload)
+        self._last_tick = tick
+
+    def gesture(self, tick, gesture):
+        """Gesture fed to World.step on tick `tick` (world.tick after the step)."""
+        if gesture and gesture in GESTURES:
+            self._record(tick, GESTURE, bytes((GESTURES.index(gesture),)))
+
+    def key(self, tick, key):
+        self._record(tick, KEY, _varint(key))
+
+    def after_step(self, world):
+        """Call after every World.step: writes keyframes and closes the file when the match ends."""
+        if world.over:
+            self.close(world)
+        elif world.tick % self.keyframe_interval == 0:
+            self.keyframe(world)
+
+    def keyframe(self, world):
+        state = world.snapshot()
+        # Mersenne Twister state as raw u32s: a third smaller than pickled ints
+        version, internal, gauss = state["rng"]
+        state["rng"] = (version, struct.pack(f"<{len(internal)}I", *internal), gauss)
+        blob = zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL))
+        self._record(world.tick, KEYFRAME, struct.pack("<I", world.checksum()) + _varint(len(blob)) + blob)
+
+    def close(self, world=None):
+        if self._file is None:
+            return
+        if world is not None:
+            self._record(world.tick, END, bytes((WINNERS.index(world.winner),)))
+        self._file.close()
+        self._file = None
+
+
+class Replay:
+    """A parsed replay file: header, per-tick inputs and keyframes."""
+    def __init__(self, data):
+        if data[:4] != MAGIC:
+            raise ValueError("Not a replay file")
+        version, self.seed, meta_len = struct.unpack_from("<BIH", data, 4)
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+        pos = 4 + struct.calcsize("<BIH")
+        meta = json.loads(data[pos:pos + meta_len])
+        pos += meta_len
+        self.sim_hz = meta["sim_hz"]
+        self.char = meta["char"]
+        self.world_kwargs = meta["world"]
+
+        self.gestures = {}   # tick -> gesture
+        self.keys = {}       # tick -> [key codes]
+        self.keyframes = []  # (tick, checksum, compressed snapshot), ascending
+        self.end_tick = None
+        self.winner = None
+        tick = 0
+        while pos < len(data):
+            delta, pos = _read_varint(data, pos)
+            tick += delta
+            kind = data[pos]
+            pos += 1
+            if kind == GESTURE:
+                self.gestures[tick] = GESTURES[data[pos]]
+                pos += 1
+            elif kind == KEY:
+                key, pos = _read_varint(data, pos)
+                self.keys.setdefault(tick, []).append(key)
+            elif kind == KEYFRAME:
+                (checksum,) = struct.unpack_from("<I", data, pos)
+                length, pos = _read_varint(data, pos + 4)
+                self.keyframes.append((tick, checksum, data[pos:pos + length]))
+                pos += length
+            elif kind == END:
+                self.end_tick, self.winner = tick, WINNERS[data[pos]]
+                pos += 1
+            else:
+                raise ValueError(f"Corrupt replay: unknown record {kind} at byte {pos - 1}")
+        self._keyframe_ticks = [t for t, _, _ in self.keyframes]
+        self._checksums = {t: c for t, c, _ in self.keyframes}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    @property
+    def last_tick(self):
+        if self.end_tick is not None:
+            return self.end_tick
+        return max([0, *self.gestures, *self.keys, *self._keyframe_ticks])
+
+    def new_world(self, sprites=False):
+        return World(self.seed, sprites=sprites, **self.world_kwargs)
+
+    def inputs(self, tick):
+        """step() inputs for tick `tick`."""
+        return {"gesture": self.gestures.get(tick)}
+
+    def seek(self, world, tick):
+        """Move a World of this replay to `tick` (either direction): nearest keyframe, then simulate."""
+        i = bisect.bisect_right(self._keyframe_ticks, tick) - 1
+        if i >= 0 and (self._keyframe_ticks[i] > world.tick or world.tick > tick):
+            world.restore(self.keyframe_state(i))
+        while world.tick < tick and not world.over:
+            world.step(self.inputs(world.tick + 1))
+        return world
+
+    def keyframe_state(self, i):
+        state = pickle.loads(zlib.decompress(self.keyframes[i][2]))
+        version, internal, gauss = state["rng"]
+        state["rng"] = (version, struct.unpack(f"<{len(internal) // 4}I", internal), gauss)
+        return state
+
+    def verify(self, world):
+        """False if world's state disagrees with a keyframe recorded at the same tick (desync)."""
+        expected = self._checksums.get(world.tick)
+        return expected is None or expected == world.checksum()
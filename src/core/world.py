@@ -0,0 +1,196 @@
+"""
+Deterministic match simulation.
+World owns one match: the player, the bot, their spells and a gameplay
+RNG seeded per match. step(inputs) advances exactly one tick, so the same
+seed and the same inputs always replay the same match.
+
+Nothing here draws, plays sounds or needs a display. Presentation hooks
+in through events: step() returns the tick's events and also passes each
+one to subscribed callbacks. Cosmetic randomness (particles, sprite
+jitter) stays on the global `random` module, so rendering can never
+shift the gameplay stream.
+
+Events are dicts with a "type":
+    gesture    gesture, accepted         (player input; False when on cooldown / frozen)
+    cast       who ("player" / "bot"), spell
+    blocked    target, spell             (shield absorbed the spell)
+    hit        target, spell, damage
+    match_end  winner ("Player" / "Bot")
+"""
+import random
+import zlib
+
+from config.settings import WIDTH, HEIGHT
+from core.player import Player
+from core.bot import Bot
+from core.spells import Spell
+
+_PLAIN = (int, float, str, bool, type(None))
+_PRESENTATION_SUFFIXES = ("sprite", "_overlay")  # None in a pure World, surfaces in the game
+
+# Spell data configuration for easy balancing
+SPELL_CONFIG = {
+    "/":  {"name": "GUN",    "damage": (15, 20), "status": None,    "duration": 0},
+    "\\": {"name": "BOMB",   "damage": (12, 16), "status": "burn",  "duration": 240},
+    "O":  {"name": "FREEZE", "damage": (1, 4),   "status": "freeze", "duration": 240},
+    "|":  {"name": "SHIELD", "damage": (0, 0),   "status": None,    "duration": 0}
+}
+
+
+class World:
+    def __init__(self, seed=0, sprites=False, bot_params=None, rival_params=None):
+        """
+        sprites=True also loads the default entity sprites (renderers set their own).
+        bot_params: Bot AI overrides. rival_params: not None puts a second Bot with
+        these overrides in the player slot (bot-vs-bot; step() inputs are ignored).
+        """
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.winner = None  # "Player" / "Bot" once the match is over
+        self.rival = rival_params is not None
+        if self.rival:
+            self.player = Bot(WIDTH // 4, HEIGHT // 2, rng=self.rng, sprites=sprites, params=rival_params)
+        else:
+            self.player = Player(WIDTH // 4, HEIGHT // 2, sprites=sprites)
+        self.bot = Bot(WIDTH * 3 // 4, HEIGHT // 2, rng=self.rng, sprites=sprites, params=bot_params)
+        self._listeners = []
+        self.profiler = None  # Optional: lap(phase) is called after each part of step()
+
+    def subscribe(self, callback):
+        """callback(event) is called for every event step() produces."""
+        self._listeners.append(callback)
+
+    @property
+    def over(self):
+        return self.winner is not None
+
+    def step(self, inputs=None):
+        """
+        Advance one tick and return its events.
+        inputs: {"gesture": "/" | "\\" | "O" | "|" | None} for the player.
+        """
+        events = []
+        if self.over:
+            return events
+        self.tick += 1
+
+        if self.rival:
+            spell = self.player.update(self.bot)
+            if spell is not None:
+                events.append({"type": "cast", "who": "player", "spell": spell})
+            self.player.rect.x = max(0, min(WIDTH // 2 - self.player.rect.width, self.player.rect.x))
+        else:
+            gesture = inputs.get("gesture") if inputs else None
+            if gesture:
+                cooldown = self.player.cooldown
+                spell = self.player.cast_spell(gesture)
+                # Every accepted gesture (spell or shield) restarts the cooldown
+                events.append({"type": "gesture", "gesture": gesture, "accepted": self.player.cooldown > cooldown})
+                if spell is not None:
+                    events.append({"type": "cast", "who": "player", "spell": spell})
+            self.player.update()
+
+        spell = self.bot.update(self.player)
+        if spell is not None:
+            events.append({"type": "cast", "who": "bot", "spell": spell})
+        self.bot.rect.x = max(WIDTH // 2, min(WIDTH - 50, self.bot.rect.x))
+        if self.profiler: self.profiler.lap("sim: entities")
+
+        self._resolve_hits(self.player.spells, self.bot, events)
+        self._resolve_hits(self.bot.spells, self.player, events)
+        self._check_winner(events)
+        if self.profiler: self.profiler.lap("sim: collisions")
+
+        for event in events:
+            for callback in self._listeners:
+                callback(event)
+        return events
+
+    def _resolve_hits(self, spells, target, events):
+        for s in spells:
+            if not (s.active and s.rect.colliderect(target.rect)):
+                continue
+            s.active = False
+
+            # Shield block logic
+            if target.block_timer > 0 and s.type in ["/", "\\", "O"]:
+                events.append({"type": "blocked", "target": target, "spell": s})
+                continue
+
+            # Apply data-driven effects
+            config = SPELL_CONFIG.get(s.type)
+            if config is None:
+                continue
+            d_min, d_max = config["damage"]
+            damage = float(self.rng.uniform(float(d_min), float(d_max)))
+
+            status = config["status"]
+            duration = config["duration"]
+            if status == "burn": target.burn_timer = int(duration)
+            elif status == "freeze": target.freeze_timer = int(duration)
+
+            target.hurt_timer = 10
+            target.health = max(0.0, target.health - damage)
+            events.append({"type": "hit", "target": target, "spell": s, "damage": damage})
+
+    def _check_winner(self, events):
+        if self.player.health <= 0:
+            self.winner = "Bot"
+            self.clear_effects(self.player)
+        elif self.bot.health <= 0:
+            self.winner = "Player"
+            self.clear_effects(self.bot)
+        else:
+            return
+        events.append({"type": "match_end", "winner": self.winner})
+
+    @staticmethod
+    def clear_effects(entity):
+        entity.burn_timer = entity.freeze_timer = entity.block_timer = entity.hurt_timer = 0
+        entity.spells.clear()
+
+    # ── state snapshots (replay keyframes, determinism checks) ──
+    def snapshot(self):
+        """Plain-data copy of the gameplay state (picklable, no surfaces)."""
+        return {"tick": self.tick, "winner": self.winner, "rng": self.rng.getstate(),
+                "player": _entity_state(self.player), "bot": _entity_state(self.bot)}
+
+    def restore(self, state):
+        """Load a snapshot() in place; entity objects (and their sprites) are kept."""
+        self.tick = state["tick"]
+        self.winner = state["winner"]
+        self.rng.setstate(state["rng"])
+        _restore_entity(self.player, state["player"])
+        _restore_entity(self.bot, state["bot"])
+
+    def checksum(self):
+        """Stable CRC of the gameplay state (same value across processes and runs)."""
+        return zlib.crc32(repr(self.snapshot()).encode())
+
+
+def _plain_vars(obj):
+    return {k: v for k, v in vars(obj).items()
+            if isinstance(v, _PLAIN) and not k.endswith(_PRESENTATION_SUFFIXES)}
+
+
+def _entity_state(e):
+    state = _plain_vars(e)
+    state["rect"] = tuple(e.rect)
+    state["spells"] = [{**_plain_vars(s), "rect": tuple(s.rect)} for s in e.spells]
+    return state
+
+
+def _restore_entity(e, state):
+    for key, value in state.items():
+        if key not in ("rect", "spells"):
+            setattr(e, key, value)
+    e.rect.update(state["rect"])
+    e.spells = []
+    for spell_state in state["spells"]:
+        s = Spell(0, 0, spell_state["direction"], spell_state["type"])
+        for key, value in spell_state.items():
+            if key != "rect":
+                setattr(s, key, value)
+        s.rect.update(spell_state["rect"])
+        e.spells.append(s)
@@ -0,0 +1,144 @@
+"""
+In-game frame profiler.
+The game loop calls lap(name) after each phase; the time since the
+previous lap is charged to that phase (phases run several times a frame,
+e.g. one simulation tick per lap, add up). end_frame() pushes the frame's
+totals into a rolling window, and the overlay shows p50 / p95 / max per
+phase as bars against the frame budget, plus entity counts.
+While disabled every call returns immediately, so the hooks can stay in
+the loop.
+"""
+import time
+from collections import deque
+
+import pygame
+
+from config.settings import FPS, PROFILER_WINDOW, PROFILER_REFRESH, TEXT_COLOR, ACCENT_COLOR, RED_LIGHT
+from ui.pixel_sprites import get_pixel_font
+
+# Display order; phases not listed here are shown after these
+PHASES = (
+    "events", "vision", "sim: entities", "sim: collisions", "particles update", "update other",
+    "background", "vision feedback", "world", "entities", "particles draw", "present",
+    "hud", "profiler", "flip", "sleep",
+)
+BUDGET_MS = 1000.0 / FPS
+BAR_FULL_MS = BUDGET_MS / 4  # A phase using a quarter of the frame fills its bar
+BAR_W = 90
+PAD = 6
+
+
+class FrameProfiler:
+    def __init__(self, window=PROFILER_WINDOW, refresh=PROFILER_REFRESH):
+        self.enabled = False
+        self.window = window
+        self.refresh = refresh
+        self.history = {}  # phase -> deque of per-frame ms
+        self.frames = deque(maxlen=window)  # whole-frame ms
+        self.counts = {}
+        self._frame = {}
+        self._frame_start = 0.0
+        self._last = 0.0
+        self._frames_since_panel = 0
+        self._panel = None
+        self.font = get_pixel_font(1)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.history.clear()
+        self.frames.clear()
+        self._panel = None
+        self._last = self._frame_start = time.perf_counter()
+
+    def start_frame(self):
+        if not self.enabled:
+            return
+        self._frame = {}
+        self._last = self._frame_start = time.perf_counter()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap to phase."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._frame[phase] = self._frame.get(phase, 0.0) + (now - self._last) * 1000.0
+        self._last = now
+
+    def end_frame(self, **counts):
+        """Close the frame; counts (particles=..., spells=...) are shown on the overlay."""
+        if not self.enabled:
+            return
+        for phase in self._frame:
+            if phase not in self.history:
+                self.history[phase] = deque([0.0] * len(self.frames), maxlen=self.window)
+        for phase, samples in self.history.items():
+            samples.append(self._frame.get(phase, 0.0))
+        self.frames.append((self._last - self._frame_start) * 1000.0)
+        self.counts = counts
+        self._frames_since_panel += 1
+
+    # ── statistics ──
+    @staticmethod
+    def percentiles(samples):
+        """(p50, p95, max) in ms."""
+        ordered = sorted(samples)
+        if not ordered:
+            return 0.0, 0.0, 0.0
+        last = len(ordered) - 1
+        return ordered[last // 2], ordered[round(last * 0.95)], ordered[last]
+
+    def stats(self):
+        """{phase: (p50, p95, max)} in display order, plus "frame"."""
+        order = [p for p in PHASES if p in self.history] + [p for p in self.history if p not in PHASES]
+        result = {p: self.percentiles(self.history[p]) for p in order}
+        result["frame"] = self.percentiles(self.frames)
+        return result
+
+    # ── overlay ──
+    def draw(self, surface, pos=(PAD, 70)):
+        """Blit the overlay; the panel is re-rendered every `refresh` frames."""
+        if not self.enabled or not self.frames:
+            return
+        if self._panel is None or self._frames_since_panel >= self.refresh:
+            self._panel = self._render_panel()
+            self._frames_since_panel = 0
+        surface.blit(self._panel, pos)
+
+    def panel_rect(self, pos=(PAD, 70)):
+        """Screen area the overlay covers (for dirty-rect rendering)."""
+        if not self.enabled or self._panel is None:
+            return None
+        return self._panel.get_rect(topleft=pos)
+
+    def _render_panel(self):
+        font = self.font
+        stats = self.stats()
+        line_h = font.get_linesize()
+        text_w = font.size("sim: collisions  99.99 99.99 999.9")[0]
+        width = PAD * 3 + text_w + BAR_W
+        count_line = "  ".join(f"{k} {v}" for k, v in self.counts.items())
+        height = PAD * 2 + line_h * (len(stats) + 3)
+
+        panel = pygame.Surface((width, height))
+        panel.fill((0, 0, 0))
+        panel.set_alpha(210)
+
+        p50, _, _ = stats["frame"]
+        fps = 1000.0 / p50 if p50 else 0.0
+        y = PAD
+        font.draw(panel, f"FRAME PROFILER  {fps:.0f} fps  budget {BUDGET_MS:.1f} ms", (PAD, y), ACCENT_COLOR)
+        y += line_h
+        font.draw(panel, f"{'phase':<16} {'p50':>5} {'p95':>5} {'max':>5}", (PAD, y), ACCENT_COLOR)
+        y += line_h
+        bar_x = PAD * 2 + text_w
+        for phase, (p50, p95, peak) in stats.items():
+            color = ACCENT_COLOR if phase == "frame" else TEXT_COLOR
+            font.draw(panel, f"{phase[:16]:<16} {p50:5.2f} {p95:5.2f} {peak:5.1f}", (PAD, y), color)
+            full = BUDGET_MS if phase == "frame" else BAR_FULL_MS
+            bar_h = max(1, font.get_height() - 2)
+            for value, shade in ((peak, (70, 40, 40)), (p95, (130, 110, 60)), (p50, (90, 200, 120))):
+                w = min(BAR_W, max(1, round(value / full * BAR_W)))
+                pygame.draw.rect(panel, RED_LIGHT if value > full else shade, (bar_x, y + 1, w, bar_h))
+            y += line_h
+        font.draw(panel, count_line, (PAD, y), TEXT_COLOR)
+        return panel
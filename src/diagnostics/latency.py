@@ -0,0 +1,77 @@
+"""
+Gesture-to-spell latency.
+VisionSystem stamps every recognised gesture with the capture time of the
+frame whose pinch triggered it (vision.manager.GestureEvent); the game
+adds when the World applied it and when the first frame showing it was
+flipped. LatencyTracker turns those stamps into per-stage distributions,
+from the camera frame all the way to pixels.
+"""
+import time
+
+# (name, from stamp, to stamp)
+SEGMENTS = (
+    ("detect", "captured", "detected"),           # camera frame -> hand landmarks
+    ("recognise", "detected", "recognised"),      # pinch handling + predict_action
+    ("queue", "recognised", "taken"),             # waiting for the game to poll get_gesture
+    ("apply", "taken", "applied"),                # World.step
+    ("present", "applied", "shown"),              # rest of the frame, up to the flip
+    ("pinch to cast", "captured", "applied"),
+    ("pinch to pixels", "captured", "shown"),
+)
+
+
+def percentile(ordered, q):
+    """q-th percentile (0-100) of an ascending list, nearest rank."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, round((len(ordered) - 1) * q / 100))]
+
+
+class LatencyTracker:
+    def __init__(self):
+        self.samples = {name: [] for name, _, _ in SEGMENTS}  # name -> [ms]
+        self.rejected = 0  # Gestures the World ignored (cooldown / frozen)
+        self._pending = []  # (event, applied) waiting for the next flip
+
+    def applied(self, event, accepted):
+        """Call right after the World step that consumed event's gesture."""
+        if not accepted:
+            self.rejected += 1
+            return
+        self._pending.append((event, time.perf_counter()))
+
+    def frame_shown(self):
+        """Call right after the display flip."""
+        if not self._pending:
+            return
+        shown = time.perf_counter()
+        for event, applied in self._pending:
+            stamps = {"captured": event.captured, "detected": event.detected, "recognised": event.recognised,
+                      "taken": event.taken, "applied": applied, "shown": shown}
+            for name, start, end in SEGMENTS:
+                if stamps[start] is not None and stamps[end] is not None:
+                    self.samples[name].append((stamps[end] - stamps[start]) * 1000.0)
+        self._pending.clear()
+
+    def summary(self):
+        """{segment: {n, mean, p50, p95, p99, max}} in ms."""
+        result = {}
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            result[name] = {
+                "n": len(ordered),
+                "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+                "p50": percentile(ordered, 50),
+                "p95": percentile(ordered, 95),
+                "p99": percentile(ordered, 99),
+                "max": ordered[-1] if ordered else 0.0,
+            }
+        return result
+
+    def report(self):
+        print(f"{'Latency (ms)':<16} {'n':>4} {'mean':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}")
+        for name, s in self.summary().items():
+            print(f"{name:<16} {s['n']:>4} {s['mean']:>7.1f} {s['p50']:>7.1f} {s['p95']:>7.1f} "
+                  f"{s['p99']:>7.1f} {s['max']:>7.1f}")
+        if self.rejected:
+            print(f"{self.rejected} gestures rejected by the game (cooldown / frozen)")
@@ -0,0 +1,160 @@
+"""
+Memory diagnostics across rematches.
+MemoryProfiler starts tracemalloc and, whenever the game changes state
+(START, CHAR_SELECT, PLAYING, RESCUE / LOST, GAME_OVER), records a
+snapshot plus a census of live pygame Surfaces by size. After several
+rematches report() compares each state's first and last visits: values
+that only ever grow are flagged, along with the Surface sizes that
+accumulated and the allocation sites that grew the most.
+
+run_rematches() drives a game through that cycle on its own (keys posted
+to the event queue, matches ended after a fixed number of ticks) so a
+kiosk's days of back-to-back rematches can be condensed into minutes.
+
+pygame Surfaces are not tracked by the garbage collector, so the census
+finds them through the containers (lists, dicts, object attributes)
+that reference them.
+"""
+import gc
+import tracemalloc
+from collections import Counter
+
+import pygame
+
+from config.settings import MEMORY_TRACE_FRAMES, MEMORY_TOP_SITES
+
+MB = 1024 * 1024
+
+# Captured at import so the census keeps matching every Surface even if a
+# debug tool later swaps pygame.Surface for a subclass
+_Surface = pygame.Surface
+
+
+def surface_census():
+    """Counter of live Surfaces by (width, height, bits) and their total pixel bytes."""
+    seen = {}
+    for obj in gc.get_objects():
+        for ref in gc.get_referents(obj):
+            if isinstance(ref, _Surface):
+                seen[id(ref)] = ref
+    sizes = Counter()
+    total = 0
+    for surf in seen.values():
+        w, h = surf.get_size()
+        sizes[(w, h, surf.get_bitsize())] += 1
+        total += w * h * surf.get_bytesize()
+    return sizes, total
+
+
+class MemoryProfiler:
+    def __init__(self, warmup=2, frames=MEMORY_TRACE_FRAMES):
+        """
+        warmup: cycles left out of the comparison, while caches fill up on
+        first use (two, so both a win and a loss have been seen).
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.warmup = warmup
+        self.state = None
+        self.cycle = 0  # Incremented every time a match starts
+        self.records = []  # {cycle, state, traced, surfaces, surface_bytes, sizes, snapshot}
+
+    def observe(self, state):
+        """Call once per update with the current state; records on transitions."""
+        if state == self.state:
+            return
+        self.state = state
+        if state == "PLAYING":
+            self.cycle += 1
+        gc.collect()
+        sizes, surface_bytes = surface_census()
+        # Leave out the profiler's own records and the snapshots it keeps
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__),
+             tracemalloc.Filter(False, "<frozen *>")))
+        traced = sum(stat.size for stat in snapshot.statistics("filename"))
+        self.records.append({
+            "cycle": self.cycle, "state": state, "traced": traced, "surfaces": sum(sizes.values()),
+            "surface_bytes": surface_bytes, "sizes": sizes, "snapshot": snapshot if self.cycle > self.warmup else None,
+        })
+        # Only the first and latest snapshot per state are compared; drop the ones in between
+        kept = [r for r in self.records if r["state"] == state and r["snapshot"] is not None]
+        if len(kept) > 2:
+            kept[-2]["snapshot"] = None
+
+    def report(self):
+        """
+        Print the per-transition table, then, for every state, the growth
+        between its first and last visit after the warmup cycles. A value is
+        flagged when it ended higher and rose on at least half of the
+        rematches (and at least twice). Returns the flagged states.
+        """
+        warmup = self.warmup
+        print(f"{'cycle':>5} {'state':<12} {'traced MB':>10} {'surfaces':>9} {'surface MB':>11}")
+        for r in self.records:
+            print(f"{r['cycle']:>5} {r['state']:<12} {r['traced'] / MB:>10.2f} {r['surfaces']:>9} "
+                  f"{r['surface_bytes'] / MB:>11.2f}")
+
+        flagged = []
+        for state in dict.fromkeys(r["state"] for r in self.records):
+            visits = [r for r in self.records if r["state"] == state and r["cycle"] > warmup]
+            if len(visits) < 2:
+                continue
+            first, last = visits[0], visits[-1]
+            needed = max(2, len(visits) // 2)
+            growing = [key for key in ("traced", "surfaces", "surface_bytes")
+                       if last[key] > first[key] and sum(b[key] > a[key] for a, b in zip(visits, visits[1:])) >= needed]
+            if not growing:
+                continue
+            flagged.append(state)
+            print(f"\nGROWTH at {state} over cycles {first['cycle']}-{last['cycle']}: "
+                  f"traced {(last['traced'] - first['traced']) / 1024:+.1f} KB, "
+                  f"surfaces {last['surfaces'] - first['surfaces']:+d} "
+                  f"({(last['surface_bytes'] - first['surface_bytes']) / 1024:+.1f} KB), "
+                  f"steadily growing: {', '.join(growing)}")
+            grown = (last["sizes"] - first["sizes"]).most_common(MEMORY_TOP_SITES)
+            for (w, h, bits), count in grown:
+                print(f"    +{count} surfaces {w}x{h} {bits}-bit")
+            if first["snapshot"] is not None and last["snapshot"] is not None:
+                stats = last["snapshot"].compare_to(first["snapshot"], "lineno")
+                for stat in [s for s in stats if s.size_diff > 0][:MEMORY_TOP_SITES]:
+                    print(f"    {stat.size_diff / 1024:+8.1f} KB {stat.count_diff:+6d} blocks  {stat.traceback[0]}")
+        if not flagged:
+            print(f"\nNo state grew across cycles {warmup + 1}-{self.cycle}")
+        return flagged
+
+
+def _press(key):
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+
+
+def run_rematches(game, cycles, match_ticks=300, settle=30, rotate=False):
+    """
+    Play `cycles` full rematches through the real event handling:
+    START -> CHAR_SELECT -> PLAYING for match_ticks, then the loser
+    (alternating) is knocked out -> RESCUE / LOST -> GAME_OVER -> START.
+    rotate: pick the next character every rematch (the first pass through
+    all of them fills per-character caches, so allow that many warmup cycles).
+    """
+    def frames(n, until=None):
+        for _ in range(n):
+            game.handle_events()
+            game.update()
+            game.draw()
+            if until is not None and game.current_state in until:
+                return
+
+    for i in range(cycles):
+        _press(pygame.K_s)
+        frames(settle)
+        if rotate:
+            _press(pygame.K_RIGHT)
+        _press(pygame.K_RETURN)
+        frames(match_ticks, until=(game.STATE_RESCUE, game.STATE_LOST))
+        if game.current_state == game.STATE_PLAYING:
+            (game.world.bot if i % 2 == 0 else game.world.player).health = 0
+        # LOST turns into GAME_OVER after its animation; RESCUE waits for a key
+        frames(240, until=(game.STATE_GAME_OVER,))
+        frames(settle)
+        _press(pygame.K_s)
+        frames(settle)
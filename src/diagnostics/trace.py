@@ -0,0 +1,141 @@
+"""
+Chrome trace-event spans.
+Wrap code in `with span("name"):` or decorate a function with @traced();
+each thread appends (start, duration) records to its own buffer, and
+dump() writes them all as a trace.json that chrome://tracing or
+https://ui.perfetto.dev shows on one timeline per thread (game loop vs
+VisionSystem thread, lock waits, detect() against display.flip, ...).
+
+Until enable() is called span() returns a shared do-nothing context and
+@traced functions call straight through, so the hooks can stay in place.
+A thread's buffer is only ever appended to by that thread (no locks on
+the hot path) and keeps the last TRACE_BUFFER_EVENTS records.
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from config.settings import TRACE_PATH, TRACE_BUFFER_EVENTS
+
+_enabled = False
+_path = TRACE_PATH
+_local = threading.local()
+_buffers = []  # (thread id, thread name, buffer) for every thread that recorded a span
+_register_lock = threading.Lock()  # Taken once per thread, on its first span
+_clock = time.perf_counter_ns
+_epoch = _clock()
+
+
+def enable(path=TRACE_PATH, dump_at_exit=True):
+    """Start recording; the trace is written to `path` by dump() (and at exit)."""
+    global _enabled, _path
+    _path = path
+    if dump_at_exit and not _enabled:
+        atexit.register(dump)
+    _enabled = True
+
+
+def is_enabled():
+    return _enabled
+
+
+def _buffer():
+    try:
+        return _local.buffer
+    except AttributeError:
+        buf = _local.buffer = deque(maxlen=TRACE_BUFFER_EVENTS)
+        thread = threading.current_thread()
+        with _register_lock:
+            _buffers.append((thread.ident, thread.name, buf))
+        return buf
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = _clock()
+        return self
+
+    def __exit__(self, *exc):
+        end = _clock()
+        _buffer().append((self.name, self.cat, self.start, end - self.start, self.args))
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, cat="game", **args):
+    """Context manager timing its body as one complete event; args are shown in the viewer."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, cat, args or None)
+
+
+def traced(name=None, cat="game"):
+    """Decorator: every call of the function is a span (named after it by default)."""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = _clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _buffer().append((label, cat, start, _clock() - start, None))
+        return wrapper
+    return decorate
+
+
+def instant(name, cat="game", **args):
+    """A zero-length marker (e.g. "gesture recognised")."""
+    if _enabled:
+        _buffer().append((name, cat, _clock(), None, args or None))
+
+
+def dump(path=None):
+    """Write everything recorded so far as Chrome trace JSON; returns the event count."""
+    path = path or _path
+    pid = os.getpid()
+    events = []
+    with _register_lock:
+        buffers = list(_buffers)
+    for tid, thread_name, buf in buffers:
+        events.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+        for name, cat, start, duration, args in list(buf):
+            event = {"name": name, "cat": cat, "pid": pid, "tid": tid, "ts": (start - _epoch) / 1000}
+            if duration is None:
+                event.update(ph="i", s="t")
+            else:
+                event.update(ph="X", dur=duration / 1000)
+            if args:
+                event["args"] = args
+            events.append(event)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    recorded = len(events) - len(buffers)
+    print(f"Trace: {recorded} events from {len(buffers)} threads written to {path}")
+    return recorded
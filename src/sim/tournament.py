@@ -0,0 +1,226 @@
+"""
+Self-play tournament runner for bot tuning.
+Fans headless World matches out over a ProcessPoolExecutor (one worker
+per core by default). A job is a batch of matches for one Bot parameter
+set over its own seed range, so results are reproducible however the
+jobs get scheduled. Within a round every candidate plays the same seeds,
+so they are compared on identical matches.
+
+Matchups:
+    scripted  bot vs the ScriptedVision player (seeded random gestures)
+    mirror    bot vs a bot with the default parameters
+Searches:
+    grid      every combination of --grid name=v1,v2,...
+    evolve    elitist mutation search towards a --target bot win rate
+
+Run:
+    python src/sim/tournament.py --grid attack_chance=0.04,0.08,0.12 dodge_radius=150,250 --matches 400
+    python src/sim/tournament.py --evolve 10 --population 16 --matches 200 --target 0.5 --out runs.jsonl
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from config.settings import SIM_HZ
+from core.bot import DEFAULT_BOT_PARAMS
+from core.world import World
+from vision.scripted import ScriptedVision, player_rng
+
+MAX_MATCH_TICKS = SIM_HZ * 300
+STAT_KEYS = ("matches", "bot_wins", "player_wins", "draws", "ticks", "bot_damage", "player_damage")
+
+
+# ═══════════════════════════════════════════
+#  MATCHES (run inside workers)
+# ═══════════════════════════════════════════
+def play_match(seed, bot_params, matchup="scripted", interval=45, max_ticks=MAX_MATCH_TICKS):
+    """One headless match. Returns (winner, ticks, damage dealt by bot, damage dealt by player)."""
+    world = World(seed, bot_params=bot_params, rival_params={} if matchup == "mirror" else None)
+    player = ScriptedVision(interval=interval, rng=player_rng(seed))
+    dealt = {"bot": 0.0, "player": 0.0}
+    while not world.over and world.tick < max_ticks:
+        for event in world.step({"gesture": player.get_gesture()}):
+            if event["type"] == "hit":
+                dealt["player" if event["target"] is world.bot else "bot"] += event["damage"]
+    return world.winner, world.tick, dealt["bot"], dealt["player"]
+
+
+def play_batch(job):
+    """Worker entry point: job = (candidate id, params, seeds, matchup, interval). Returns (cid, stats, seeds)."""
+    cid, params, seeds, matchup, interval = job
+    stats = dict.fromkeys(STAT_KEYS, 0)
+    for seed in seeds:
+        winner, ticks, bot_damage, player_damage = play_match(seed, params, matchup, interval)
+        stats["matches"] += 1
+        stats["bot_wins"] += winner == "Bot"
+        stats["player_wins"] += winner == "Player"
+        stats["draws"] += winner is None
+        stats["ticks"] += ticks
+        stats["bot_damage"] += bot_damage
+        stats["player_damage"] += player_damage
+    return cid, stats, seeds
+
+
+# ═══════════════════════════════════════════
+#  TOURNAMENT
+# ═══════════════════════════════════════════
+class Tournament:
+    def __init__(self, matchup="scripted", interval=45, workers=None, batch=50, out=None):
+        self.matchup = matchup
+        self.interval = interval
+        self.workers = workers or os.cpu_count()
+        self.batch = batch
+        self.out = out  # Optional JSON-lines file, one line per finished batch
+        self.total_ticks = 0
+
+    def run_round(self, candidates, matches, first_seed):
+        """Play `matches` seeds for every candidate; returns per-candidate summed stats."""
+        seeds = range(first_seed, first_seed + matches)
+        jobs = [(cid, params, seeds[i:i + self.batch], self.matchup, self.interval)
+                for cid, params in enumerate(candidates)
+                for i in range(0, matches, self.batch)]
+        totals = [dict.fromkeys(STAT_KEYS, 0) for _ in candidates]
+        total = matches * len(candidates)
+        done = 0
+        start = time.perf_counter()
+        with ProcessPoolExecutor(self.workers) as pool:
+            for future in as_completed([pool.submit(play_batch, job) for job in jobs]):
+                cid, stats, seeds = future.result()
+                for key in STAT_KEYS:
+                    totals[cid][key] += stats[key]
+                done += stats["matches"]
+                self.total_ticks += stats["ticks"]
+                self._stream(candidates[cid], stats, seeds)
+                elapsed = time.perf_counter() - start
+                print(f"\r  {done}/{total} matches, "
+                      f"{done / elapsed:.0f} matches/s", end="", flush=True)
+        print()
+        return totals
+
+    def _stream(self, params, stats, seeds):
+        if self.out is None:
+            return
+        # Enough to replay any match of the batch: World(seed), ScriptedVision(rng=player_rng(seed))
+        record = {"matchup": self.matchup, "params": params, "interval": self.interval,
+                  "seeds": [seeds.start, seeds.stop], "player_seed": "{seed}:player", **stats}
+        with open(self.out, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+# ═══════════════════════════════════════════
+#  SEARCH
+# ═══════════════════════════════════════════
+def parse_grid(specs):
+    """["attack_chance=0.04,0.08", ...] -> list of full parameter dicts (cartesian product)."""
+    axes = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in DEFAULT_BOT_PARAMS:
+            raise ValueError(f"Unknown bot parameter '{name}' (known: {', '.join(DEFAULT_BOT_PARAMS)})")
+        cast = type(DEFAULT_BOT_PARAMS[name])
+        axes[name] = [cast(v) for v in values.split(",")]
+    return [{**DEFAULT_BOT_PARAMS, **dict(zip(axes, combo))} for combo in itertools.product(*axes.values())]
+
+
+def mutate(params, rng, strength=0.2):
+    """Log-normal jitter on about half of the parameters, kept in valid ranges."""
+    child = dict(params)
+    for name, value in params.items():
+        if rng.random() < 0.5:
+            continue
+        value = value * math.exp(rng.gauss(0, strength))
+        if isinstance(DEFAULT_BOT_PARAMS[name], int):
+            value = max(1, round(value))
+        elif name.endswith("_chance") or name.endswith("_preference"):
+            value = min(1.0, value)
+        child[name] = value
+    # Reaction roll: block + jump share one [0, 1) draw
+    child["jump_chance"] = min(child["jump_chance"], 1.0 - child["block_chance"])
+    return child
+
+
+def summarize(stats):
+    n = max(1, stats["matches"])
+    return {
+        "bot_win_rate": stats["bot_wins"] / n,
+        "draw_rate": stats["draws"] / n,
+        "avg_seconds": stats["ticks"] / n / SIM_HZ,
+        "bot_damage": stats["bot_damage"] / n,
+        "player_damage": stats["player_damage"] / n,
+    }
+
+
+def report(candidates, totals, fitness=None):
+    """Aggregated table, best first (by fitness, else bot win rate)."""
+    rows = [(params, summarize(stats)) for params, stats in zip(candidates, totals)]
+    rows.sort(key=lambda r: fitness(r[1]) if fitness else r[1]["bot_win_rate"], reverse=True)
+    print(f"{'bot win':>8} {'draw':>6} {'match s':>8} {'bot dmg':>8} {'plr dmg':>8}  params (changed from default)")
+    for params, s in rows:
+        changed = {k: round(v, 4) if isinstance(v, float) else v
+                   for k, v in params.items() if v != DEFAULT_BOT_PARAMS[k]}
+        print(f"{s['bot_win_rate']:>8.1%} {s['draw_rate']:>6.1%} {s['avg_seconds']:>8.1f} "
+              f"{s['bot_damage']:>8.1f} {s['player_damage']:>8.1f}  {changed or 'defaults'}")
+    return rows
+
+
+def run_grid(tournament, specs, matches, seed):
+    candidates = parse_grid(specs)
+    print(f"Grid: {len(candidates)} parameter sets x {matches} matches ({tournament.matchup})")
+    totals = tournament.run_round(candidates, matches, seed)
+    return report(candidates, totals)
+
+
+def run_evolve(tournament, generations, population, matches, seed, target):
+    rng = random.Random(seed)
+    fitness = lambda s: -abs(s["bot_win_rate"] - target)
+    elite_count = max(1, population // 4)
+    candidates = [dict(DEFAULT_BOT_PARAMS)] + [mutate(DEFAULT_BOT_PARAMS, rng) for _ in range(population - 1)]
+    rows = []
+    for gen in range(generations):
+        print(f"Generation {gen + 1}/{generations}: {len(candidates)} candidates x {matches} matches")
+        # Fresh seeds per generation so the search can't overfit one seed set
+        totals = tournament.run_round(candidates, matches, seed + gen * matches)
+        rows = report(candidates, totals, fitness)
+        elites = [params for params, _ in rows[:elite_count]]
+        candidates = elites + [mutate(rng.choice(elites), rng) for _ in range(population - elite_count)]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless self-play tournament for Bot parameter tuning")
+    search = parser.add_mutually_exclusive_group()
+    search.add_argument("--grid", nargs="+", metavar="NAME=V1,V2", help="sweep every combination")
+    search.add_argument("--evolve", type=int, metavar="GENERATIONS", help="evolutionary search")
+    parser.add_argument("--population", type=int, default=16, help="evolve: candidates per generation")
+    parser.add_argument("--target", type=float, default=0.5, help="evolve: bot win rate to aim for")
+    parser.add_argument("--matches", type=int, default=200, help="matches per parameter set (per generation)")
+    parser.add_argument("--matchup", choices=("scripted", "mirror"), default="scripted")
+    parser.add_argument("--interval", type=int, default=45, help="scripted player: ticks between casts")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--batch", type=int, default=50, help="matches per job")
+    parser.add_argument("--seed", type=int, default=0, help="first match seed")
+    parser.add_argument("--out", default=None, help="append per-batch results as JSON lines")
+    args = parser.parse_args()
+
+    tournament = Tournament(args.matchup, args.interval, args.workers, args.batch, args.out)
+    start = time.perf_counter()
+    if args.evolve:
+        run_evolve(tournament, args.evolve, args.population, args.matches, args.seed, args.target)
+    else:
+        run_grid(tournament, args.grid or [], args.matches, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"Simulated {tournament.total_ticks / SIM_HZ:.0f} game seconds in {elapsed:.1f}s "
+          f"({tournament.total_ticks / elapsed:.0f} ticks/s, {tournament.workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Per-character asset bundles.
+A bundle holds every sprite a match needs for one CHARACTER_DATA entry:
+hero and opponent (base, hurt, freeze, burn), the victim sprites and the
+iron cage. Bundles come from the sprite atlas when it is loaded and are
+built procedurally otherwise; either way each one is built once and kept,
+so a rematch reuses it as is.
+
+Bundles are built on the main thread (surface conversion is not thread
+safe): the game asks for one as the selection cursor reaches a character,
+so by the time ENTER is pressed it is usually cached.
+"""
+from diagnostics import trace
+from ui import pixel_sprites as ps
+from ui.sprite_atlas import get_sprite, get_variants
+from ui.surface_registry import register_hook
+
+_bundles = {}  # CHARACTER_DATA index -> CharacterBundle
+
+
+class CharacterBundle:
+    def __init__(self, char):
+        name = char["name"]
+        self.name = name
+        self.hero = get_variants(f"hero/{name}", char["create"])
+        self.opponent = get_variants(f"opponent/{name}",
+                                     lambda: char["opponent_create"](char["opponent_color"]), flip=True)
+        self.victim = get_sprite(f"victim/{name}",
+                                 lambda: ps.create_victim_sprite(char["victim_color"], char["victim_gender"]))
+        self.victim_body = get_sprite(f"victim_body/{name}",
+                                      lambda: ps.create_victim_body_sprite(char["victim_color"], char["victim_gender"]))
+        self.cage = get_sprite("cage", ps.create_iron_cage_sprite)
+
+
+def get_bundle(index):
+    """The bundle for a CHARACTER_DATA index, built on first request."""
+    bundle = _bundles.get(index)
+    if bundle is None:
+        with trace.span("asset_bundle", "load", char=index):
+            bundle = CharacterBundle(ps.CHARACTER_DATA[index])
+        _bundles[index] = bundle
+    return bundle
+
+
+@register_hook
+def clear():
+    """Drop every bundle (the atlas they were sliced from was re-converted)."""
+    _bundles.clear()
+    return 0
@@ -0,0 +1,88 @@
+"""
+Parallax background engine.
+Stars live on three colorkeyed, RLE-encoded layers (2x screen height for
+seamless vertical scrolling), so each layer blit only touches star runs.
+The floor is pre-rendered once into a strip one tile wider than the
+screen; scrolling it is a single blit at an offset instead of a loop of
+tile blits.
+"""
+import random
+
+import pygame
+
+from config.settings import WIDTH, HEIGHT, PIXEL_SCALE
+from ui.pixel_sprites import to_logical
+from ui.surface_registry import prepare, COLORKEY, OPAQUE
+
+# (star count, scroll speed px/frame, base color), far to near
+STAR_LAYERS = [
+    (80, 0.3, (50, 60, 80)),
+    (50, 0.8, (100, 130, 160)),
+    (30, 1.5, (200, 220, 255)),
+]
+STAR_KEY = (0, 0, 0)
+FLOOR_SCROLL_SPEED = 2  # px/frame
+
+
+class ParallaxBackground:
+    def __init__(self, floor_tile, scale=1, rng=random):
+        """scale > 1 builds everything for the low-res framebuffer (1 art pixel = 1 pixel)."""
+        self.scale = scale
+        self.scroll_frame = 0
+        self.star_layers = [self._build_star_layer(count, speed, color, rng)
+                            for count, speed, color in STAR_LAYERS]
+        self.floor_tile = floor_tile
+        self.tile_w = floor_tile.get_width() if floor_tile is not None else WIDTH
+        self.floor_strip = self._build_floor_strip(floor_tile) if floor_tile is not None else None
+
+    def _build_star_layer(self, count, speed, base_color, rng):
+        # Stars are opaque on a colorkey background so the layer RLE-encodes: blits
+        # skip the empty space instead of alpha-blending a mostly transparent surface.
+        s = self.scale
+        layer_surf = pygame.Surface((WIDTH // s, HEIGHT * 2 // s))
+        layer_surf.fill(STAR_KEY)
+        for _ in range(count):
+            sx = rng.uniform(0, WIDTH)
+            sy = rng.uniform(0, HEIGHT * 2)
+            size = PIXEL_SCALE if speed < 1.0 else PIXEL_SCALE + 1
+            # Add some slight variation to the base color
+            var = rng.randint(-20, 20)
+            c = (max(0, min(255, base_color[0] + var)),
+                 max(0, min(255, base_color[1] + var)),
+                 max(0, min(255, base_color[2] + var)))
+            pygame.draw.rect(layer_surf, c, (int(sx) // s, int(sy) // s, max(1, size // s), max(1, size // s)))
+        return {"surf": prepare(layer_surf, COLORKEY, STAR_KEY), "speed": speed, "y": 0.0}
+
+    def _build_floor_strip(self, floor_tile):
+        """Tiles from -tile_w to WIDTH + tile_w baked side by side."""
+        tile = to_logical(floor_tile, self.scale)
+        count = len(range(-self.tile_w, WIDTH + self.tile_w, self.tile_w))
+        strip = pygame.Surface((tile.get_width() * count, tile.get_height()))
+        for i in range(count):
+            strip.blit(tile, (i * tile.get_width(), 0))
+        return prepare(strip, OPAQUE)
+
+    def update(self):
+        """Advance one scroll step."""
+        self.scroll_frame += 1
+        for layer in self.star_layers:
+            layer["y"] = (layer["y"] + layer["speed"]) % HEIGHT
+
+    def draw_stars(self, surface, to_world, shake_offset=(0, 0)):
+        """
+        to_world maps world (x, y) onto the target (camera world surface).
+        The camera shakes everything by shake_offset on present; stars are
+        pulled back 80% so they only move 20% for parallax depth.
+        """
+        back_x = -int(shake_offset[0] * 0.8)
+        back_y = -int(shake_offset[1] * 0.8)
+        for layer in self.star_layers:
+            # The layer is 2x height; blit so the visible window starts at the scroll position
+            surface.blit(layer["surf"], to_world(back_x, back_y - layer["y"]))
+
+    def draw_floor(self, surface, floor_y, to_world):
+        """Single strip blit; to_world maps world (x, y) onto the target surface."""
+        if self.floor_strip is None:
+            return
+        offset = (self.scroll_frame * FLOOR_SCROLL_SPEED) % self.tile_w
+        surface.blit(self.floor_strip, to_world(-self.tile_w - offset, floor_y))
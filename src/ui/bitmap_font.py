@@ -0,0 +1,196 @@
+"""
+Bundled bitmap pixel font.
+Glyphs are 5x8 grids in the same spirit as the sprite grids in
+pixel_sprites ('#' = ink, rows top to bottom, row 7 is the descender).
+Each font size is an integer pixel scale; per color the whole character
+set is baked once into a glyph atlas, so drawing text is a run of cached
+blits with fixed advances. No system font lookup is involved. Atlases are
+kept for the FONT_ATLAS_COLORS most recently used colors, so animated
+text colors can't grow the cache without bound.
+"""
+from collections import OrderedDict
+
+import pygame
+
+from config.settings import FONT_ATLAS_COLORS
+from ui.surface_registry import prepare, note_cache_miss
+
+GLYPH_W, GLYPH_H = 5, 8
+SPACING = 1  # Blank columns between glyphs
+
+_GLYPHS = {
+    " ": ".....|.....|.....|.....|.....|.....|.....",
+    "!": "..#..|..#..|..#..|..#..|..#..|.....|..#..",
+    '"': ".#.#.|.#.#.|.....|.....|.....|.....|.....",
+    "#": ".#.#.|.#.#.|#####|.#.#.|#####|.#.#.|.#.#.",
+    "$": "..#..|.####|#.#..|.###.|..#.#|####.|..#..",
+    "%": "##...|##..#|...#.|..#..|.#...|#..##|...##",
+    "&": ".##..|#..#.|#.#..|.#...|#.#.#|#..#.|.##.#",
+    "'": "..#..|..#..|.#...|.....|.....|.....|.....",
+    "(": "...#.|..#..|.#...|.#...|.#...|..#..|...#.",
+    ")": ".#...|..#..|...#.|...#.|...#.|..#..|.#...",
+    "*": ".....|..#..|#.#.#|.###.|#.#.#|..#..|.....",
+    "+": ".....|..#..|..#..|#####|..#..|..#..|.....",
+    ",": ".....|.....|.....|.....|.##..|..#..|.#...",
+    "-": ".....|.....|.....|#####|.....|.....|.....",
+    ".": ".....|.....|.....|.....|.....|.##..|.##..",
+    "/": ".....|....#|...#.|..#..|.#...|#....|.....",
+    "0": ".###.|#...#|#..##|#.#.#|##..#|#...#|.###.",
+    "1": "..#..|.##..|..#..|..#..|..#..|..#..|.###.",
+    "2": ".###.|#...#|....#|...#.|..#..|.#...|#####",
+    "3": "#####|...#.|..#..|...#.|....#|#...#|.###.",
+    "4": "...#.|..##.|.#.#.|#..#.|#####|...#.|...#.",
+    "5": "#####|#....|####.|....#|....#|#...#|.###.",
+    "6": "..##.|.#...|#....|####.|#...#|#...#|.###.",
+    "7": "#####|....#|...#.|..#..|.#...|.#...|.#...",
+    "8": ".###.|#...#|#...#|.###.|#...#|#...#|.###.",
+    "9": ".###.|#...#|#...#|.####|....#|...#.|.##..",
+    ":": ".....|.##..|.##..|.....|.##..|.##..|.....",
+    ";": ".....|.##..|.##..|.....|.##..|..#..|.#...",
+    "<": "...#.|..#..|.#...|#....|.#...|..#..|...#.",
+    "=": ".....|.....|#####|.....|#####|.....|.....",
+    ">": ".#...|..#..|...#.|....#|...#.|..#..|.#...",
+    "?": ".###.|#...#|....#|...#.|..#..|.....|..#..",
+    "@": ".###.|#...#|....#|.##.#|#.#.#|#.#.#|.###.",
+    "A": ".###.|#...#|#...#|#####|#...#|#...#|#...#",
+    "B": "####.|#...#|#...#|####.|#...#|#...#|####.",
+    "C": ".###.|#...#|#....|#....|#....|#...#|.###.",
+    "D": "###..|#..#.|#...#|#...#|#...#|#..#.|###..",
+    "E": "#####|#....|#....|####.|#....|#....|#####",
+    "F": "#####|#....|#....|####.|#....|#....|#....",
+    "G": ".###.|#...#|#....|#.###|#...#|#...#|.####",
+    "H": "#...#|#...#|#...#|#####|#...#|#...#|#...#",
+    "I": ".###.|..#..|..#..|..#..|..#..|..#..|.###.",
+    "J": "..###|...#.|...#.|...#.|...#.|#..#.|.##..",
+    "K": "#...#|#..#.|#.#..|##...|#.#..|#..#.|#...#",
+    "L": "#....|#....|#....|#....|#....|#....|#####",
+    "M": "#...#|##.##|#.#.#|#.#.#|#...#|#...#|#...#",
+    "N": "#...#|#...#|##..#|#.#.#|#..##|#...#|#...#",
+    "O": ".###.|#...#|#...#|#...#|#...#|#...#|.###.",
+    "P": "####.|#...#|#...#|####.|#....|#....|#....",
+    "Q": ".###.|#...#|#...#|#...#|#.#.#|#..#.|.##.#",
+    "R": "####.|#...#|#...#|####.|#.#..|#..#.|#...#",
+    "S": ".####|#....|#....|.###.|....#|....#|####.",
+    "T": "#####|..#..|..#..|..#..|..#..|..#..|..#..",
+    "U": "#...#|#...#|#...#|#...#|#...#|#...#|.###.",
+    "V": "#...#|#...#|#...#|#...#|#...#|.#.#.|..#..",
+    "W": "#...#|#...#|#...#|#.#.#|#.#.#|#.#.#|.#.#.",
+    "X": "#...#|#...#|.#.#.|..#..|.#.#.|#...#|#...#",
+    "Y": "#...#|#...#|#...#|.#.#.|..#..|..#..|..#..",
+    "Z": "#####|....#|...#.|..#..|.#...|#....|#####",
+    "[": ".###.|.#...|.#...|.#...|.#...|.#...|.###.",
+    "\\": ".....|#....|.#...|..#..|...#.|....#|.....",
+    "]": ".###.|...#.|...#.|...#.|...#.|...#.|.###.",
+    "^": "..#..|.#.#.|#...#|.....|.....|.....|.....",
+    "_": ".....|.....|.....|.....|.....|.....|#####",
+    "`": ".#...|..#..|.....|.....|.....|.....|.....",
+    "a": ".....|.....|.###.|....#|.####|#...#|.####",
+    "b": "#....|#....|#.##.|##..#|#...#|#...#|####.",
+    "c": ".....|.....|.###.|#....|#....|#...#|.###.",
+    "d": "....#|....#|.##.#|#..##|#...#|#...#|.####",
+    "e": ".....|.....|.###.|#...#|#####|#....|.###.",
+    "f": "..##.|.#..#|.#...|###..|.#...|.#...|.#...",
+    "g": ".....|.....|.####|#...#|#...#|.####|....#|.###.",
+    "h": "#....|#....|#.##.|##..#|#...#|#...#|#...#",
+    "i": "..#..|.....|.##..|..#..|..#..|..#..|.###.",
+    "j": "...#.|.....|..##.|...#.|...#.|...#.|#..#.|.##..",
+    "k": "#....|#....|#..#.|#.#..|##...|#.#..|#..#.",
+    "l": ".##..|..#..|..#..|..#..|..#..|..#..|.###.",
+    "m": ".....|.....|##.#.|#.#.#|#.#.#|#...#|#...#",
+    "n": ".....|.....|#.##.|##..#|#...#|#...#|#...#",
+    "o": ".....|.....|.###.|#...#|#...#|#...#|.###.",
+    "p": ".....|.....|####.|#...#|#...#|####.|#....|#....",
+    "q": ".....|.....|.####|#...#|#...#|.####|....#|....#",
+    "r": ".....|.....|#.##.|##..#|#....|#....|#....",
+    "s": ".....|.....|.####|#....|.###.|....#|####.",
+    "t": ".#...|.#...|###..|.#...|.#...|.#..#|..##.",
+    "u": ".....|.....|#...#|#...#|#...#|#..##|.##.#",
+    "v": ".....|.....|#...#|#...#|#...#|.#.#.|..#..",
+    "w": ".....|.....|#...#|#...#|#.#.#|#.#.#|.#.#.",
+    "x": ".....|.....|#...#|.#.#.|..#..|.#.#.|#...#",
+    "y": ".....|.....|#...#|#...#|#...#|.####|....#|.###.",
+    "z": ".....|.....|#####|...#.|..#..|.#...|#####",
+    "{": "...#.|..#..|..#..|.#...|..#..|..#..|...#.",
+    "|": "..#..|..#..|..#..|..#..|..#..|..#..|..#..",
+    "}": ".#...|..#..|..#..|...#.|..#..|..#..|.#...",
+    "~": ".....|.....|.#...|#.#.#|...#.|.....|.....",
+}
+CHARSET = "".join(_GLYPHS)
+FALLBACK = "?"
+
+
+_mask_1x = None
+
+
+def _build_mask(scale):
+    """All glyphs side by side in white on transparent, one cell per character."""
+    global _mask_1x
+    if _mask_1x is None:
+        _mask_1x = pygame.Surface((GLYPH_W * len(CHARSET), GLYPH_H), pygame.SRCALPHA)
+        for i, ch in enumerate(CHARSET):
+            for y, row in enumerate(_GLYPHS[ch].split("|")):
+                for x, px in enumerate(row):
+                    if px == "#":
+                        _mask_1x.set_at((i * GLYPH_W + x, y), (255, 255, 255, 255))
+    # Integer nearest-neighbour upscale keeps the pixels square
+    return pygame.transform.scale_by(_mask_1x, scale)
+
+
+class BitmapFont:
+    """Drop-in for the pygame.font.Font calls the game uses (render, size, get_height)."""
+    def __init__(self, scale=2):
+        self.scale = scale
+        self.advance = (GLYPH_W + SPACING) * scale
+        self.height = GLYPH_H * scale
+        self._mask = None
+        self._atlases = OrderedDict()  # color -> {char: glyph subsurface}, least recently used first
+
+    def glyphs(self, color):
+        """Glyph atlas for one color, baked on first use."""
+        color = tuple(color)
+        glyphs = self._atlases.get(color)
+        if glyphs is not None:
+            self._atlases.move_to_end(color)
+        else:
+            if self._mask is None:
+                self._mask = _build_mask(self.scale)
+            atlas = self._mask.copy()
+            note_cache_miss()
+            atlas.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+            atlas = prepare(atlas)
+            cell = GLYPH_W * self.scale
+            glyphs = {ch: atlas.subsurface((i * cell, 0, cell, self.height)) for i, ch in enumerate(CHARSET)}
+            self._atlases[color] = glyphs
+            while len(self._atlases) > FONT_ATLAS_COLORS:
+                self._atlases.popitem(last=False)
+        return glyphs
+
+    def size(self, text):
+        return (len(text) * self.advance, self.height)
+
+    def get_height(self):
+        return self.height
+
+    def get_linesize(self):
+        return self.height + self.scale
+
+    def draw(self, surface, text, pos, color):
+        """Blit text straight onto surface (no intermediate surface). Returns the end x."""
+        glyphs = self.glyphs(color)
+        x, y = pos
+        fallback = glyphs[FALLBACK]
+        advance = self.advance
+        for ch in text:
+            if ch != " ":
+                surface.blit(glyphs.get(ch, fallback), (x, y))
+            x += advance
+        return x
+
+    def render(self, text, antialias=False, color=(255, 255, 255), background=None):
+        """Text on a new surface, like Font.render (antialias is ignored: pixel font)."""
+        surf = pygame.Surface(self.size(text), pygame.SRCALPHA)
+        note_cache_miss()
+        if background is not None:
+            surf.fill(background)
+        self.draw(surf, text, (0, 0), color)
+        return surf
@@ -0,0 +1,97 @@
+"""
+Camera / viewport layer.
+World content is drawn once per frame into an offscreen world surface
+with no camera offsets; shake, pan and zoom are applied by the single
+blit that presents it. The world surface has a margin on every side so
+shaking never reveals an unpainted edge:
+
+    world ┌────────────────────────┐
+          │ margin                 │
+          │   ┌ view ─────────┐    │   view = world.subsurface, same size
+          │   │ (0,0) = screen│    │   and coordinates as the screen
+          │   └───────────────┘    │   (divided by scale in low-res mode)
+          └────────────────────────┘
+
+Objects draw into `view` in plain world coordinates. Full-width layers
+(background, floor) draw into `world` through `to_world` so they also
+cover the margin. The HUD is drawn on the screen after present().
+
+When no transform is active (no shake, pan or zoom, native scale) the
+camera acts as a plain SDL viewport: `world` and `view` are the screen
+itself and present() is free, so the offscreen copy is only paid while
+an effect is running.
+"""
+import pygame
+
+from config.settings import WIDTH, HEIGHT, BG_COLOR, CAMERA_MARGIN
+
+
+class Camera:
+    def __init__(self, screen, scale=1, margin=CAMERA_MARGIN):
+        """scale > 1: the world is kept at logical resolution and upscaled on present."""
+        self.screen = screen
+        self.scale = scale
+        self.margin = margin // scale
+        view_w, view_h = WIDTH // scale, HEIGHT // scale
+        self._world = pygame.Surface((view_w + 2 * self.margin, view_h + 2 * self.margin)).convert()
+        self._view = self._world.subsurface((self.margin, self.margin, view_w, view_h))
+        # Screen area the view maps onto (800 is not a multiple of 3 in low-res mode)
+        self.target = screen.subsurface((0, 0, view_w * scale, view_h * scale))
+        self.gutter = None
+        if self.target.get_width() < WIDTH:
+            self.gutter = pygame.Rect(self.target.get_width(), 0, WIDTH - self.target.get_width(), HEIGHT)
+
+        self.shake = (0, 0)
+        self.pan = (0, 0)
+        self.zoom = 1.0
+        self.begin()
+
+    def begin(self, shake=None):
+        """Start a frame: pick the render targets for the current camera state."""
+        if shake is not None:
+            self.shake = shake
+        self.direct = (self.scale == 1 and self.zoom == 1.0
+                       and self.shake == (0, 0) and self.pan == (0, 0))
+        if self.direct:
+            self.world = self.view = self.screen
+            self.origin = 0
+        else:
+            self.world, self.view = self._world, self._view
+            self.origin = self.margin
+
+    # ── coordinates ──
+    def to_world(self, x, y):
+        """World position -> position on `world` (margin origin, divided by scale)."""
+        s = self.scale
+        return (self.origin + int(x) // s, self.origin + int(y) // s)
+
+    def to_screen(self, x, y):
+        """World position -> screen position after shake / pan / zoom (for HUD labels)."""
+        cx, cy = WIDTH / 2, HEIGHT / 2
+        return (int(cx + (x - self.pan[0] - cx) * self.zoom + self.shake[0]),
+                int(cy + (y - self.pan[1] - cy) * self.zoom + self.shake[1]))
+
+    # ── presentation ──
+    def present(self):
+        """Blit the world onto the screen with the camera transform applied."""
+        if self.direct:
+            return
+        s = self.scale
+        m = self.margin
+        sx = max(-m, min(m, round(self.shake[0] / s)))
+        sy = max(-m, min(m, round(self.shake[1] / s)))
+        px, py = int(self.pan[0]) // s, int(self.pan[1]) // s
+        if s == 1 and self.zoom == 1.0:
+            # Plain translation: one blit of the world window, no scaling
+            self.screen.blit(self._world, (0, 0), (m - sx + px, m - sy + py, WIDTH, HEIGHT))
+            return
+
+        view_w, view_h = self._view.get_size()
+        src_w, src_h = int(view_w / self.zoom), int(view_h / self.zoom)
+        src = pygame.Rect(0, 0, src_w, src_h)
+        src.center = (m + view_w // 2 - sx + px, m + view_h // 2 - sy + py)
+        src.clamp_ip(self._world.get_rect())
+        src = src.clip(self._world.get_rect())  # zoom < 1 can ask for more than the world holds
+        pygame.transform.scale(self._world.subsurface(src), self.target.get_size(), self.target)
+        if self.gutter is not None:
+            self.screen.fill(BG_COLOR, self.gutter)
@@ -0,0 +1,84 @@
+"""
+Dirty-rectangle presentation.
+Each frame the game reports the screen regions that changed; the tracker
+merges them with last frame's regions (so old positions get erased), clips
+drawing to them and presents only those rects with display.update(rects).
+Anything that moves the whole screen (shake, parallax, fades, scene changes)
+invalidates the frame and falls back to a full flip.
+"""
+import pygame
+
+from config.settings import DIRTY_RECT_FULL_RATIO
+
+
+class DirtyRectTracker:
+    def __init__(self, bounds, full_ratio=DIRTY_RECT_FULL_RATIO):
+        self.bounds = pygame.Rect(bounds)
+        self.full_ratio = full_ratio
+        self._current = []
+        self._previous = []
+        self._full = True  # Nothing on screen yet
+        self._scene = None
+        # Stats for debugging / benchmarks
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.skipped_frames = 0
+
+    def invalidate(self):
+        """Force the next frame to repaint and flip the whole screen."""
+        self._full = True
+
+    def set_scene(self, key):
+        """Invalidate whenever the static part of the screen changes (state, selection...)."""
+        if key != self._scene:
+            self._scene = key
+            self._full = True
+
+    def add(self, rect):
+        r = pygame.Rect(rect).clip(self.bounds)
+        if r.w > 0 and r.h > 0:
+            self._current.append(r)
+
+    def regions(self):
+        """
+        Rects to repaint this frame: None for a full repaint, [] if nothing changed.
+        Overlapping rects are merged so display.update gets a short list.
+        """
+        if self._full:
+            return None
+        merged = []
+        for r in self._current + self._previous:
+            r = r.copy()
+            # Absorb anything touching r until stable
+            i = 0
+            while i < len(merged):
+                if merged[i].colliderect(r):
+                    r.union_ip(merged.pop(i))
+                    i = 0
+                else:
+                    i += 1
+            merged.append(r)
+        area = sum(r.w * r.h for r in merged)
+        if area > self.full_ratio * self.bounds.w * self.bounds.h:
+            return None
+        return merged
+
+    def begin(self, surface, regions):
+        """Clip drawing on surface to the union of regions (no-op for full repaints)."""
+        if regions:
+            surface.set_clip(regions[0].unionall(regions[1:]))
+
+    def present(self, surface, regions):
+        """Show the frame and roll the current rects over to the next frame."""
+        surface.set_clip(None)
+        if regions is None:
+            pygame.display.flip()
+            self.full_frames += 1
+        elif regions:
+            pygame.display.update(regions)
+            self.partial_frames += 1
+        else:
+            self.skipped_frames += 1
+        self._previous = self._current
+        self._current = []
+        self._full = False
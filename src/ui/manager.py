@@ -1,17 +1,24 @@
 import pygame
 from config.settings import *
 from ui.pixel_sprites import get_pixel_font, PIXEL_SCALE, CHARACTER_DATA
+from ui.surface_registry import prepare, get_overlay, OPAQUE
+from ui.sprite_atlas import get_sprite
+from ui.transform_cache import cached_scale
 import os
 import math
 import random
 
 class GameUI:
+    # Peak height of the winner's jump on the game over screen
+    GAME_OVER_JUMP = 20
+
     def __init__(self):
-        self.font = get_pixel_font(24)
-        self.small_font = get_pixel_font(18)
-        self.tiny_font = get_pixel_font(12)
-        self.title_font = get_pixel_font(36)
-        self.welcome_font = get_pixel_font(32)
+        # Bitmap font pixel scales: every level of the type hierarchy is a distinct size
+        self.font = get_pixel_font(3)
+        self.small_font = get_pixel_font(2)
+        self.tiny_font = get_pixel_font(1)
+        self.title_font = get_pixel_font(5)
+        self.welcome_font = get_pixel_font(4)
         # Load original logo with circular frame
         logo_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'assets', 'images',
                                  'HAMIC_LOGO.png')
@@ -28,6 +35,13 @@ class GameUI:
         except Exception:
             self.logo = None
         
+        # Retained HUD layers: skill panel and {slot: (key, surface)} health bars
+        self._skill_panel = None
+        self._hud_layers = {}
+        # Character-select previews, built once (see _build_char_previews)
+        self._char_previews = None
+        self._text_cache = {}
+        
         # Animation state
         self._start_frame = 0
         self._start_active = False
@@ -38,18 +52,25 @@ class GameUI:
         self._start_active = True
 
     def draw(self, surface, p_health, p_max, b_health, b_max, player_name="PLAYER", bot_name="BOT", p_color=BLUE_PRIMARY, b_color=RED_PRIMARY):
-        # Draw Health Bars (pixel segmented style)
-        self._draw_health_bar(surface, 50, 50, p_health, p_max, player_name, p_color)
-        self._draw_health_bar(surface, WIDTH - 350, 50, b_health, b_max, bot_name, b_color)
+        # Retained-mode HUD: each layer is re-rendered only when what it shows changes
+        self._blit_health_bar(surface, "player", 50, 50, p_health, p_max, player_name, p_color)
+        self._blit_health_bar(surface, "bot", WIDTH - 350, 50, b_health, b_max, bot_name, b_color)
         
-        # Draw Skill Panel (Pixel art bottom bar)
+        # Static skill panel, pre-rendered once
+        if self._skill_panel is None:
+            self._skill_panel = prepare(self._render_skill_panel(), OPAQUE)
+        surface.blit(self._skill_panel, (0, HEIGHT - self._skill_panel.get_height()))
+
+    def _render_skill_panel(self):
+        """Draw the bottom skill tray (Pixel art bottom bar) onto its own surface."""
         panel_height = 60
-        panel_rect = pygame.Rect(0, HEIGHT - panel_height, WIDTH, panel_height)
+        panel = pygame.Surface((WIDTH, panel_height))
+        panel_rect = panel.get_rect()
         
         # Pixel border bottom tray
-        pygame.draw.rect(surface, (10, 10, 20), panel_rect)
+        pygame.draw.rect(panel, (10, 10, 20), panel_rect)
         # Top border line - Optimized with single rect
-        pygame.draw.rect(surface, ACCENT_COLOR, (0, panel_rect.y, WIDTH, PIXEL_SCALE))
+        pygame.draw.rect(panel, ACCENT_COLOR, (0, panel_rect.y, WIDTH, PIXEL_SCALE))
         
         # Skill labels
         skills = [
@@ -68,14 +89,30 @@ class GameUI:
             # Background slot - evenly spaced
             slot_x = margin + i * (slot_width + margin)
             slot = pygame.Rect(slot_x, slot_y, slot_width, slot_height)
-            pygame.draw.rect(surface, (30, 30, 45), slot)
-            pygame.draw.rect(surface, (60, 60, 80), slot, 1)
+            pygame.draw.rect(panel, (30, 30, 45), slot)
+            pygame.draw.rect(panel, (60, 60, 80), slot, 1)
 
             # Render text and center it within the slot
             txt = self.small_font.render(f"{gesture} {name}", True, color)
             tx = slot_x + (slot_width - txt.get_width()) // 2
             ty = slot_y + (slot_height - txt.get_height()) // 2
-            surface.blit(txt, (tx, ty))
+            panel.blit(txt, (tx, ty))
+        return panel
+
+    def _blit_health_bar(self, surface, slot, x, y, val, max_val, label, primary_color):
+        """Blit a cached health bar layer, re-rendering it only when its key changes."""
+        pct = max(0, min(1.0, val / max_val))
+        # Key on what is actually visible: filled pixels, shown percentage, label, color
+        key = (int(pct * HEALTH_BAR_WIDTH), int(pct * 100), label, primary_color)
+        cached = self._hud_layers.get(slot)
+        if cached is None or cached[0] != key:
+            label_h = 22
+            w = max(HEALTH_BAR_WIDTH + 4, self.small_font.size(label)[0] + 2)
+            layer = pygame.Surface((w, label_h + HEALTH_BAR_HEIGHT + 2), pygame.SRCALPHA)
+            self._draw_health_bar(layer, 2, label_h, val, max_val, label, primary_color)
+            cached = (key, prepare(layer))
+            self._hud_layers[slot] = cached
+        surface.blit(cached[1], (x - 2, y - 22))
 
     def _decode_text(self, surface, text, font, color, cx, cy, progress, f):
         """Render text with decode effect. progress: 0.0 to 1.0 = how many chars are decoded."""
@@ -109,11 +146,14 @@ class GameUI:
             else:
                 # Glitch color — dimmer, greenish tint
                 char_color = (60, 180, 80)
-            char_surf = font.render(ch, True, char_color)
-            surface.blit(char_surf, (x, cy - char_surf.get_height() // 2))
+            # Cached glyph blit from the font's atlas
+            font.draw(surface, ch, (x, cy - font.get_height() // 2), char_color)
             x += font.size(text[i])[0]
 
     def draw_start_screen(self, surface):
+        # Build the select-screen previews while the (static) start screen is up
+        if self._char_previews is None:
+            self._build_char_previews()
         self._rect_overlay(surface)
         
         # ── Logo ──
@@ -122,38 +162,73 @@ class GameUI:
             surface.blit(self.logo, logo_rect)
         
         # ── "WELCOME TO" ──
-        txt_1 = self.welcome_font.render("WELCOME TO", True, RED_PRIMARY)
-        rect_1 = txt_1.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 5))
+        txt_1 = self._text(self.welcome_font, "WELCOME TO", RED_PRIMARY)
+        rect_1 = txt_1.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 15))
         surface.blit(txt_1, rect_1)
         
         # ── "MAGIC FIGHTING GAME" ──
-        txt_2 = self.title_font.render("MAGIC FIGHTING GAME", True, ACCENT_COLOR)
+        txt_2 = self._text(self.title_font, "MAGIC FIGHTING GAME", ACCENT_COLOR)
         rect_2 = txt_2.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 30))
         surface.blit(txt_2, rect_2)
         
         # ── "Press 'S' to Start" ──
-        inst = self.font.render("Press 'S' to Start", True, TEXT_COLOR)
+        inst = self._text(self.font, "Press 'S' to Start", TEXT_COLOR)
         inst_rect = inst.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 80))
         surface.blit(inst, inst_rect)
         
         # ── Controls ──
-        ctrls = self.small_font.render("Draw spells with hand | Pinch to cast", True, (120, 120, 150))
+        ctrls = self._text(self.small_font, "Draw spells with hand | Pinch to cast", (120, 120, 150))
         ctrls_rect = ctrls.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 120))
         surface.blit(ctrls, ctrls_rect)
 
+    def _text(self, font, text, color):
+        """Static screen text, rendered once per (font, text, color) and reused."""
+        key = (font, text, color)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            surf = prepare(font.render(text, True, color))
+            self._text_cache[key] = surf
+        return surf
+
+    def _build_char_previews(self):
+        """Pre-render the select screen: 2x sprites, name/description labels and the glow box."""
+        num_chars = len(CHARACTER_DATA)
+        slot_w = WIDTH // num_chars  # 160px per slot at 800px
+        box_w, box_h = slot_w - 16, 200
+        previews = []
+        for char in CHARACTER_DATA:
+            # Character sprite (scaled up 2x for visibility)
+            sprite = get_sprite(f"hero/{char['name']}/base", char["create"])
+            big_sprite = pygame.transform.scale(sprite, 
+                (sprite.get_width() * 2, sprite.get_height() * 2))
+            # Inner glow
+            glow = pygame.Surface((box_w, box_h), pygame.SRCALPHA)
+            glow.fill((*char["color"], 30))
+            previews.append({
+                "sprite": prepare(big_sprite),
+                "name": prepare(self.font.render(char["name"], True, (150, 150, 170))),
+                "name_selected": prepare(self.font.render(char["name"], True, char["color"])),
+                "desc": prepare(self.tiny_font.render(char["desc"], True, TEXT_COLOR)),
+                "glow": prepare(glow),
+            })
+        self._char_previews = previews
+        self._char_select_title = prepare(self.title_font.render("CHOOSE YOUR HERO", True, ACCENT_COLOR))
+        self._char_select_inst = prepare(self.small_font.render("< >  to select  |  ENTER to confirm", True, (120, 120, 150)))
+
     def draw_char_select_screen(self, surface, selected_idx):
-        """Draw character selection screen."""
+        """Draw character selection screen from the cached previews."""
+        if self._char_previews is None:
+            self._build_char_previews()
         self._rect_overlay(surface)
         
         # Title
-        title = self.title_font.render("CHOOSE YOUR HERO", True, ACCENT_COLOR)
-        title_rect = title.get_rect(center=(WIDTH // 2, 60))
-        surface.blit(title, title_rect)
+        title_rect = self._char_select_title.get_rect(center=(WIDTH // 2, 60))
+        surface.blit(self._char_select_title, title_rect)
         
         num_chars = len(CHARACTER_DATA)
         slot_w = WIDTH // num_chars  # 160px per slot at 800px
         
-        for i, char in enumerate(CHARACTER_DATA):
+        for i, (char, preview) in enumerate(zip(CHARACTER_DATA, self._char_previews)):
             cx = slot_w * i + slot_w // 2
             cy = HEIGHT // 2 - 20
             
@@ -167,60 +242,39 @@ class GameUI:
                 pulse = int(128 + 127 * math.sin(pygame.time.get_ticks() * 0.005))
                 border_color = (*char["color"][:2], pulse)
                 pygame.draw.rect(surface, char["color"], box_rect, 3)
-                # Inner glow
-                glow = pygame.Surface((box_w, box_h), pygame.SRCALPHA)
-                glow.fill((*char["color"], 30))
-                surface.blit(glow, box_rect)
+                surface.blit(preview["glow"], box_rect)
             
-            # Character sprite (scaled up 2x for visibility)
-            sprite = char["create"]()
-            big_sprite = pygame.transform.scale(sprite, 
-                (sprite.get_width() * 2, sprite.get_height() * 2))
-            sprite_rect = big_sprite.get_rect(center=(cx, cy))
-            surface.blit(big_sprite, sprite_rect)
+            sprite_rect = preview["sprite"].get_rect(center=(cx, cy))
+            surface.blit(preview["sprite"], sprite_rect)
             
             # Character name
-            name_color = char["color"] if is_selected else (150, 150, 170)
-            name_txt = self.font.render(char["name"], True, name_color)
+            name_txt = preview["name_selected"] if is_selected else preview["name"]
             name_rect = name_txt.get_rect(center=(cx, cy + 80))
             surface.blit(name_txt, name_rect)
             
             # Description (only for selected, smaller font)
             if is_selected:
-                desc_txt = self.tiny_font.render(char["desc"], True, TEXT_COLOR)
-                desc_rect = desc_txt.get_rect(center=(cx, cy + 100))
-                surface.blit(desc_txt, desc_rect)
+                desc_rect = preview["desc"].get_rect(center=(cx, cy + 100))
+                surface.blit(preview["desc"], desc_rect)
         
         # Instructions
-        inst = self.small_font.render("< >  to select  |  ENTER to confirm", True, (120, 120, 150))
-        inst_rect = inst.get_rect(center=(WIDTH // 2, HEIGHT - 40))
-        surface.blit(inst, inst_rect)
+        inst_rect = self._char_select_inst.get_rect(center=(WIDTH // 2, HEIGHT - 40))
+        surface.blit(self._char_select_inst, inst_rect)
 
     def draw_game_over_screen(self, surface, winner, char_data=None, char_sprite=None, victim_sprite=None):
         self._rect_overlay(surface)
         
-        import math
         t = pygame.time.get_ticks()
-        cx = WIDTH // 2   # Center X of screen
-        cy = HEIGHT // 2  # Center Y of screen
-        
-        # ── Layout: evenly spaced vertically from center ──
-        # Characters at top, then title, feat line, sub text, restart button
-        title_y = cy - 30          # Main title (YOU WIN! / Monster Wins!)
-        feat_y = cy + 20           # FEAT: name
-        sub_y = cy + 55            # Sub text (SAVED/DARKNESS)
-        restart_y = cy + 100       # Press S to Restart
-        char_y_base = title_y - 30 # Character bottom = above title
+        layout = self._game_over_layout()
+        cx, title_y = layout["cx"], layout["title_y"]
         
         # ── 1) Jumping winner (centered above title) ──
         if char_sprite:
             s_w, s_h = char_sprite.get_size()
-            scaled_winner = pygame.transform.scale(char_sprite, (s_w * 2, s_h * 2))
+            scaled_winner = cached_scale(char_sprite, (s_w * 2, s_h * 2))
             
-            jump = int(abs(math.sin(t * 0.01) * 20))
-            winner_x = cx - (s_w * 2) // 2  # Centered horizontal
-            winner_y = char_y_base - (s_h * 2) - jump
-            surface.blit(scaled_winner, (winner_x, winner_y))
+            jump = int(abs(math.sin(t * 0.01) * self.GAME_OVER_JUMP))
+            surface.blit(scaled_winner, self._winner_rect(char_sprite, layout, jump))
         
         # ── 2) Title text (centered) ──
         if winner == "Player":
@@ -233,39 +287,74 @@ class GameUI:
             color = (255, 50, 50)
         
         # Report Line (Smaller, above title)
-        rep = self.small_font.render(report_text, True, (150, 150, 150))
-        rep_rect = rep.get_rect(center=(cx, title_y - 25))
+        rep = self._text(self.small_font, report_text, (150, 150, 150))
+        rep_rect = rep.get_rect(center=(cx, title_y - 30))
         surface.blit(rep, rep_rect)
         
-        res = self.title_font.render(result_text, True, color)
+        res = self._text(self.title_font, result_text, color)
         res_rect = res.get_rect(center=(cx, title_y))
         surface.blit(res, res_rect)
         
         # ── 3) Feat name (centered) ──
         if char_data:
             display_name = char_data['name'] if isinstance(char_data, dict) else str(char_data)
-            name_txt = self.welcome_font.render(f"FEAT: {display_name}", True, TEXT_COLOR)
-            name_rect = name_txt.get_rect(center=(cx, feat_y))
+            name_txt = self._text(self.welcome_font, f"FEAT: {display_name}", TEXT_COLOR)
+            name_rect = name_txt.get_rect(center=(cx, layout["feat_y"]))
             surface.blit(name_txt, name_rect)
             
             sub_text = "THE WORLD IS SAVED!" if winner == "Player" else "THE WORLD IS IN DARKNESS!"
             sub_color = (150, 200, 255) if winner == "Player" else (200, 100, 100)
-            desc_txt = self.small_font.render(sub_text, True, sub_color)
-            desc_rect = desc_txt.get_rect(center=(cx, sub_y))
+            desc_txt = self._text(self.small_font, sub_text, sub_color)
+            desc_rect = desc_txt.get_rect(center=(cx, layout["sub_y"]))
             surface.blit(desc_txt, desc_rect)
         
         # ── 4) Restart options (centered) ──
-        replay_prompt = self.font.render("WANT TO REPLAY?", True, ACCENT_COLOR)
-        replay_rect = replay_prompt.get_rect(center=(cx, restart_y - 20))
+        replay_prompt = self._text(self.font, "WANT TO REPLAY?", ACCENT_COLOR)
+        replay_rect = replay_prompt.get_rect(center=(cx, layout["restart_y"] - 20))
         surface.blit(replay_prompt, replay_rect)
         
-        retry = self.small_font.render("Press 'R' to Rematch | 'S' for Menu", True, TEXT_COLOR)
-        retry_rect = retry.get_rect(center=(cx, restart_y + 10))
+        retry = self._text(self.small_font, "Press 'R' to Rematch | 'S' for Menu", TEXT_COLOR)
+        retry_rect = retry.get_rect(center=(cx, layout["restart_y"] + 10))
         surface.blit(retry, retry_rect)
 
+    def game_over_dirty_rect(self, char_sprite):
+        """Screen area touched by the jumping winner on the game over screen."""
+        if not char_sprite:
+            return pygame.Rect(0, 0, 0, 0)
+        layout = self._game_over_layout()
+        # Union of the lowest and highest points of the jump
+        rest = self._winner_rect(char_sprite, layout, 0)
+        return rest.union(self._winner_rect(char_sprite, layout, self.GAME_OVER_JUMP))
+
+    @staticmethod
+    def _game_over_layout():
+        """
+        Game over screen rows, evenly spaced vertically from the center:
+        characters at top, then title, feat line, sub text, restart button.
+        """
+        cx = WIDTH // 2   # Center X of screen
+        cy = HEIGHT // 2  # Center Y of screen
+        title_y = cy - 20              # Main title (YOU WIN! / Monster Wins!)
+        return {
+            "cx": cx,
+            "title_y": title_y,
+            "feat_y": cy + 24,         # FEAT: name
+            "sub_y": cy + 55,          # Sub text (SAVED/DARKNESS)
+            "restart_y": cy + 100,     # Press S to Restart
+            "char_y_base": title_y - 40,  # Character bottom = above the report line
+        }
+
+    @staticmethod
+    def _winner_rect(char_sprite, layout, jump):
+        """Where the 2x winner sprite is drawn, `jump` pixels above its resting place."""
+        s_w, s_h = char_sprite.get_size()
+        return pygame.Rect(layout["cx"] - (s_w * 2) // 2,  # Centered horizontal
+                           layout["char_y_base"] - (s_h * 2) - jump, s_w * 2, s_h * 2)
+
     def _rect_overlay(self, surface):
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
+        # Shared preallocated dim surface; surface alpha instead of a fresh SRCALPHA fill
+        overlay = get_overlay((WIDTH, HEIGHT))
+        overlay.set_alpha(180)
         surface.blit(overlay, (0, 0))
 
     def _draw_health_bar(self, surface, x, y, val, max_val, label, primary_color):
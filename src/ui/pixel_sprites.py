@@ -3,8 +3,13 @@ Pixel Art Sprite Generator for Magic Fighting Game.
 All sprites are generated programmatically from small pixel grids,
 then scaled up for a crisp retro look.
 """
+import weakref
+
 import pygame
 
+from ui.surface_registry import prepare, register_cache
+from ui.bitmap_font import BitmapFont
+
 # ── Scale ──
 PIXEL_SCALE = 3  # Each "pixel" in the grid becomes 3x3 on screen
 
@@ -69,10 +74,83 @@ def _grid_to_surface_alpha(grid, scale=PIXEL_SCALE):
     return surf
 
 
+# ═══════════════════════════════════════════
+#  PALETTE-INDEXED SPRITES (8-bit)
+# ═══════════════════════════════════════════
+KEY_COLOR = (255, 0, 255)  # Palette slot 0 = transparent colorkey, never used in art
+
+
+class IndexedSprite:
+    """
+    One 8-bit index buffer per sprite shape plus its base palette.
+    Grid cells may hold an (R,G,B) color or a slot name (str) that is
+    filled in at render time, so recolored sprites are palette swaps.
+    """
+    def __init__(self, grid, scale=PIXEL_SCALE):
+        h = len(grid)
+        w = len(grid[0]) if h > 0 else 0
+        self.slots = {}
+        palette = [KEY_COLOR]
+        self.indices = pygame.Surface((w * scale, h * scale), depth=8)
+        for y, row in enumerate(grid):
+            for x, cell in enumerate(row):
+                if cell is None:
+                    continue
+                if cell not in self.slots:
+                    self.slots[cell] = len(palette)
+                    palette.append(cell if isinstance(cell, tuple) else (0, 0, 0))
+                self.indices.fill(self.slots[cell], (x * scale, y * scale, scale, scale))
+        if len(palette) > 256:
+            raise ValueError("IndexedSprite supports at most 255 colors")
+        self.palette = palette + [(0, 0, 0)] * (256 - len(palette))
+        self.indices.set_palette(self.palette)
+        self.indices.set_colorkey(KEY_COLOR)
+        self._renders = {}
+
+    def render(self, colors=None):
+        """
+        Return the sprite with named slots filled from `colors`.
+        Results are cached per palette and shared; treat them as read-only.
+        """
+        key = tuple(sorted(colors.items())) if colors else ()
+        surf = self._renders.get(key)
+        if surf is None:
+            palette = list(self.palette)
+            for name, color in (colors or {}).items():
+                palette[self.slots[name]] = color
+            surf = self.indices.copy()
+            surf.set_palette(palette)
+            self._renders[key] = surf
+        return surf
+
+
+_indexed_shapes = {}
+
+def _indexed_shape(key, build_grid, scale=PIXEL_SCALE):
+    """Build (once) and return the IndexedSprite for a grid template."""
+    if key not in _indexed_shapes:
+        _indexed_shapes[key] = IndexedSprite(build_grid(), scale)
+    return _indexed_shapes[key]
+
+
+def _recolor_palette(surface, fn):
+    """Copy an 8-bit sprite, mapping every color slot (except the colorkey) through fn."""
+    result = surface.copy()
+    # Only remap the slots the sprite actually uses (set_palette accepts a partial palette)
+    used = int(pygame.surfarray.pixels2d(result).max()) + 1
+    palette = surface.get_palette()[:used]
+    result.set_palette([palette[0]] + [fn(c) for c in palette[1:]])
+    return result
+
+
 # ═══════════════════════════════════════════
 #  PLAYER WIZARD SPRITE (16 wide x 22 tall)
 # ═══════════════════════════════════════════
 def create_player_sprite():
+    return _indexed_shape("wizard", _player_grid).render()
+
+
+def _player_grid():
     _ = T
     S = P_SKIN
     R = P_ROBE
@@ -116,13 +194,17 @@ def create_player_sprite():
         [St,St,_,_,_,_,_,_,_,_,_,_,_,_,St,St],
         [ G, G,_,_,_,_,_,_,_,_,_,_,_,_, G, G],
     ]
-    return _grid_to_surface(grid)
+    return grid
 
 
 # ═══════════════════════════════════════════
 #  BOT (DARK KNIGHT) SPRITE (16 wide x 22 tall)
 # ═══════════════════════════════════════════
 def create_bot_sprite():
+    return _indexed_shape("dark_knight", _bot_grid).render()
+
+
+def _bot_grid():
     _ = T
     A = B_ARMOR
     L = B_ARMOR_LT
@@ -162,7 +244,7 @@ def create_bot_sprite():
         [_,_,_,_,_,_,_,_,_,_,_,_,_,_,_,_],
         [_,_,_,_,_,_,_,_,_,_,_,_,_,_,_,_],
     ]
-    return _grid_to_surface(grid)
+    return grid
 
 
 # ═══════════════════════════════════════════
@@ -262,7 +344,7 @@ def create_block_spell():
 # ═══════════════════════════════════════════
 #  ICE OVERLAY (for frozen state)
 # ═══════════════════════════════════════════
-_ice_overlay_cache = {}
+_ice_overlay_cache = register_cache({})
 
 def create_ice_overlay(width, height):
     """Pixel art ice overlay with transparency. Cached by (width, height)."""
@@ -286,6 +368,7 @@ def create_ice_overlay(width, height):
         if i < width and i < height:
             pygame.draw.rect(surf, (255, 255, 255, 150), (i, i, PIXEL_SCALE, PIXEL_SCALE))
             
+    surf = prepare(surf)
     _ice_overlay_cache[key] = surf
     return surf
 
@@ -293,7 +376,7 @@ def create_ice_overlay(width, height):
 # ═══════════════════════════════════════════
 #  SHIELD OVERLAY (for block state)
 # ═══════════════════════════════════════════
-_shield_overlay_cache = {}
+_shield_overlay_cache = register_cache({})
 
 def create_shield_overlay(width, height):
     """Pixel art shield border. Cached by (width, height)."""
@@ -313,6 +396,7 @@ def create_shield_overlay(width, height):
         pygame.draw.rect(surf, c, (0, y, ps, ps))
         pygame.draw.rect(surf, c, (width - ps, y, ps, ps))
         
+    surf = prepare(surf)
     _shield_overlay_cache[key] = surf
     return surf
 
@@ -332,6 +416,11 @@ def tint_surface(surface, color):
 
 def create_tinted_variant(base_surface, color, intensity=80):
     """Create a tinted version by blending color over the original."""
+    if base_surface.get_bitsize() == 8:
+        # Indexed sprite: blend the palette, not the pixels
+        a = intensity
+        return _recolor_palette(base_surface, lambda c: tuple(
+            (c[i] * (255 - a) + color[i] * a) // 255 for i in range(3)))
     result = base_surface.copy()
     overlay = pygame.Surface(result.get_size(), pygame.SRCALPHA)
     overlay.fill((*color, intensity))
@@ -340,17 +429,53 @@ def create_tinted_variant(base_surface, color, intensity=80):
 
 
 def create_white_flash(surface):
-    """Create a white-flash version of a sprite."""
-    w, h = surface.get_size()
-    flash = pygame.Surface((w, h), pygame.SRCALPHA)
-    for y in range(h):
-        for x in range(w):
-            r, g, b, a = surface.get_at((x, y))
-            if a > 0:
-                flash.set_at((x, y), (255, 255, 255, a))
+    """Create a white-flash version of a sprite (alpha preserved)."""
+    if surface.get_bitsize() == 8:
+        return _recolor_palette(surface, lambda c: (255, 255, 255))
+    flash = surface.copy()
+    # Whiten every visible pixel through a numpy view instead of get_at/set_at
+    rgb = pygame.surfarray.pixels3d(flash)
+    rgb[pygame.surfarray.pixels_alpha(surface) > 0] = 255
+    del rgb  # Release the surface lock
     return flash
 
 
+def create_sprite_variants(base_surface, flip=False):
+    """
+    Build (base, hurt, freeze, burn) sprites in one pass.
+    The base is flipped once up front; every variant is derived from the
+    flipped copy, since whitening and tinting are per-pixel and commute with flip.
+    """
+    base = pygame.transform.flip(base_surface, True, False) if flip else base_surface
+    return (
+        base,
+        create_white_flash(base),
+        create_tinted_variant(base, (100, 200, 255), 100),
+        create_tinted_variant(base, (255, 100, 0), 80),
+    )
+
+
+# ═══════════════════════════════════════════
+#  LOGICAL-RESOLUTION SPRITES (1 art pixel = 1 screen pixel)
+# ═══════════════════════════════════════════
+_logical_cache = weakref.WeakKeyDictionary()
+
+def to_logical(surface, scale=PIXEL_SCALE):
+    """
+    Unscaled copy of a PIXEL_SCALE sprite for the low-res framebuffer.
+    Every art pixel is a scale x scale block, so a nearest-neighbour
+    downscale is exact. Cached per source surface.
+    """
+    if scale == 1:
+        return surface
+    small = _logical_cache.get(surface)
+    if small is None:
+        w, h = surface.get_size()
+        small = pygame.transform.scale(surface, (max(1, w // scale), max(1, h // scale)))
+        _logical_cache[surface] = small
+    return small
+
+
 # ═══════════════════════════════════════════
 #  FLOOR TILE (16x16 pixel grid)
 # ═══════════════════════════════════════════
@@ -394,15 +519,15 @@ def create_pixel_star(brightness=255):
 # ═══════════════════════════════════════════
 _pixel_font_cache = {}
 
-def get_pixel_font(size=16):
-    """Get a small pixel-like font. Falls back to system font if no pixel font available."""
-    if size not in _pixel_font_cache:
-        # Use a small system font rendered crisply
-        try:
-            _pixel_font_cache[size] = pygame.font.SysFont("Courier New", size, bold=True)
-        except Exception:
-            _pixel_font_cache[size] = pygame.font.SysFont(None, size, bold=True)
-    return _pixel_font_cache[size]
+def get_pixel_font(scale=2):
+    """
+    Get the bundled bitmap pixel font at an integer pixel scale: glyphs are
+    8 * scale px tall and advance 6 * scale px (1 tiny, 2 small, 3 body,
+    4-5 titles).
+    """
+    if scale not in _pixel_font_cache:
+        _pixel_font_cache[scale] = BitmapFont(scale)
+    return _pixel_font_cache[scale]
 
 
 # ═══════════════════════════════════════════
@@ -493,16 +618,16 @@ def create_logo_sprite(diameter=120):
         pygame.draw.rect(surf, NAVY, (ax, ay, ps, ps))
 
     # ── 5) "A+" text (bottom-left) ──
-    a_font = get_pixel_font(18)
+    a_font = get_pixel_font(2)
     a_surf = a_font.render("A", True, RED)
     surf.blit(a_surf, (cx - 28, cy + 8))
     # Small "+" 
-    plus_font = get_pixel_font(12)
+    plus_font = get_pixel_font(1)
     plus_surf = plus_font.render("+", True, RED)
     surf.blit(plus_surf, (cx - 16, cy + 5))
 
     # ── 6) "$" text (bottom-right) ──
-    d_font = get_pixel_font(20)
+    d_font = get_pixel_font(2)
     d_surf = d_font.render("$", True, GOLD)
     surf.blit(d_surf, (cx + 10, cy + 6))
 
@@ -515,11 +640,19 @@ def create_logo_sprite(diameter=120):
 
 def _make_male_knight(armor, armor_lt, armor_dk, helm, visor, eye, plume=None):
     """Template for male knight sprite (16x22). Helmet + full armor."""
+    return _indexed_shape("male_knight", _male_knight_grid).render({
+        "armor": armor, "armor_lt": armor_lt, "armor_dk": armor_dk,
+        "helm": helm, "visor": visor, "eye": eye,
+        "plume": plume if plume else helm,  # Plume on helmet
+    })
+
+
+def _male_knight_grid():
     _ = T
     S = (220, 180, 140)  # Skin
-    A = armor; L = armor_lt; D = armor_dk
-    H = helm; V = visor; E = eye
-    P = plume if plume else H  # Plume on helmet
+    A = "armor"; L = "armor_lt"; D = "armor_dk"
+    H = "helm"; V = "visor"; E = "eye"
+    P = "plume"
     grid = [
         [_,_,_,_,_,_, P,_,_, P,_,_,_,_,_,_],
         [_,_,_,_,_, H, H, H, H, H, H,_,_,_,_,_],
@@ -544,15 +677,22 @@ def _make_male_knight(armor, armor_lt, armor_dk, helm, visor, eye, plume=None):
         [_,_,_,_,_,_,_,_,_,_,_,_,_,_,_,_],
         [_,_,_,_,_,_,_,_,_,_,_,_,_,_,_,_],
     ]
-    return _grid_to_surface(grid)
+    return grid
 
 
 def _make_female_knight(armor, armor_lt, armor_dk, hair, eye):
     """Template for female knight sprite (16x22). Hair + armor."""
+    return _indexed_shape("female_knight", _female_knight_grid).render({
+        "armor": armor, "armor_lt": armor_lt, "armor_dk": armor_dk,
+        "hair": hair, "eye": eye,
+    })
+
+
+def _female_knight_grid():
     _ = T
     S = (245, 210, 175)  # Skin
-    A = armor; L = armor_lt; D = armor_dk
-    Hr = hair; E = eye
+    A = "armor"; L = "armor_lt"; D = "armor_dk"
+    Hr = "hair"; E = "eye"
     grid = [
         [_,_,_,_,_,_,Hr,Hr,Hr,_,_,_,_,_,_,_],
         [_,_,_,_,_,Hr,Hr,Hr,Hr,Hr,_,_,_,_,_,_],
@@ -577,7 +717,7 @@ def _make_female_knight(armor, armor_lt, armor_dk, hair, eye):
         [_,_,_,_,_,_,_,_,_,_,_,_,_,_,_,_],
         [_,_,_,_,_,_,_,_,_,_,_,_,_,_,_,_],
     ]
-    return _grid_to_surface(grid)
+    return grid
 
 
 def create_char_hector():
@@ -624,12 +764,16 @@ def create_char_ivy():
 # ═══════════════════════════════════════════
 def create_victim_sprite(color, gender="female"):
     """Create a small face sprite for a victim peeking from a castle window."""
+    shape = _indexed_shape(("victim_face", gender), lambda: _victim_face_grid(gender))
+    return shape.render({"outfit": tuple(color)})
+
+
+def _victim_face_grid(gender):
     _ = T
     S = (250, 225, 200)  # skin
     E = (50, 50, 80)     # eyes
     M = (200, 80, 80)    # mouth/lips
-    r, g, b = color
-    R = (r, g, b)        # outfit/collar color
+    R = "outfit"         # outfit/collar color
 
     if gender == "female":
         Hr = (180, 100, 50)  # brown-red long hair
@@ -655,7 +799,7 @@ def create_victim_sprite(color, gender="female"):
             [_,_, R, R, R, R,_,_],
             [_,_, R, R, R, R,_,_],
         ]
-    return _grid_to_surface(grid)
+    return grid
 
 
 # ═══════════════════════════════════════════
@@ -663,13 +807,22 @@ def create_victim_sprite(color, gender="female"):
 # ═══════════════════════════════════════════
 def create_victim_body_sprite(color, gender="female"):
     """Create a full-body victim sprite for the celebration scene."""
+    r, g, b = color
+    shape = _indexed_shape(("victim_body", gender), lambda: _victim_body_grid(gender))
+    return shape.render({
+        "outfit": (r, g, b),
+        "outfit_lt": (min(255, r+40), min(255, g+40), min(255, b+40)),
+        "outfit_dk": (max(0, r-40), max(0, g-40), max(0, b-40)),
+    })
+
+
+def _victim_body_grid(gender):
     _ = T
     S = (250, 225, 200)  # skin
     E = (50, 50, 80)     # eyes
-    r, g, b = color
-    R = (r, g, b)
-    L = (min(255, r+40), min(255, g+40), min(255, b+40))
-    D = (max(0, r-40), max(0, g-40), max(0, b-40))
+    R = "outfit"
+    L = "outfit_lt"
+    D = "outfit_dk"
 
     if gender == "female":
         Hr = (180, 100, 50)
@@ -723,7 +876,7 @@ def create_victim_body_sprite(color, gender="female"):
             [_,_,_,_,_,_,_,_,_,_,_,_,_,_,_,_],
             [_,_,_,_,_,_,_,_,_,_,_,_,_,_,_,_],
         ]
-    return _grid_to_surface(grid)
+    return grid
 
 
 # ═══════════════════════════════════════════
@@ -731,7 +884,6 @@ def create_victim_body_sprite(color, gender="female"):
 # ═══════════════════════════════════════════
 def create_monster_sprite(base_color=None):
     """A scary monster. Optionally tinted with a base_color."""
-    _ = T
     if base_color is None:
         G1 = (30, 80, 20)   # Dark green
         G2 = (50, 150, 40)  # Mid green
@@ -741,7 +893,12 @@ def create_monster_sprite(base_color=None):
         G2 = (r, g, b)
         G1 = (max(0, r-40), max(0, g-40), max(0, b-40))
         G3 = (min(255, r+50), min(255, g+50), min(255, b+70))
+    return _indexed_shape("monster", _monster_grid).render({"dark": G1, "mid": G2, "light": G3})
 
+
+def _monster_grid():
+    _ = T
+    G1, G2, G3 = "dark", "mid", "light"
     S = (200, 180, 140) # Horn/Bone color
     E = (255, 50, 0)    # Red eyes
     B = (0, 0, 0)       # Pupil
@@ -776,7 +933,7 @@ def create_monster_sprite(base_color=None):
         [_,_,_,_,_,_,_,_,_,_,_,_,_,_,_,_],
         [_,_,_,_,_,_,_,_,_,_,_,_,_,_,_,_],
     ]
-    return _grid_to_surface(grid)
+    return grid
 
 
 # ═══════════════════════════════════════════
@@ -0,0 +1,286 @@
+"""
+Persistent sprite atlas.
+Every procedurally generated sprite (and its hurt/freeze/burn variants) is
+baked once into PNG pages plus a JSON index under SPRITE_ATLAS_DIR.
+The cache key combines ATLAS_VERSION with a hash of the sprite sources, so
+editing pixel_sprites.py (or the bitmap font) re-bakes automatically on the next launch.
+At startup the pages are loaded once and sprites are sliced as subsurfaces.
+
+Full-color sprites (spells, overlays, floor, logo, cage) share an RGBA page.
+Palette-indexed sprites are stored 8-bit: the indexed page holds each
+distinct index buffer once, and every sprite drawn from it (a character's
+variants, recolored opponents and victims) is that buffer with its own
+palette from the JSON index, converted to the display format on first use.
+"""
+import glob
+import hashlib
+import json
+import os
+import tempfile
+
+import pygame
+
+from config.iconfig import SPRITE_ATLAS_DIR
+from config.settings import ENTITY_WIDTH, ENTITY_HEIGHT, PLAYER_ICE_PAD, OVERLAY_PAD
+from ui import bitmap_font, pixel_sprites as ps
+from ui.surface_registry import prepare, register_hook, is_display_format
+
+ATLAS_VERSION = 2
+ATLAS_WIDTH = 512
+PADDING = 1  # Transparent gutter so scaled sprites never sample a neighbour
+
+VARIANT_NAMES = ("base", "hurt", "freeze", "burn")
+
+# Overlay sizes used by Player (ice: rect + PLAYER_ICE_PAD) and Bot / shields (rect + OVERLAY_PAD)
+_OVERLAY_SIZES = [(ENTITY_WIDTH + pad, ENTITY_HEIGHT + pad) for pad in (PLAYER_ICE_PAD, OVERLAY_PAD)]
+
+# Spell sprite builders, keyed by spell type
+SPELL_SPRITES = {
+    "/": ("bullet", ps.create_bullet_spell),
+    "\\": ("bomb", ps.create_bomb_spell),
+    "O": ("ice", ps.create_ice_spell),
+    "|": ("block", ps.create_block_spell),
+    None: ("normal", ps.create_normal_spell),
+}
+
+
+def atlas_key():
+    """Versioned cache key: changes whenever the sprite sources (or entity sizes) change."""
+    h = hashlib.sha1()
+    for module_file in (ps.__file__, bitmap_font.__file__, __file__):
+        with open(module_file, "rb") as f:
+            h.update(f.read())
+    h.update(repr(_OVERLAY_SIZES).encode())
+    return f"v{ATLAS_VERSION}-{h.hexdigest()[:12]}"
+
+
+def _add_variants(table, name, base, flip=False):
+    for variant, surf in zip(VARIANT_NAMES, ps.create_sprite_variants(base, flip=flip)):
+        table[f"{name}/{variant}"] = surf
+
+
+def build_sprite_table():
+    """Generate every sprite the game uses, keyed by atlas name."""
+    table = {}
+    _add_variants(table, "wizard", ps.create_player_sprite())
+    _add_variants(table, "dark_knight", ps.create_bot_sprite(), flip=True)
+    for char in ps.CHARACTER_DATA:
+        name = char["name"]
+        _add_variants(table, f"hero/{name}", char["create"]())
+        _add_variants(table, f"opponent/{name}", char["opponent_create"](char["opponent_color"]), flip=True)
+        table[f"victim/{name}"] = ps.create_victim_sprite(char["victim_color"], char["victim_gender"])
+        table[f"victim_body/{name}"] = ps.create_victim_body_sprite(char["victim_color"], char["victim_gender"])
+    for spell_name, create in SPELL_SPRITES.values():
+        sprite = create()
+        table[f"spell/{spell_name}"] = sprite
+        table[f"spell/{spell_name}/flip"] = pygame.transform.flip(sprite, True, False)
+    for w, h in _OVERLAY_SIZES:
+        table[f"overlay/ice/{w}x{h}"] = ps.create_ice_overlay(w, h)
+        table[f"overlay/shield/{w}x{h}"] = ps.create_shield_overlay(w, h)
+    table["floor"] = ps.create_floor_tile()
+    table["cage"] = ps.create_iron_cage_sprite()
+    table["logo"] = ps.create_logo_sprite()
+    return table
+
+
+def _pack(sizes):
+    """Shelf-pack (name, w, h) tuples. Returns ({name: (x, y, w, h)}, page height)."""
+    rects = {}
+    x = y = shelf_h = 0
+    for name, w, h in sorted(sizes, key=lambda s: (-s[2], -s[1], s[0])):
+        if x + w + PADDING > ATLAS_WIDTH:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        rects[name] = (x, y, w, h)
+        x += w + PADDING
+        shelf_h = max(shelf_h, h + PADDING)
+    return rects, y + shelf_h
+
+
+def _used_palette(surf):
+    """The palette slots an 8-bit sprite actually uses, as JSON-friendly lists."""
+    used = int(pygame.surfarray.pixels2d(surf).max()) + 1
+    return [list(color[:3]) for color in surf.get_palette()[:used]]
+
+
+def _write_atomic(path, write):
+    """
+    Call write(tmp_path) for a temporary file next to path, then move it into
+    place in one step, so another process never sees a half-written file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=os.path.splitext(path)[1])
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _write_index(path, index):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+
+
+def bake_atlas(png_path, indexed_path, index_path):
+    """
+    Render every sprite into the RGBA and indexed pages and write them with
+    their JSON index. Returns (page, rects, indexed page, buffers, palettes).
+    """
+    table = build_sprite_table()
+    full_color = {name: surf for name, surf in table.items() if surf.get_bitsize() != 8}
+    rects, height = _pack([(name, *surf.get_size()) for name, surf in full_color.items()])
+    page = pygame.Surface((ATLAS_WIDTH, max(1, height)), pygame.SRCALPHA)
+    for name, surf in full_color.items():
+        page.blit(surf, rects[name][:2])
+
+    # Palette swaps of one shape have identical indices: store each buffer once
+    first_use = {}  # (size, index bytes) -> buffer name (the first sprite using it)
+    palettes = {}   # sprite name -> {"buffer", "palette", "colorkey"}
+    for name, surf in table.items():
+        if surf.get_bitsize() != 8:
+            continue
+        buffer = first_use.setdefault((surf.get_size(), pygame.image.tobytes(surf, "P")), name)
+        colorkey = surf.get_colorkey()
+        palettes[name] = {"buffer": buffer, "palette": _used_palette(surf),
+                          "colorkey": list(colorkey[:3]) if colorkey else None}
+    buffers, height = _pack([(name, *table[name].get_size()) for name in first_use.values()])
+    indexed = pygame.Surface((ATLAS_WIDTH, max(1, height)), depth=8)
+    # Copy raw indices; a blit between 8-bit surfaces would remap through the palettes
+    pixels = pygame.surfarray.pixels2d(indexed)
+    for name, (x, y, w, h) in buffers.items():
+        pixels[x:x + w, y:y + h] = pygame.surfarray.pixels2d(table[name])
+    del pixels  # Release the surface lock
+
+    # The JSON index goes last: once it exists, both pages are complete
+    os.makedirs(os.path.dirname(png_path), exist_ok=True)
+    _write_atomic(png_path, lambda path: pygame.image.save(page, path))
+    _write_atomic(indexed_path, lambda path: pygame.image.save(indexed, path))
+    _write_atomic(index_path, lambda path: _write_index(path, {
+        "key": os.path.basename(index_path)[:-5], "sprites": rects, "buffers": buffers, "indexed": palettes}))
+    return page, rects, indexed, buffers, palettes
+
+
+class SpriteAtlas:
+    """
+    Loaded atlas pages. Full-color sprites are subsurfaces that share the
+    RGBA page's pixels. Indexed sprites are stored as a palette over a
+    shared index buffer and handed out as a cached display-format copy
+    (colorkey + RLE), so blitting them needs no per-frame conversion.
+    """
+    def __init__(self, page, rects, indexed=None, buffers=None, palettes=None):
+        self.page = page
+        self.rects = rects
+        self.indexed = indexed
+        self.buffers = buffers or {}
+        self.palettes = palettes or {}
+        self._subsurfaces = {}
+        self._indexed_sprites = {}  # name -> display-format copy of the palette subsurface
+
+    def convert(self):
+        """
+        Move the RGBA page to the display format (subsurfaces are re-sliced
+        lazily) and rebuild indexed copies made before the display existed.
+        """
+        count = 0
+        if not is_display_format(self.page):
+            self.page = prepare(self.page)
+            self._subsurfaces.clear()
+            count += 1
+        for name, surf in list(self._indexed_sprites.items()):
+            if not is_display_format(surf):
+                self._indexed_sprites[name] = self._build_indexed(name)
+                count += 1
+        return count
+
+    def get(self, name):
+        if name in self.palettes:
+            return self._get_indexed(name)
+        surf = self._subsurfaces.get(name)
+        if surf is None and name in self.rects:
+            surf = self.page.subsurface(pygame.Rect(self.rects[name]))
+            self._subsurfaces[name] = surf
+        return surf
+
+    def _get_indexed(self, name):
+        surf = self._indexed_sprites.get(name)
+        if surf is None:
+            surf = self._build_indexed(name)
+            self._indexed_sprites[name] = surf
+        return surf
+
+    def _build_indexed(self, name):
+        """Palette the shared index buffer for name, then convert it (colorkey -> RLE blits)."""
+        entry = self.palettes[name]
+        surf = self.indexed.subsurface(pygame.Rect(self.buffers[entry["buffer"]]))
+        surf.set_palette([tuple(color) for color in entry["palette"]])
+        if entry["colorkey"] is not None:
+            surf.set_colorkey(tuple(entry["colorkey"]))
+        return prepare(surf)
+
+    def variants(self, name):
+        """(base, hurt, freeze, burn) for a baked sprite, or None."""
+        sprites = tuple(self.get(f"{name}/{v}") for v in VARIANT_NAMES)
+        return sprites if all(sprites) else None
+
+
+_atlas = None
+
+
+def load_sprite_atlas(cache_dir=SPRITE_ATLAS_DIR):
+    """Load the cached atlas, baking it first if missing or stale."""
+    global _atlas
+    key = atlas_key()
+    png_path = os.path.join(cache_dir, f"sprite_atlas-{key}.png")
+    indexed_path = os.path.join(cache_dir, f"sprite_atlas-{key}-indexed.png")
+    index_path = os.path.join(cache_dir, f"sprite_atlas-{key}.json")
+
+    loaded = None
+    if all(os.path.exists(path) for path in (png_path, indexed_path, index_path)):
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            rects = {name: tuple(r) for name, r in index["sprites"].items()}
+            buffers = {name: tuple(r) for name, r in index["buffers"].items()}
+            loaded = (pygame.image.load(png_path), rects, pygame.image.load(indexed_path), buffers, index["indexed"])
+        except (OSError, ValueError, KeyError, pygame.error) as e:
+            print(f"SpriteAtlas: cached atlas unreadable ({e}), re-baking")
+    if loaded is not None:
+        page, rects, indexed, buffers, palettes = loaded
+    else:
+        # Drop atlases baked from older sources (another process may be removing them too)
+        for stale in glob.glob(os.path.join(cache_dir, "sprite_atlas-*")):
+            if os.path.basename(stale).startswith(f"sprite_atlas-{key}"):
+                continue
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+        page, rects, indexed, buffers, palettes = bake_atlas(png_path, indexed_path, index_path)
+        print(f"SpriteAtlas: baked {len(rects) + len(palettes)} sprites "
+              f"({len(buffers)} index buffers) -> {cache_dir}")
+
+    # Indexed sprites are converted one by one as they are requested
+    _atlas = SpriteAtlas(prepare(page), rects, indexed, buffers, palettes)
+    return _atlas
+
+
+def get_atlas():
+    return _atlas
+
+
+@register_hook
+def _convert_atlas():
+    return _atlas.convert() if _atlas is not None else 0
+
+
+def get_sprite(name, factory):
+    """Atlas sprite by name, or factory() when no atlas is loaded."""
+    surf = _atlas.get(name) if _atlas is not None else None
+    return surf if surf is not None else factory()
+
+
+def get_variants(name, base_factory, flip=False):
+    """(base, hurt, freeze, burn) from the atlas, or built from base_factory()."""
+    sprites = _atlas.variants(name) if _atlas is not None else None
+    return sprites if sprites is not None else ps.create_sprite_variants(base_factory(), flip=flip)
@@ -0,0 +1,172 @@
+"""
+Display-format surface registry.
+Surfaces built before (or without regard to) pygame.display.set_mode are in
+whatever format they were created with, so every blit pays a per-pixel
+format conversion. `prepare` converts one surface to the display format;
+caches registered with `register_cache` are converted in one pass by
+`convert_registered` right after the display is created.
+"""
+import weakref
+
+import pygame
+
+ALPHA = "alpha"        # Per-pixel alpha sprite -> convert_alpha()
+OPAQUE = "opaque"      # Fully opaque tile -> convert()
+COLORKEY = "colorkey"  # Binary transparency -> convert() + colorkey with RLE
+
+_caches = []
+_hooks = []
+_prepared = weakref.WeakSet()
+_overlays = {}
+
+_cache_misses = 0
+
+
+def _display():
+    return pygame.display.get_surface()
+
+
+def prepare(surface, mode=None, colorkey=None):
+    """
+    Return a copy of surface in the display pixel format, ready for fast blits.
+    mode defaults from the surface: colorkeyed -> COLORKEY, SRCALPHA -> ALPHA, else OPAQUE.
+    Without a display the surface is returned unchanged.
+    """
+    if surface is None or _display() is None:
+        return surface
+    if colorkey is None:
+        colorkey = surface.get_colorkey()
+    if mode is None:
+        if colorkey is not None:
+            mode = COLORKEY
+        elif surface.get_flags() & pygame.SRCALPHA:
+            mode = ALPHA
+        else:
+            mode = OPAQUE
+
+    if mode == ALPHA:
+        result = surface.convert_alpha()
+    else:
+        result = surface.convert()
+        if mode == COLORKEY:
+            # RLE skips transparent runs entirely; ideal for sparse, static layers
+            result.set_colorkey(colorkey, pygame.RLEACCEL)
+    _prepared.add(result)
+    note_cache_miss()
+    return result
+
+
+def register_cache(cache):
+    """Register a {key: Surface} cache to be converted by convert_registered()."""
+    _caches.append(cache)
+    return cache
+
+
+def register_hook(fn):
+    """Register a callable run by convert_registered() (for owners that re-slice surfaces)."""
+    _hooks.append(fn)
+    return fn
+
+
+def convert_registered():
+    """Convert every registered cache to the display format. Call after set_mode."""
+    if _display() is None:
+        return 0
+    count = 0
+    for cache in _caches:
+        for key, surf in list(cache.items()):
+            if isinstance(surf, pygame.Surface) and not is_display_format(surf):
+                cache[key] = prepare(surf)
+                count += 1
+    for fn in _hooks:
+        count += fn() or 0
+    return count
+
+
+def get_overlay(size, color=(0, 0, 0)):
+    """
+    Shared opaque fill surface for dims and fades, allocated once per (size, color).
+    Callers set_alpha right before each blit.
+    """
+    key = (tuple(size), tuple(color))
+    surf = _overlays.get(key)
+    if surf is None:
+        surf = pygame.Surface(size)
+        note_cache_miss()
+        surf.fill(color)
+        surf = prepare(surf, OPAQUE)
+        _overlays[key] = surf
+    return surf
+
+
+def is_display_format(surface):
+    """True if blitting surface onto the display needs no pixel-format conversion."""
+    display = _display()
+    if display is None:
+        return True
+    if surface in _prepared:
+        return True
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.get_bitsize() == 32 and surface.get_masks()[:3] == display.get_masks()[:3]
+    return surface.get_bitsize() == display.get_bitsize() and surface.get_masks() == display.get_masks()
+
+
+def find_unconverted(root, name="root", max_depth=4):
+    """
+    Walk an object graph (attributes, dicts, lists, tuples) and return
+    [(path, surface)] for every Surface that is not in display format.
+    """
+    found = []
+    seen = set()
+
+    def walk(obj, path, depth):
+        if id(obj) in seen or depth > max_depth:
+            return
+        seen.add(id(obj))
+        if isinstance(obj, pygame.Surface):
+            if obj is not _display() and not is_display_format(obj):
+                found.append((path, obj))
+        elif isinstance(obj, dict):
+            for k, v in obj.items():
+                walk(v, f"{path}[{k!r}]", depth + 1)
+        elif isinstance(obj, (list, tuple)):
+            for i, v in enumerate(obj):
+                walk(v, f"{path}[{i}]", depth + 1)
+        elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+            for k, v in vars(obj).items():
+                walk(v, f"{path}.{k}", depth + 1)
+
+    walk(root, name, 0)
+    return found
+
+
+def report_unconverted(root, name="root"):
+    """Debug check: print every blit source reachable from root left in a foreign format."""
+    found = find_unconverted(root, name)
+    for path, surf in found:
+        kind = "SRCALPHA" if surf.get_flags() & pygame.SRCALPHA else "opaque"
+        print(f"SurfaceRegistry: unconverted blit source {path} "
+              f"({surf.get_bitsize()}-bit {kind} {surf.get_width()}x{surf.get_height()})")
+    return found
+
+
+# ═══════════════════════════════════════════
+#  CACHE-MISS COUNTER (debug)
+# ═══════════════════════════════════════════
+def note_cache_miss(count=1):
+    """
+    Record a surface built by one of the shared caching paths (prepare,
+    get_overlay, TransformCache, BitmapFont). A steady per-frame count means
+    a cache keeps missing. Surfaces created directly with pygame.Surface()
+    or Font.render() are not seen here; diagnostics.memory tracks live
+    surfaces across states.
+    """
+    global _cache_misses
+    _cache_misses += count
+
+
+def take_cache_miss_count():
+    """Cache misses noted since the previous call."""
+    global _cache_misses
+    count, _cache_misses = _cache_misses, 0
+    return count
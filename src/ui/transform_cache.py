@@ -0,0 +1,74 @@
+"""
+Shared cache for rotate / scale / flip results.
+Animation screens transform the same sprite the same way every frame;
+this keeps the results in a bounded LRU keyed by (source surface,
+operation, parameters) so repeat frames reuse one surface.
+Sources are identified by object identity and must not be drawn on after
+being transformed. Results are shared: per-blit state such as set_alpha
+must be set right before each blit.
+"""
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+from config.settings import TRANSFORM_CACHE_SIZE
+from ui.surface_registry import note_cache_miss
+
+class TransformCache:
+    def __init__(self, capacity=TRANSFORM_CACHE_SIZE):
+        self.capacity = capacity
+        self._entries = OrderedDict()  # (id(src), op, params) -> (weakref(src), result)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, surface, op, *params):
+        key = (id(surface), op, params)
+        entry = self._entries.get(key)
+        # The weakref guards against a freed source whose id() got reused
+        if entry is not None and entry[0]() is surface:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        result = getattr(pygame.transform, op)(surface, *params)
+        note_cache_miss()
+        self._entries[key] = (weakref.ref(surface), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+_cache = TransformCache()
+
+
+def get_transform_cache():
+    return _cache
+
+
+def cached_scale(surface, size):
+    return _cache.get(surface, "scale", tuple(size))
+
+
+def cached_rotate(surface, angle):
+    return _cache.get(surface, "rotate", angle)
+
+
+def cached_flip(surface, flip_x, flip_y=False):
+    return _cache.get(surface, "flip", bool(flip_x), bool(flip_y))
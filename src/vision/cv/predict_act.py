@@ -4,6 +4,7 @@ import joblib
 import os
 
 from config.iconfig import CHARACTER_CLASSIFIER_PATH, MEAN_PATH, STD_PATH, PCA_COMPONENTS_PATH
+from diagnostics.trace import span, traced
 
 # Globals to avoid repeated disk I/O
 _MODELS_LOADED = False
@@ -12,6 +13,7 @@ _mean = None
 _std = None
 _pca_components = None
 
+@traced("load classifier", "vision")
 def _load_resources():
     global _MODELS_LOADED, _model, _mean, _std, _pca_components
     if not _MODELS_LOADED:
@@ -29,6 +31,7 @@ CLASS_TO_SPELL = {
     4: "\\",
 }
 
+@traced(cat="vision")
 def parse_shape(img):
     """
     Preprocess a canvas image (WHITE drawing on BLACK background)
@@ -79,6 +82,7 @@ def parse_shape(img):
     
     return result.flatten().astype(np.float32)
 
+@traced(cat="vision")
 def transform_image(flat_img):
     """Apply the same normalization + PCA used during training."""
     _load_resources()
@@ -88,6 +92,7 @@ def transform_image(flat_img):
     img = img @ _pca_components
     return img
 
+@traced(cat="vision")
 def predict_action(image, model=None):
     """
     Takes a canvas image (white drawing on black bg),
@@ -104,7 +109,8 @@ def predict_action(image, model=None):
         return None, debug_img, -1
         
     transformed = transform_image(flat)
-    raw_pred = target_model.predict([transformed])[0]
+    with span("classifier predict", "vision"):
+        raw_pred = target_model.predict([transformed])[0]
 
     spell = CLASS_TO_SPELL.get(int(raw_pred), None)
     return spell, debug_img, raw_pred
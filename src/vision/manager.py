@@ -3,6 +3,7 @@ import threading
 import numpy as np
 import os
 import sys
+import time
 
 try:
     import mediapipe as mp
@@ -25,15 +26,33 @@ except Exception as e:
 from config.iconfig import MODEL_PATH
 from config.settings import TURN_PREDICT_CONSOLE
 from vision.cv.predict_act import predict_action
+from diagnostics.trace import span, instant
 
 # Add project root to path to import from src
 base_path = os.path.dirname(os.path.abspath(__file__))
 if os.path.join(base_path, '..') not in sys.path:
     sys.path.append(os.path.join(base_path, '..'))
 
+class GestureEvent:
+    """
+    A recognised gesture and the time.perf_counter() stamps of its trip
+    through the pipeline: the capture and detect() of the frame whose pinch
+    triggered it, recognition, and the game taking it with get_gesture().
+    """
+    __slots__ = ("gesture", "captured", "detected", "recognised", "taken")
+
+    def __init__(self, gesture, captured, detected, recognised):
+        self.gesture = gesture
+        self.captured = captured
+        self.detected = detected
+        self.recognised = recognised
+        self.taken = None
+
+
 class VisionSystem:
-    def __init__(self):
-        if not _MP_AVAILABLE:
+    def __init__(self, camera=True):
+        """camera=False: no MediaPipe or capture thread; landmarks are fed through feed_landmarks()."""
+        if camera and not _MP_AVAILABLE:
             raise ImportError("MediaPipe not available")
 
         # Basic state
@@ -41,6 +60,8 @@ class VisionSystem:
         self.h, self.w = 480, 640  # Default until camera starts
         self.canvas = np.zeros((self.h, self.w), dtype=np.uint8)
         self._current_gesture = None
+        self._current_event = None
+        self.last_event = None
         self.drawing_points = []
         self.is_drawing = False
         self.current_frame = None
@@ -48,8 +69,10 @@ class VisionSystem:
         self.running = True
         
         # Start initialization thread
-        self.thread = threading.Thread(target=self._update, daemon=True)
-        self.thread.start()
+        self.thread = None
+        if camera:
+            self.thread = threading.Thread(target=self._update, name="VisionSystem", daemon=True)
+            self.thread.start()
 
     def _update(self):
         import traceback
@@ -88,13 +111,16 @@ class VisionSystem:
 
             # 2. Main Loop
             while self.running:
-                success, frame = self.cap.read()
+                with span("camera read", "vision"):
+                    success, frame = self.cap.read()
+                captured = time.perf_counter()
                 if not success or frame is None:
                     continue
                 
                 # Flip frame for mirror effect
-                frame = cv2.flip(frame, 1)
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                with span("preprocess", "vision"):
+                    frame = cv2.flip(frame, 1)
+                    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
                 # Convert to MediaPipe Image
                 if not self.running or not hasattr(self, 'hand_landmarker'):
@@ -103,43 +129,19 @@ class VisionSystem:
                 mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
                 
                 try:
-                    results: HandLandmarkerResult = self.hand_landmarker.detect(mp_image)
+                    with span("detect", "vision"):
+                        results: HandLandmarkerResult = self.hand_landmarker.detect(mp_image)
                 except Exception as e:
                     if "not running" in str(e):
                         continue
                     raise e
+                detected = time.perf_counter()
                 
-                with self.lock:
+                # Outer span includes waiting for the lock, the inner one only the work under it
+                with span("lock", "vision"), self.lock, span("hand update", "vision"):
                     if results.hand_landmarks:
                         for hand_lms in results.hand_landmarks:
-                            # Index finger tip (ID 8)
-                            index_tip = hand_lms[8]
-                            cx, cy = int(index_tip.x * self.w), int(index_tip.y * self.h)
-                            
-                            # Middle finger tip (ID 12)
-                            middle_tip = hand_lms[12]
-                            mx, my = int(middle_tip.x * self.w), int(middle_tip.y * self.h)
-                            
-                            # Distance between Index and Middle tips
-                            distance = float(np.sqrt((cx-mx)**2 + (cy-my)**2))
-                            
-                            # If pinched (Index and Middle touch), STOP drawing and PREDICT
-                            if distance < 40:
-                                if self.is_drawing:
-                                    if TURN_PREDICT_CONSOLE: print("Stop Drawing - Predicting...")
-                                    self._classify_gesture_locked()
-                                    self.is_drawing = False
-                                    self.drawing_points = []
-                                    self.canvas.fill(0)
-                            else:
-                                # Otherwise, Draw with Index finger
-                                self.is_drawing = True
-                                if len(self.drawing_points) > 0:
-                                    last_pt = self.drawing_points[-1]
-                                    dist_move = np.sqrt((cx-last_pt[0])**2 + (cy-last_pt[1])**2)
-                                    if dist_move < 100:
-                                        cv2.line(self.canvas, last_pt, (cx, cy), 255, 15)
-                                self.drawing_points.append((cx, cy))
+                            self._track_hand_locked(hand_lms, captured, detected)
                             
                             # Draw hand landmarks
                             for connection in HandLandmarksConnections.HAND_CONNECTIONS:
@@ -175,7 +177,56 @@ class VisionSystem:
                 self.cap.release()
             print("VisionSystem: Background thread stopped.")
 
-    def _classify_gesture_locked(self):
+    def feed_landmarks(self, hand_lms, captured=0.0, detected=0.0):
+        """
+        Run one frame's hand landmarks through the pinch / stroke handling,
+        as the capture thread does after detect(). For camera=False systems
+        (headless runs, benchmarks). Returns the GestureEvent this frame
+        produced, or None.
+        """
+        with self.lock:
+            before = self._current_event
+            self._track_hand_locked(hand_lms, captured, detected)
+            event = self._current_event
+            return event if event is not before else None
+
+    def _track_hand_locked(self, hand_lms, captured, detected):
+        """
+        Pinch / stroke handling for one hand's landmarks (normalised x, y).
+        captured / detected: perf_counter times of the frame's capture and of
+        detect() finishing, carried into the GestureEvent a pinch produces.
+        Called inside lock.
+        """
+        # Index finger tip (ID 8)
+        index_tip = hand_lms[8]
+        cx, cy = int(index_tip.x * self.w), int(index_tip.y * self.h)
+        
+        # Middle finger tip (ID 12)
+        middle_tip = hand_lms[12]
+        mx, my = int(middle_tip.x * self.w), int(middle_tip.y * self.h)
+        
+        # Distance between Index and Middle tips
+        distance = float(np.sqrt((cx-mx)**2 + (cy-my)**2))
+        
+        # If pinched (Index and Middle touch), STOP drawing and PREDICT
+        if distance < 40:
+            if self.is_drawing:
+                if TURN_PREDICT_CONSOLE: print("Stop Drawing - Predicting...")
+                self._classify_gesture_locked(captured, detected)
+                self.is_drawing = False
+                self.drawing_points = []
+                self.canvas.fill(0)
+        else:
+            # Otherwise, Draw with Index finger
+            self.is_drawing = True
+            if len(self.drawing_points) > 0:
+                last_pt = self.drawing_points[-1]
+                dist_move = np.sqrt((cx-last_pt[0])**2 + (cy-last_pt[1])**2)
+                if dist_move < 100:
+                    cv2.line(self.canvas, last_pt, (cx, cy), 255, 15)
+            self.drawing_points.append((cx, cy))
+
+    def _classify_gesture_locked(self, captured=None, detected=None):
         """Called inside lock."""
         if len(self.drawing_points) < 5:  # Slightly more lenient
             return
@@ -203,20 +254,28 @@ class VisionSystem:
                 
                 if spell is not None:
                     self._current_gesture = spell
+                    self._current_event = GestureEvent(spell, captured, detected, time.perf_counter())
+                    instant("gesture recognised", "vision", spell=spell)
                     if TURN_PREDICT_CONSOLE: print(f"SPELL DETECTED: {spell}")
                 
         except Exception as e:
             print(f"Prediction Error: {e}")
 
     def get_gesture(self):
-        with self.lock:
+        """The last recognised gesture, once; its GestureEvent is left in last_event."""
+        with span("get_gesture lock", "vision"), self.lock:
             g = self._current_gesture
             self._current_gesture = None
+            self.last_event = self._current_event if g else None
+            self._current_event = None
+            if self.last_event is not None:
+                self.last_event.taken = time.perf_counter()
             return g
 
     def clear_gesture(self):
         with self.lock:
             self._current_gesture = None
+            self._current_event = None
             self.drawing_points = []
             self.is_drawing = False
             if hasattr(self, 'canvas'):
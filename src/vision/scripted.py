@@ -0,0 +1,78 @@
+"""
+Scripted stand-ins for VisionSystem.
+Feed gestures from a fixed sequence, a seeded random pick or a recorded
+replay instead of the camera, one poll per simulation tick. Used by
+headless mode and replays, where there is no webcam, no MediaPipe and no
+OpenCV windows.
+"""
+import random
+
+GESTURES = "/\\O|"
+
+
+def player_rng(seed):
+    """
+    RNG for the scripted player of a match seeded with `seed`. It is its own
+    stream derived from the seed (f"{seed}:player"), so gesture picks are
+    independent of the World's RNG yet reproducible from the seed alone.
+    """
+    return random.Random(f"{seed}:player")
+
+
+class ScriptedVision:
+    def __init__(self, script=None, interval=45, rng=None):
+        """
+        script: gestures cast in order, cycled (e.g. "/OO|"); None picks at random.
+        interval: ticks between casts.
+        """
+        self.script = script
+        self.interval = max(1, interval)
+        self.rng = rng or random.Random()
+        self.current_frame = None
+        self.debug_roi = None
+        self.last_event = None  # No capture timestamps to carry
+        self.running = True
+        self._tick = 0
+        self._cast = 0
+
+    def get_gesture(self):
+        self._tick += 1
+        if self._tick % self.interval:
+            return None
+        if self.script:
+            gesture = self.script[self._cast % len(self.script)]
+        else:
+            gesture = self.rng.choice(GESTURES)
+        self._cast += 1
+        return gesture
+
+    def clear_gesture(self):
+        self._tick = 0
+        self._cast = 0
+
+    def stop(self):
+        self.running = False
+
+
+class ReplayVision:
+    """Plays back recorded gestures ({tick: gesture}, see core.replay)."""
+    def __init__(self, gestures, tick=0):
+        self.gestures = gestures
+        self.current_frame = None
+        self.debug_roi = None
+        self.last_event = None
+        self.running = True
+        self._tick = tick
+
+    def get_gesture(self):
+        self._tick += 1
+        return self.gestures.get(self._tick)
+
+    def seek(self, tick):
+        self._tick = tick
+
+    def clear_gesture(self):
+        self._tick = 0
+
+    def stop(self):
+        self.running = False